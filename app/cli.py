@@ -0,0 +1,267 @@
+"""
+Firmado por lotes sin interfaz gráfica
+
+    pdf-signer batch "docs/**/*.pdf" --layout firmas.json --output firmados/ --jobs 4 --resume
+
+Con --profile el resumen incluye el tiempo por etapa y los contadores de
+cada archivo y del lote completo.
+
+No importa Qt: puede ejecutarse en servidores sin entorno gráfico.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+
+from app.core.document_loader import load_document_model
+from app.core.instrumentation import StageReport
+from app.core.logging_config import configure_logging
+from app.core.pdf_signer import PDFSigner
+from app.core.signature_layout import SignatureLayout
+
+STATE_FILE_NAME = ".pdf-signer-state.jsonl"
+
+logger = logging.getLogger(__name__)
+
+def expand_inputs(patterns: Sequence[str], exclude: Optional[str] = None) -> List[str]:
+    """
+    Expande patrones glob (admite **) a una lista ordenada de PDFs sin repetir
+
+    Un patrón que es una carpeta se toma como todos los PDFs dentro de ella.
+    Los PDFs dentro de la carpeta exclude (p. ej. la de salida, si está bajo
+    la de entrada) se omiten para no volver a firmar lo ya firmado.
+    """
+    excluida = os.path.join(os.path.realpath(exclude), "") if exclude else None
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*.pdf")
+        for path in glob.iglob(pattern, recursive=True):
+            if not (os.path.isfile(path) and path.lower().endswith(".pdf")):
+                continue
+            if excluida and os.path.realpath(path).startswith(excluida):
+                continue
+            files.add(os.path.abspath(path))
+    return sorted(files)
+
+def plan_outputs(inputs: Sequence[str], output_dir: str) -> List[Tuple[str, str]]:
+    """
+    Asigna a cada PDF su ruta de salida conservando la estructura de carpetas
+
+    Las rutas se calculan relativas a la carpeta común de todas las entradas.
+    """
+    if not inputs:
+        return []
+    root = os.path.commonpath([os.path.dirname(path) for path in inputs])
+    return [(path, os.path.join(output_dir, os.path.relpath(path, root))) for path in inputs]
+
+def _file_stamp(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_state(state_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Lee el registro de archivos ya firmados (una línea JSON por archivo)
+
+    Las líneas incompletas (p. ej. por una interrupción) se ignoran.
+    """
+    state = {}
+    if not os.path.exists(state_path):
+        return state
+    with open(state_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("ok"):
+                state[entry["archivo"]] = entry
+    return state
+
+def is_done(entry: Optional[Dict[str, Any]], pdf_path: str, output_path: str) -> bool:
+    """Indica si un archivo ya se firmó y no cambió desde entonces"""
+    return (
+        entry is not None
+        and entry.get("salida") == output_path
+        and entry.get("stamp") == _file_stamp(pdf_path)
+        and os.path.exists(output_path)
+    )
+
+_signer: Optional[PDFSigner] = None
+
+def sign_file(pdf_path: str, output_path: str, layout: SignatureLayout,
+              profile: bool = False) -> Dict[str, Any]:
+    """
+    Firma un PDF con la disposición dada
+
+    Nunca lanza excepciones: el error se reporta en el resultado para no
+    detener el lote. 'firmas' y 'errores' salen del reporte del firmador. Con profile=True el resultado incluye el reporte de
+    etapas del firmador en 'profile'.
+    """
+    global _signer
+    if _signer is None:
+        _signer = PDFSigner()
+
+    inicio = time.perf_counter()
+    resultado: Dict[str, Any] = {"archivo": pdf_path, "salida": output_path}
+    try:
+        resultado["stamp"] = _file_stamp(pdf_path)
+        # Las dimensiones de página se leen solo si alguna firma va por escenario
+        document = load_document_model(pdf_path)
+        total_pages = document.total_pages
+        placements = layout.placements(total_pages, document.page_dimensions.size)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        report = _signer.insert_signature(pdf_path, output_path, placements)
+        # Lo realmente insertado (no lo planificado): una firma que falla no
+        # cuenta y el archivo queda pendiente para --resume
+        firmas, errores = report.counters.get("signatures", 0), report.counters.get("errors", 0)
+        resultado.update(ok=errores == 0, paginas=total_pages, firmas=firmas, errores=errores)
+        if errores:
+            resultado["error"] = f"{errores} firmas no se pudieron insertar"
+        if profile:
+            resultado["profile"] = report.as_dict()
+    except Exception as e:
+        resultado.update(ok=False, error=str(e))
+    resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+    return resultado
+
+def _run(tasks: List[Tuple[str, str]], layout: SignatureLayout, jobs: int,
+         max_pending: int, profile: bool = False) -> Iterator[Dict[str, Any]]:
+    """Firma las tareas y genera los resultados a medida que terminan"""
+    if jobs == 1:
+        for pdf_path, output_path in tasks:
+            yield sign_file(pdf_path, output_path, layout, profile)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        for pdf_path, output_path in tasks:
+            # Limitar los archivos en vuelo antes de enviar uno nuevo
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(sign_file, pdf_path, output_path, layout, profile))
+        for future in as_completed(pending):
+            yield future.result()
+
+def batch(patterns: Sequence[str], layout_path: str, output_dir: str, jobs: int = 1,
+          resume: bool = False, state_path: Optional[str] = None,
+          profile: bool = False) -> Dict[str, Any]:
+    """
+    Firma por lotes todos los PDFs que coinciden con los patrones
+
+    Args:
+        patterns (Sequence[str]): Patrones glob o carpetas de entrada
+        layout_path (str): Archivo JSON con la disposición de firmas
+        output_dir (str): Carpeta de salida
+        jobs (int): Procesos en paralelo (1 = secuencial)
+        resume (bool): Omitir los archivos ya firmados según el registro de estado
+        state_path (Optional[str]): Registro de estado (por defecto, en la carpeta de salida)
+        profile (bool): Incluir el tiempo por etapa de cada archivo y el total del lote
+
+    Returns:
+        Dict[str, Any]: Resumen del lote con el resultado de cada archivo
+    """
+    inicio = time.perf_counter()
+    layout = SignatureLayout.load(layout_path)
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    state_path = state_path or os.path.join(output_dir, STATE_FILE_NAME)
+
+    tasks = plan_outputs(expand_inputs(patterns, exclude=output_dir), output_dir)
+    state = load_state(state_path) if resume else {}
+    pending = [(pdf, out) for pdf, out in tasks if not is_done(state.get(pdf), pdf, out)]
+    skipped = len(tasks) - len(pending)
+
+    resultados = []
+    with open(state_path, 'a' if resume else 'w', encoding='utf-8') as state_file:
+        for resultado in _run(pending, layout, max(1, jobs), max(1, jobs) * 2, profile):
+            resultados.append(resultado)
+            # Registrar cada archivo al terminar, para poder reanudar tras un corte
+            state_file.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            state_file.flush()
+            if not resultado["ok"]:
+                logger.error("%s: %s", resultado["archivo"], resultado["error"])
+
+    correctos = sum(1 for r in resultados if r["ok"])
+    logger.info("Lote terminado: %d archivos, %d correctos, %d con error, %d omitidos, %.3f s",
+                len(tasks), correctos, len(resultados) - correctos, skipped,
+                time.perf_counter() - inicio)
+    summary = {
+        "total": len(tasks),
+        "ok": correctos,
+        "failed": len(resultados) - correctos,
+        "skipped": skipped,
+        "seconds": round(time.perf_counter() - inicio, 3),
+        "files": resultados,
+    }
+    if profile:
+        summary["profile"] = StageReport.merge(r["profile"] for r in resultados if "profile" in r)
+    return summary
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pdf-signer", description="Firmador de PDFs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch_parser = subparsers.add_parser("batch", help="Firma por lotes sin interfaz gráfica")
+    batch_parser.add_argument("inputs", nargs="+", help="Patrones glob (admite **) o carpetas con PDFs")
+    batch_parser.add_argument("--layout", required=True, help="Archivo JSON con la disposición de firmas")
+    batch_parser.add_argument("--output", "-o", required=True, help="Carpeta de salida")
+    batch_parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Procesos en paralelo (por defecto 1; 0 = todos los núcleos)",
+    )
+    batch_parser.add_argument(
+        "--resume", action="store_true",
+        help="Omitir los archivos ya firmados en una ejecución anterior",
+    )
+    batch_parser.add_argument("--state", help="Registro de estado (por defecto, en la carpeta de salida)")
+    batch_parser.add_argument("--summary", help="Escribir el resumen JSON en este archivo (por defecto, stdout)")
+    batch_parser.add_argument(
+        "--profile", action="store_true",
+        help="Incluir en el resumen el tiempo por etapa y los contadores del firmador",
+    )
+    batch_parser.add_argument(
+        "--log-level",
+        help="Nivel de log en stderr (por defecto, PDF_SIGNER_LOG_LEVEL o INFO); "
+             "niveles por módulo con PDF_SIGNER_LOG=modulo=NIVEL,...",
+    )
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos"""
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "batch":
+        try:
+            # Los registros van a stderr; stdout queda libre para el resumen JSON
+            configure_logging([logging.StreamHandler(sys.stderr)], level=args.log_level)
+            summary = batch(
+                args.inputs, args.layout, args.output,
+                jobs=args.jobs or os.cpu_count() or 1,
+                resume=args.resume,
+                state_path=args.state,
+                profile=args.profile,
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+
+        text = json.dumps(summary, ensure_ascii=False, indent=2)
+        if args.summary:
+            with open(args.summary, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 1 if summary["failed"] else 0
+
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+from typing import Tuple
+from app.models.document_model import DocumentModel
+from app.models.page_geometry import PageGeometry
+from app.core.document_pool import document_pool
+
+def load_document_model(pdf_path: str) -> DocumentModel:
+    """
+    Abre un PDF y crea su modelo sin recorrer todas las páginas
+
+    El número de páginas se obtiene de la tabla de páginas de MuPDF; las
+    dimensiones de cada página se leen solo cuando se consultan, de modo
+    que la primera página puede mostrarse antes de conocer las demás.
+
+    Args:
+        pdf_path (str): Ruta al archivo PDF
+
+    Returns:
+        DocumentModel: Modelo del documento con dimensiones perezosas
+    """
+    # Abrir (o reutilizar) el documento desde el pool compartido
+    total_pages = document_pool.get(pdf_path).page_count
+
+    def page_size(page_number: int) -> Tuple[float, float]:
+        with document_pool.lock:
+            rect = document_pool.get(pdf_path).load_page(page_number).rect
+        return rect.width, rect.height
+
+    return DocumentModel(
+        pdf_path=pdf_path,
+        total_pages=total_pages,
+        page_dimensions=PageGeometry(total_pages, page_size)
+    )
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from typing import Tuple
+import fitz
+import os
+import threading
+
+class DocumentPool:
+    def __init__(self, max_open: int = 8):
+        """
+        Pool de documentos fitz abiertos
+
+        Mantiene abiertos los documentos usados recientemente para no pagar
+        de nuevo la apertura y el análisis de la tabla xref en cada vista
+        previa. Un documento se reabre si el archivo cambia en disco.
+
+        PyMuPDF no es seguro entre hilos: quien use un documento del pool
+        desde un hilo secundario debe hacerlo dentro de ``with pool.lock``.
+
+        Args:
+            max_open (int): Máximo de documentos abiertos simultáneamente
+        """
+        self.max_open = max_open
+        self.lock = threading.RLock()
+        self._docs: "OrderedDict[str, Tuple[Tuple[int, int], fitz.Document]]" = OrderedDict()
+
+    @staticmethod
+    def _file_stamp(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, pdf_path: str) -> fitz.Document:
+        """
+        Retorna el documento abierto para una ruta, abriéndolo si hace falta
+
+        El documento sigue perteneciendo al pool: no debe cerrarse ni modificarse.
+
+        Args:
+            pdf_path (str): Ruta al archivo PDF
+
+        Returns:
+            fitz.Document: Documento abierto
+        """
+        path = os.path.abspath(pdf_path)
+        with self.lock:
+            stamp = self._file_stamp(path)
+            entry = self._docs.get(path)
+            if entry is not None:
+                if entry[0] == stamp and not entry[1].is_closed:
+                    self._docs.move_to_end(path)
+                    return entry[1]
+                self.invalidate(path)
+
+            doc = fitz.open(path)
+            self._docs[path] = (stamp, doc)
+            while len(self._docs) > self.max_open:
+                _, (_, old_doc) = self._docs.popitem(last=False)
+                old_doc.close()
+            return doc
+
+    def take(self, pdf_path: str) -> fitz.Document:
+        """
+        Retira un documento del pool y transfiere su propiedad al llamador
+
+        Se usa cuando el documento va a modificarse (por ejemplo, al firmar):
+        el llamador debe cerrarlo, y la siguiente llamada a get() lo reabre
+        limpio desde disco.
+
+        Args:
+            pdf_path (str): Ruta al archivo PDF
+
+        Returns:
+            fitz.Document: Documento abierto propiedad del llamador
+        """
+        path = os.path.abspath(pdf_path)
+        with self.lock:
+            entry = self._docs.pop(path, None)
+            if entry is not None:
+                if entry[0] == self._file_stamp(path) and not entry[1].is_closed:
+                    return entry[1]
+                entry[1].close()
+            return fitz.open(path)
+
+    def invalidate(self, pdf_path: str) -> None:
+        """Cierra y descarta el documento de una ruta si está abierto"""
+        path = os.path.abspath(pdf_path)
+        with self.lock:
+            entry = self._docs.pop(path, None)
+            if entry is not None and not entry[1].is_closed:
+                entry[1].close()
+
+    def close_all(self) -> None:
+        """Cierra todos los documentos del pool"""
+        with self.lock:
+            for _, doc in self._docs.values():
+                if not doc.is_closed:
+                    doc.close()
+            self._docs.clear()
+
+    def __contains__(self, pdf_path: str) -> bool:
+        return os.path.abspath(pdf_path) in self._docs
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+# Pool compartido por la vista previa, el firmador y la ventana principal
+document_pool = DocumentPool()
@@ -0,0 +1,109 @@
+from PIL import Image
+from typing import Dict, Tuple, Optional
+from app.core.signature_assets import signature_assets
+from app.core.instrumentation import StageReport
+import fitz
+import hashlib
+import io
+
+class SignatureImageRegistry:
+    def __init__(self, doc: fitz.Document, report: Optional[StageReport] = None):
+        """
+        Registro de imágenes de firma incrustadas en un documento
+
+        Cada imagen se identifica por el hash de su contenido y el tamaño en
+        píxeles con el que se incrusta. La primera inserción escribe el stream
+        en el PDF; las siguientes reutilizan el mismo xref.
+
+        Args:
+            doc (fitz.Document): Documento donde se insertan las firmas
+            report (Optional[StageReport]): Reporte donde se miden las etapas
+                (hash, decode, encode, insert_image)
+        """
+        self.doc = doc
+        self.report = report or StageReport()
+        self._xrefs: Dict[Tuple[str, Tuple[int, int]], int] = {}
+        self._file_hashes: Dict[str, str] = {}
+        self.embedded = 0  # Imágenes escritas en el documento
+        self.reused = 0    # Inserciones que reutilizaron un xref existente
+
+    @staticmethod
+    def file_hash(image_path: str) -> str:
+        """Calcula el hash SHA-1 del contenido de un archivo"""
+        digest = hashlib.sha1()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _content_hash(self, image_path: str) -> str:
+        if image_path not in self._file_hashes:
+            with self.report.stage("hash"):
+                self._file_hashes[image_path] = self.file_hash(image_path)
+        return self._file_hashes[image_path]
+
+    @staticmethod
+    def encode_image(
+        image_path: str,
+        pixel_size: Optional[Tuple[int, int]] = None,
+        report: Optional[StageReport] = None
+    ) -> Tuple[bytes, Tuple[int, int]]:
+        """
+        Codifica una imagen como PNG RGBA lista para incrustar
+
+        Args:
+            image_path (str): Ruta de la imagen
+            pixel_size (Optional[Tuple[int, int]]): Tamaño en píxeles deseado,
+                None para conservar el tamaño original
+            report (Optional[StageReport]): Reporte donde se miden decode y encode
+
+        Returns:
+            Tuple[bytes, Tuple[int, int]]: (bytes PNG, tamaño final en píxeles)
+        """
+        report = report or StageReport()
+        with report.stage("decode"):
+            img = signature_assets.image(image_path)
+        with report.stage("encode"):
+            if pixel_size and img.size != tuple(pixel_size):
+                img = img.resize(pixel_size, Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            img.save(buffer, format="PNG")
+        return buffer.getvalue(), img.size
+
+    def insert(
+        self,
+        page: fitz.Page,
+        rect: fitz.Rect,
+        image_path: str,
+        pixel_size: Optional[Tuple[int, int]] = None,
+        rotate: int = 0
+    ) -> int:
+        """
+        Inserta una firma en la página reutilizando el stream si ya existe
+
+        Args:
+            page (fitz.Page): Página destino (del mismo documento)
+            rect (fitz.Rect): Rectángulo de inserción en puntos PDF
+            image_path (str): Ruta de la imagen de firma
+            pixel_size (Optional[Tuple[int, int]]): Tamaño en píxeles a incrustar
+            rotate (int): Rotación en múltiplos de 90° (se aplica al dibujar,
+                el mismo stream sirve para cualquier rotación)
+
+        Returns:
+            int: xref de la imagen en el documento
+        """
+        key = (self._content_hash(image_path), tuple(pixel_size) if pixel_size else None)
+        xref = self._xrefs.get(key)
+        if xref:
+            with self.report.stage("insert_image"):
+                page.insert_image(rect, xref=xref, rotate=rotate)
+            self.reused += 1
+            return xref
+
+        stream, _ = self.encode_image(image_path, pixel_size, self.report)
+        with self.report.stage("insert_image"):
+            xref = page.insert_image(rect, stream=stream, rotate=rotate)
+        self._xrefs[key] = xref
+        self.embedded += 1
+        self.report.count("image_bytes", len(stream))
+        return xref
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator
+import time
+
+class StageReport:
+    def __init__(self):
+        """
+        Tiempos por etapa y contadores de una operación (p. ej. firmar un PDF)
+
+        Cada etapa acumula su tiempo de reloj y el número de veces que se
+        ejecutó, así una etapa que corre una vez por firma (insertar imagen)
+        se reporta como total y cantidad. Medir cuesta dos lecturas de
+        perf_counter por etapa, sin formatear nada hasta pedir el reporte.
+        """
+        self.stages: Dict[str, list] = {}  # nombre -> [segundos, llamadas]
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mide el tiempo del bloque y lo suma a la etapa indicada"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - inicio)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Suma un tiempo ya medido a una etapa"""
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Suma una cantidad a un contador"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def seconds(self, name: str) -> float:
+        """Tiempo acumulado de una etapa (0 si no se ejecutó)"""
+        entry = self.stages.get(name)
+        return entry[0] if entry else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Reporte estructurado (serializable a JSON)
+
+        Returns:
+            Dict[str, Any]: {"stages": {nombre: {"seconds", "calls"}}, "counters": {...}}
+        """
+        return {
+            "stages": {
+                name: {"seconds": round(seconds, 6), "calls": calls}
+                for name, (seconds, calls) in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    @staticmethod
+    def merge(reports: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Suma varios reportes en formato as_dict (p. ej. todos los archivos de un lote)
+
+        Args:
+            reports (Iterable[Dict[str, Any]]): Reportes a combinar
+
+        Returns:
+            Dict[str, Any]: Reporte con etapas y contadores acumulados
+        """
+        total = StageReport()
+        for report in reports:
+            for name, stage in report.get("stages", {}).items():
+                entry = total.stages.setdefault(name, [0.0, 0])
+                entry[0] += stage["seconds"]
+                entry[1] += stage["calls"]
+            for name, amount in report.get("counters", {}).items():
+                total.count(name, amount)
+        return total.as_dict()
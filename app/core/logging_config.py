@@ -0,0 +1,71 @@
+from typing import Dict, Iterable, Optional
+import logging
+import os
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Nivel global (p. ej. DEBUG)
+LEVEL_ENV = "PDF_SIGNER_LOG_LEVEL"
+# Niveles por módulo (p. ej. "app.core.pdf_signer=DEBUG,app.ui=WARNING")
+MODULE_LEVELS_ENV = "PDF_SIGNER_LOG"
+
+def _parse_level(value: str) -> int:
+    level = logging.getLevelName(value.strip().upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Nivel de log inválido: {value!r}")
+    return level
+
+def parse_module_levels(spec: Optional[str]) -> Dict[str, int]:
+    """
+    Interpreta una lista "modulo=NIVEL,modulo=NIVEL" de niveles por módulo
+
+    Args:
+        spec (Optional[str]): Especificación de niveles (vacía o None = ninguno)
+
+    Returns:
+        Dict[str, int]: Nivel numérico por nombre de logger
+    """
+    levels = {}
+    for entry in (spec or "").split(","):
+        if not entry.strip():
+            continue
+        name, sep, level = entry.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Entrada de nivel inválida: {entry!r} (se espera modulo=NIVEL)")
+        levels[name.strip()] = _parse_level(level)
+    return levels
+
+def configure_logging(handlers: Iterable[logging.Handler], level: Optional[str] = None,
+                      module_levels: Optional[str] = None) -> None:
+    """
+    Configura el logging de la aplicación con niveles globales y por módulo
+
+    Por defecto se usa INFO: cada operación (firmar, guardar) deja un único
+    registro de resumen y el detalle por página queda en DEBUG. Los niveles
+    se pueden ajustar sin tocar código con las variables de entorno
+    PDF_SIGNER_LOG_LEVEL y PDF_SIGNER_LOG.
+
+    Args:
+        handlers (Iterable[logging.Handler]): Destinos de los registros
+        level (Optional[str]): Nivel global (por defecto, PDF_SIGNER_LOG_LEVEL o INFO)
+        module_levels (Optional[str]): Niveles por módulo (por defecto, PDF_SIGNER_LOG)
+    """
+    root_level = _parse_level(level or os.environ.get(LEVEL_ENV) or "INFO")
+    levels = parse_module_levels(
+        module_levels if module_levels is not None else os.environ.get(MODULE_LEVELS_ENV)
+    )
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    root = logging.getLogger()
+    # Reemplazar los handlers de una configuración anterior (no duplicar registros)
+    for handler in [h for h in root.handlers if getattr(h, "_pdf_signer", False)]:
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler._pdf_signer = True
+        root.addHandler(handler)
+    # Los handlers dejan pasar todo: el filtrado lo hace el nivel de cada logger,
+    # así un módulo en DEBUG no queda bloqueado por un nivel global más alto
+    root.setLevel(root_level)
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
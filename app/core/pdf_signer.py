@@ -1,167 +1,221 @@
 import fitz
 import io
+import logging
+import os
+import time
+from collections import defaultdict
 from PIL import Image
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
 from app.models.document_model import DocumentModel
+from app.models.page_set import PageSet
+from app.core.image_registry import SignatureImageRegistry
+from app.core.document_pool import document_pool
+from app.core.document_loader import load_document_model
+from app.core.instrumentation import StageReport
+from app.core.scenarios import scenario_placements
+
+logger = logging.getLogger(__name__)
 
 class PDFSigner:
     def __init__(self):
-        # Constantes para detección de escenarios
-        self.UMBRAL_A4_ANCHO = 595
-        self.UMBRAL_A4_ALTO = 842
-        self.MARGEN_ERROR = 50
-
-        self.escenarios = {
-            "A4_VERTICAL": {
-                "nombre": "A4 Vertical",
-                "orientacion": "vertical",
-                "ancho_deseado": 120,
-                "separacion_derecha": 100,
-                "separacion_inferior": 50,
-                "variabilidad_horizontal_pct": 80,
-                "variabilidad_vertical_pct": 20,
-                "variabilidad_giro": 5,
-                "rotacion_base": 0,
-            },
-            "A4_HORIZONTAL": {
-                "nombre": "A4 Horizontal",
-                "orientacion": "horizontal",
-                "ancho_deseado": 70,
-                "separacion_derecha": 100,
-                "separacion_inferior": 250,
-                "variabilidad_horizontal_pct": 80,
-                "variabilidad_vertical_pct": 20,
-                "variabilidad_giro": 5,
-                "rotacion_base": 90,
-            },
-            "PLANOS": {
-                "nombre": "Planos / Hojas Grandes",
-                "orientacion": "vertical",
-                "ancho_deseado": 180,
-                "separacion_derecha": 90,
-                "separacion_inferior": 100,
-                "variabilidad_horizontal_pct": 50,
-                "variabilidad_vertical_pct": 20,
-                "variabilidad_giro": 5,
-                "rotacion_base": 0,
-            }
-        }
-
-    def insert_signature(self, pdf_path: str, output_path: str, signatures: list[Dict[str, Any]]):
-        """Inserta las firmas en el PDF usando la lógica probada"""
-        print("\n=== INICIO DE PROCESO DE FIRMA ===")
-        print(f"Total de firmas a procesar: {len(signatures)}")
-        
-        # Abrir documento original
-        doc = fitz.open(pdf_path)
+        # Reporte de etapas de la última firma (ver insert_signature)
+        self.last_report: Optional[StageReport] = None
+
+    def insert_signature(self, pdf_path: str, output_path: str,
+                         signatures: Iterable[Dict[str, Any]]) -> StageReport:
+        """
+        Inserta las firmas en el PDF en una sola pasada
+
+        El documento original se edita en memoria (sin copiar página por página
+        a un documento nuevo), así los recursos compartidos (fuentes, imágenes)
+        se conservan una sola vez. Las firmas se agrupan por página al inicio.
+
+        Args:
+            pdf_path (str): Ruta del PDF original
+            output_path (str): Ruta donde se guardará el PDF firmado
+            signatures (Iterable): Firmas con 'image_path', 'page_number', 'position'
+                y 'size' (puede ser un generador, p. ej. DocumentModel.signature_placements()).
+                Si una firma trae 'pages' (PageSet) se inserta en todas esas páginas
+                en lugar de solo en 'page_number'. 'rotation' (opcional, múltiplo
+                de 90°) rota la imagen, p. ej. en las firmas por escenario
+                (app.core.scenarios.scenario_placements).
+
+        Returns:
+            StageReport: Tiempo por etapa (plan, open, load_page, hash, decode,
+                encode, insert_image, save) y contadores (páginas, firmas,
+                imágenes incrustadas/reutilizadas, bytes escritos)
+        """
+        report = StageReport()
+        self.last_report = report
+        inicio = time.perf_counter()
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        # Las firmas se agrupan por página. Una firma con un conjunto de una
+        # sola página se trata como firma suelta; las plantillas se indexan
+        # recorriendo su conjunto una sola vez (costo proporcional a las
+        # firmas insertadas, no a páginas × plantillas). Se conserva el orden
+        # de llegada para que el apilado en cada página sea el mismo.
+        firmas_por_pagina: Dict[int, list] = defaultdict(list)
+        plantillas = []
+        with report.stage("plan"):
+            for orden, signature in enumerate(signatures):
+                pages = signature.get('pages')
+                if pages is None:
+                    page_number = signature['page_number']
+                else:
+                    pages = PageSet(pages)
+                    if len(pages) != 1:
+                        plantillas.append((orden, signature, pages))
+                        continue
+                    page_number = next(iter(pages))
+                firmas_por_pagina[page_number].append((orden, signature))
+            sueltas = sum(map(len, firmas_por_pagina.values()))
+
+        # Tomar el documento original del pool (se edita en sitio y se cierra al final)
+        with report.stage("open"):
+            doc = document_pool.take(pdf_path)
         total_pages = len(doc)
-        print(f"PDF abierto: {pdf_path}")
-        print(f"Total páginas en documento: {total_pages}")
-        
-        # Crear documento temporal para el resultado
-        result_doc = fitz.open()
-        
+
+        with report.stage("plan"):
+            fuera_de_rango = [page for page in firmas_por_pagina if not 0 <= page < total_pages]
+            for page in fuera_de_rango:
+                del firmas_por_pagina[page]
+            documento = PageSet(range(total_pages))
+            for orden, signature, pages in plantillas:
+                fuera_de_rango += list(pages - documento)
+                for page in pages & documento:
+                    firmas_por_pagina[page].append((orden, signature))
+            paginas = sorted(firmas_por_pagina)
+        if fuera_de_rango:
+            logger.warning("%s: %d páginas fuera de rango (documento de %d), firmas omitidas: %s",
+                           pdf_path, len(fuera_de_rango), total_pages,
+                           [page + 1 for page in sorted(fuera_de_rango)])
+        if debug:
+            logger.debug("%s: %d páginas, %d firmas sueltas, %d plantillas, %d páginas con firmas",
+                         pdf_path, total_pages, sueltas, len(plantillas), len(paginas))
+
+        # Registro de imágenes incrustadas (una por archivo y tamaño)
+        registry = SignatureImageRegistry(doc, report)
+        insertadas = errores = 0
+
         try:
-            # Procesar cada página
-            for page_num in range(total_pages):
-                print(f"\n=== Procesando página {page_num + 1} ===")
-                
-                # Copiar página original
-                page = doc[page_num]
-                result_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
-                result_page = result_doc[page_num]
-                
-                # Buscar firmas para esta página
-                page_signatures = [sig for sig in signatures if sig['page_number'] == page_num]
-                
-                if page_signatures:
-                    print(f"Encontradas {len(page_signatures)} firmas para esta página")
-                    
-                    for idx, signature in enumerate(page_signatures, 1):
-                        try:
-                            print(f"\nProcesando firma #{idx} en página {page_num + 1}")
-                            
-                            # Cargar y preparar imagen de firma
-                            with Image.open(signature['image_path']) as img:
-                                print(f"Firma cargada: {img.size}, modo={img.mode}")
-                                img = img.convert('RGBA')
-                                
-                                # Convertir a bytes
-                                buffer = io.BytesIO()
-                                img.save(buffer, format="PNG")
-                                img_bytes = buffer.getvalue()
-                                
-                                # Crear Pixmap y rectángulo de inserción
-                                pix = fitz.Pixmap(img_bytes)
-                                x0 = signature['position']['x']
-                                y0 = signature['position']['y']
-                                x1 = x0 + signature['size']['width']
-                                y1 = y0 + signature['size']['height']
-                                
-                                print(f"""
-Insertando firma:
-  - Posición inicial: ({x0:.2f}, {y0:.2f})
-  - Posición final: ({x1:.2f}, {y1:.2f})
-  - Tamaño final: {signature['size']['width']:.2f}x{signature['size']['height']:.2f}
-""")
-                                
-                                # Insertar firma
-                                signature_rect = fitz.Rect(x0, y0, x1, y1)
-                                result_page.insert_image(signature_rect, pixmap=pix)
-                                print(f"Firma insertada correctamente")
-                                
-                        except Exception as e:
-                            print(f"ERROR al procesar firma #{idx} en página {page_num + 1}: {str(e)}")
-                            import traceback
-                            traceback.print_exc()
-                else:
-                    print("No hay firmas para esta página")
-            
-            # Guardar resultado
-            print("\n=== Guardando documento final ===")
-            print(f"Ruta destino: {output_path}")
-            result_doc.save(output_path)
-            print("Documento guardado exitosamente")
-            
-        except Exception as e:
-            print(f"ERROR en el proceso: {str(e)}")
-            traceback.print_exc()
+            # Recorrer solo las páginas que tienen firmas, en orden
+            for page_num in paginas:
+                with report.stage("load_page"):
+                    page = doc[page_num]
+                # Las plantillas se agregaron después de las sueltas: reordenar por llegada
+                page_signatures = [
+                    signature for _, signature in sorted(firmas_por_pagina[page_num],
+                                                         key=lambda entry: entry[0])
+                ]
+
+                for idx, signature in enumerate(page_signatures, 1):
+                    try:
+                        # Rectángulo de inserción
+                        x0 = signature['position']['x']
+                        y0 = signature['position']['y']
+                        x1 = x0 + signature['size']['width']
+                        y1 = y0 + signature['size']['height']
+
+                        # Insertar firma (la imagen se incrusta una sola vez por documento)
+                        signature_rect = fitz.Rect(x0, y0, x1, y1)
+                        xref = registry.insert(page, signature_rect, signature['image_path'],
+                                               rotate=signature.get('rotation', 0))
+                        insertadas += 1
+                        if debug:
+                            logger.debug("Página %d, firma #%d: (%.2f, %.2f) -> (%.2f, %.2f), xref %d",
+                                         page_num + 1, idx, x0, y0, x1, y1, xref)
+
+                    except Exception:
+                        errores += 1
+                        logger.exception("Error al procesar la firma #%d en la página %d",
+                                         idx, page_num + 1)
+
+            # Guardar resultado (en guardado incremental solo cuenta lo anexado)
+            size_before = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            same_file = os.path.abspath(output_path) == os.path.abspath(pdf_path)
+            with report.stage("save"):
+                self._save_document(doc, pdf_path, output_path)
+            written = os.path.getsize(output_path)
+            report.count("bytes_written", written - size_before if same_file else written)
+
+        except Exception:
+            logger.exception("Error al firmar %s", pdf_path)
             raise
         finally:
+            if not doc.is_closed:
+                doc.close()
+
+        report.record("total", time.perf_counter() - inicio)
+        report.count("pages", total_pages)
+        report.count("pages_signed", len(paginas))
+        report.count("signatures", insertadas)
+        report.count("errors", errores)
+        report.count("images_embedded", registry.embedded)
+        report.count("images_reused", registry.reused)
+
+        logger.info(
+            "Firmado %s -> %s: %d firmas en %d páginas (%d errores), "
+            "imágenes incrustadas %d, reutilizadas %d, %.3f s",
+            pdf_path, output_path, insertadas, len(paginas), errores,
+            registry.embedded, registry.reused, report.seconds("total")
+        )
+        if debug:
+            logger.debug("Etapas de %s: %s", pdf_path, report.as_dict())
+        return report
+
+    def sign_by_scenario(self, pdf_path: str, output_path: str, image_path: str,
+                         pages: Optional[Iterable[int]] = None) -> StageReport:
+        """
+        Firma colocando la imagen según el escenario de cada página
+
+        La posición, el tamaño y la rotación salen de app.core.scenarios
+        (A4 vertical, A4 horizontal o planos), igual que en el sellador.
+
+        Args:
+            pdf_path (str): Ruta del PDF original
+            output_path (str): Ruta donde se guardará el PDF firmado
+            image_path (str): Ruta de la imagen de firma
+            pages (Optional[Iterable[int]]): Páginas a firmar (por defecto, todas)
+
+        Returns:
+            StageReport: Reporte de etapas de insert_signature
+        """
+        document = load_document_model(pdf_path)
+        if pages is None:
+            pages = range(document.total_pages)
+        placements = scenario_placements(image_path, document.page_dimensions.size, pages)
+        return self.insert_signature(pdf_path, output_path, placements)
+
+    @staticmethod
+    def _save_document(doc: fitz.Document, pdf_path: str, output_path: str) -> None:
+        """
+        Guarda el documento firmado
+
+        Si el destino es el mismo archivo de origen se usa guardado incremental
+        (solo se anexan los objetos nuevos, comprimidos: saveIncr() los
+        escribiría sin /Filter); en otro caso se escribe una única copia
+        completa del documento.
+        """
+        same_file = os.path.abspath(output_path) == os.path.abspath(pdf_path)
+        if not same_file:
+            doc.save(output_path, garbage=1, deflate=True)
+        elif doc.can_save_incrementally():
+            doc.save(output_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP, deflate=True)
+        else:
+            # MuPDF no permite sobrescribir el archivo abierto con guardado completo
+            temp_path = output_path + ".tmp"
+            doc.save(temp_path, garbage=1, deflate=True)
             doc.close()
-            result_doc.close()
-            print("\n=== PROCESO DE FIRMA COMPLETADO ===")
-
-    def _detectar_escenario(self, width: float, height: float) -> Dict:
-        """Detecta el escenario basado en las dimensiones de la página"""
-        # A4 Vertical
-        if (abs(width - self.UMBRAL_A4_ANCHO) <= self.MARGEN_ERROR and 
-            abs(height - self.UMBRAL_A4_ALTO) <= self.MARGEN_ERROR and 
-            width < height):
-            return self.escenarios["A4_VERTICAL"]
-        
-        # A4 Horizontal
-        if (abs(width - self.UMBRAL_A4_ALTO) <= self.MARGEN_ERROR and 
-            abs(height - self.UMBRAL_A4_ANCHO) <= self.MARGEN_ERROR and 
-            width > height):
-            return self.escenarios["A4_HORIZONTAL"]
-        
-        # Planos u otros
-        escenario = self.escenarios["PLANOS"].copy()
-        escenario["orientacion"] = "horizontal" if width > height else "vertical"
-        return escenario
+            os.replace(temp_path, output_path)
 
     def _prepare_image(self, img: Image, size: Dict, escenario: Dict) -> Image:
         """Prepara la imagen según el escenario"""
-        print("\nPreparando imagen:")
-        print(f"Tamaño original: {img.size}")
-        print(f"Tamaño solicitado: {size}")
-        
         # Usar exactamente el tamaño especificado
         nuevo_w = int(size['width'])
         nuevo_h = int(size['height'])  # Usar height directamente del modelo
-        
-        print(f"Nuevo tamaño calculado: {nuevo_w}x{nuevo_h}")
+
+        logger.debug("Preparando imagen: %s -> %dx%d", img.size, nuevo_w, nuevo_h)
         
         # Redimensionar imagen manteniendo calidad
         img_resized = img.resize((nuevo_w, nuevo_h), Image.Resampling.LANCZOS)
@@ -179,39 +233,27 @@ Insertando firma:
         h_img_cm = DocumentModel.points_to_cm(h_img)
         w_img_cm = DocumentModel.points_to_cm(w_img)
         
-        print("\n=== DEBUG: Cálculo de posición PDF ===")
-        print(f"Dimensiones página (cm): {DocumentModel.points_to_cm(page_rect.width):.2f}x{page_height_cm:.2f}")
-        print(f"Tamaño imagen (cm): {w_img_cm:.2f}x{h_img_cm:.2f}")
-        print(f"Posición solicitada (cm desde arriba): ({pos_x_cm:.2f}, {pos_y_cm:.2f})")
-        
         # CAMBIO: Ya no invertimos Y, asumimos mismo sistema que Qt
         y_final_cm = pos_y_cm
         
-        print(f"""
-Cálculo de Y:
-  - Altura página: {page_height_cm:.2f} cm
-  - Posición Y desde arriba: {pos_y_cm:.2f} cm
-  - Altura imagen: {h_img_cm:.2f} cm
-  - Y final = {y_final_cm:.2f} cm (mantenemos Y desde arriba)
-""")
-        
         # Convertir a puntos PDF manteniendo el sistema de coordenadas
         x0 = position['x']
         y0 = position['y']  # Usamos Y directamente
         x1 = x0 + w_img
         y1 = y0 + h_img
         
-        print(f"""
-Rectángulo final:
-  - En centímetros: ({pos_x_cm:.2f}, {y_final_cm:.2f}) -> ({pos_x_cm + w_img_cm:.2f}, {y_final_cm + h_img_cm:.2f})
-  - En puntos PDF: ({x0:.2f}, {y0:.2f}) -> ({x1:.2f}, {y1:.2f})
-""")
+        logger.debug(
+            "Posición PDF: página %.2fx%.2f cm, imagen %.2fx%.2f cm, "
+            "(%.2f, %.2f) -> (%.2f, %.2f) cm, (%.2f, %.2f) -> (%.2f, %.2f) pt",
+            DocumentModel.points_to_cm(page_rect.width), page_height_cm, w_img_cm, h_img_cm,
+            pos_x_cm, y_final_cm, pos_x_cm + w_img_cm, y_final_cm + h_img_cm, x0, y0, x1, y1
+        )
         
         return fitz.Rect(x0, y0, x1, y1)
 
     def test_simple_insertion(self, pdf_path: str, output_path: str, signature_path: str):
         """Método de prueba para inserción simple"""
-        print("\n=== Test de inserción simple ===")
+        logger.debug("Test de inserción simple: %s", pdf_path)
         doc = fitz.open(pdf_path)
         page = doc[0]  # Primera página
         
@@ -236,7 +278,6 @@ Rectángulo final:
         # Guardar
         doc.save(output_path)
         doc.close()
-        print("=== Test completado ===\n")
 
     def apply_signatures(self, output_path: str) -> None:
         """Aplica las firmas al PDF y guarda el resultado"""
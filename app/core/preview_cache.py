@@ -0,0 +1,167 @@
+from collections import deque
+from typing import Hashable, Optional, Tuple
+from PIL import Image
+from app.utils.lru_cache import LRUCache
+import fitz
+import hashlib
+import os
+import threading
+
+PreviewKey = Tuple[str, int, int, float, Optional[Tuple[int, int, int]]]
+
+class PreviewCache:
+    def __init__(self, max_memory_mb: float = 256, disk_dir: Optional[str] = None,
+                 max_disk_mb: float = 1024):
+        """
+        Caché de páginas renderizadas
+
+        Las páginas se guardan como fitz.Pixmap en memoria (LRU acotada en MB).
+        Opcionalmente se mantiene un segundo nivel en disco (PNG) para
+        recuperar páginas desalojadas sin volver a rasterizar. Solo se escribe
+        en disco al desalojar una página de la memoria, y el tamaño del nivel
+        en disco se lleva como un total acumulado: la carpeta se recorre solo
+        al abrirla y cuando hay que liberar espacio.
+
+        Las páginas desalojadas quedan en cola y se escriben con flush(), que
+        el llamador ejecuta después de soltar document_pool.lock.
+
+        Args:
+            max_memory_mb (float): Tamaño máximo en memoria en megabytes
+            disk_dir (Optional[str]): Carpeta del nivel en disco, None para desactivarlo
+            max_disk_mb (float): Tamaño máximo del nivel en disco en megabytes
+        """
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.disk_hits = 0
+        self.disk_bytes = 0
+        # Páginas desalojadas pendientes de escribir (ver flush)
+        self._evicted: deque = deque()
+        # Protege la escritura en disco, disk_bytes y la limpieza de la carpeta
+        self._disk_lock = threading.Lock()
+        self.memory = LRUCache(
+            int(max_memory_mb * 1024 * 1024), sizeof=lambda pix: pix.size,
+            on_evict=self._on_evict if disk_dir else None
+        )
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.disk_bytes = sum(entry.stat().st_size for entry in self._disk_entries())
+
+    @staticmethod
+    def make_key(pdf_path: str, page_number: int, zoom: float,
+                 tile: Optional[Tuple[int, int, int]] = None) -> PreviewKey:
+        """
+        Construye la clave de una página (o un mosaico de página) renderizada
+
+        Incluye la fecha de modificación del archivo, de modo que un PDF
+        modificado en disco nunca reutiliza renders anteriores.
+
+        Args:
+            tile (Optional[Tuple[int, int, int]]): (columna, fila, tamaño) del
+                mosaico, None para la página completa
+        """
+        path = os.path.abspath(pdf_path)
+        return (path, os.stat(path).st_mtime_ns, page_number, round(float(zoom), 4), tile)
+
+    def _disk_path(self, key: PreviewKey) -> str:
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.png")
+
+    def get(self, key: PreviewKey) -> Optional[fitz.Pixmap]:
+        """Busca una página en memoria y, si no está, en disco"""
+        pix = self.memory.get(key)
+        if pix is not None or not self.disk_dir:
+            return pix
+
+        disk_path = self._disk_path(key)
+        if not os.path.exists(disk_path):
+            return None
+        try:
+            pix = fitz.Pixmap(disk_path)
+        except Exception:
+            return None
+        os.utime(disk_path)  # Marcar como usado recientemente
+        self.disk_hits += 1
+        self.memory.put(key, pix)
+        return pix
+
+    def put(self, key: PreviewKey, pix: fitz.Pixmap) -> None:
+        """
+        Almacena una página renderizada en memoria
+
+        Las páginas que desaloja (o esta misma, si no cabe en memoria) quedan
+        pendientes de escribir en disco hasta la siguiente llamada a flush().
+        """
+        if not self.memory.put(key, pix) and self.disk_dir:
+            self._evicted.append((key, pix))
+
+    def _on_evict(self, key: Hashable, pix: fitz.Pixmap) -> None:
+        self._evicted.append((key, pix))
+
+    def flush(self) -> None:
+        """
+        Escribe en disco las páginas desalojadas de la memoria
+
+        Debe llamarse sin tener document_pool.lock (p. ej. al terminar un
+        render), así la codificación PNG y la limpieza de la carpeta no
+        bloquean los demás renders ni las consultas a la caché. El PNG se
+        codifica con Pillow a partir de las muestras del pixmap: no se usa
+        MuPDF fuera del candado del pool.
+        """
+        if not self._evicted:
+            return
+        with self._disk_lock:
+            while self._evicted:
+                key, pix = self._evicted.popleft()
+                disk_path = self._disk_path(key)
+                if os.path.exists(disk_path):
+                    continue
+                mode = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA" if pix.alpha else "CMYK"}[pix.n]
+                image = Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv,
+                                         "raw", mode, pix.stride, 1)
+                if mode == "CMYK":  # PNG no admite CMYK
+                    image = image.convert("RGB")
+                image.save(disk_path, format="PNG")
+                self.disk_bytes += os.path.getsize(disk_path)
+            if self.disk_bytes > self.max_disk_bytes:
+                self._trim_disk()
+
+    def _disk_entries(self) -> list:
+        return [entry for entry in os.scandir(self.disk_dir)
+                if entry.is_file() and entry.name.endswith('.png')]
+
+    def _trim_disk(self) -> None:
+        """
+        Elimina los archivos menos usados hasta volver al límite del nivel en disco
+
+        Se llama con _disk_lock tomado.
+        """
+        entries = self._disk_entries()
+        # Recalcular el total: otro proceso pudo haber cambiado la carpeta
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+        self.disk_bytes = total
+
+    def invalidate(self, pdf_path: str) -> None:
+        """Descarta de memoria todas las páginas de un archivo"""
+        path = os.path.abspath(pdf_path)
+        for key in self.memory.keys():
+            if key[0] == path:
+                self.memory.pop(key)
+
+    def clear(self) -> None:
+        """
+        Vacía el nivel en memoria (con nivel en disco, las páginas pasan al disco)
+
+        Como flush(), debe llamarse sin tener document_pool.lock.
+        """
+        if self.disk_dir:
+            for key in self.memory.keys():
+                pix = self.memory.pop(key)
+                if pix is not None:
+                    self._evicted.append((key, pix))
+            self.flush()
+        self.memory.clear()
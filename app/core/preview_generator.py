@@ -1,15 +1,24 @@
 from PIL import Image
 from PyPDF2 import PdfReader
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
 import io
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
 from PIL.ImageQt import ImageQt
 import fitz
+import logging
 import os
+from .preview_cache import PreviewCache
+from .document_pool import document_pool
+from .signature_assets import signature_assets
+
+logger = logging.getLogger(__name__)
 
 class PreviewGenerator:
+    # Caché compartida de páginas renderizadas
+    cache = PreviewCache()
+
     def __init__(self, dpi: int = 300):
         """
         Inicializa el generador de vistas previas
@@ -21,7 +30,101 @@ class PreviewGenerator:
         self._scale_factor = dpi / 72.0  # 72 puntos = 1 pulgada
 
     @staticmethod
-    def generate_page_preview(pdf_path: str, page_number: int | None) -> Image:
+    def render_page(pdf_path: str, page_number: int, zoom: float = 2.0) -> fitz.Pixmap:
+        """
+        Rasteriza una página del PDF usando la caché de vistas previas
+
+        Args:
+            pdf_path (str): Ruta del PDF
+            page_number (int): Número de página (comenzando desde 0)
+            zoom (float): Factor de escala respecto a 72 DPI
+
+        Returns:
+            fitz.Pixmap: Página renderizada en RGB
+        """
+        key = PreviewCache.make_key(pdf_path, page_number, zoom)
+
+        # MuPDF no es seguro entre hilos: todo el acceso va serializado
+        with document_pool.lock:
+            pix = PreviewGenerator.cache.get(key)
+            if pix is not None:
+                return pix
+
+            doc = document_pool.get(pdf_path)
+            if not (0 <= page_number < len(doc)):
+                raise ValueError(f"Número de página inválido: {page_number}")
+            pix = doc[page_number].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+
+            PreviewGenerator.cache.put(key, pix)
+        # Las páginas desalojadas se escriben en disco ya sin el candado del pool
+        PreviewGenerator.cache.flush()
+        return pix
+
+    @staticmethod
+    def render_tile(pdf_path: str, page_number: int, zoom: float,
+                    tile: Tuple[int, int], tile_size: int = 512) -> fitz.Pixmap:
+        """
+        Rasteriza solo un mosaico de una página usando la caché de vistas previas
+
+        La página se divide en mosaicos de tile_size x tile_size píxeles al zoom
+        indicado; los del borde derecho e inferior pueden ser más pequeños.
+
+        Args:
+            pdf_path (str): Ruta del PDF
+            page_number (int): Número de página (comenzando desde 0)
+            zoom (float): Factor de escala respecto a 72 DPI
+            tile (Tuple[int, int]): (columna, fila) del mosaico
+            tile_size (int): Lado del mosaico en píxeles
+
+        Returns:
+            fitz.Pixmap: Mosaico renderizado; pix.x y pix.y indican su origen en píxeles
+        """
+        column, row = tile
+        key = PreviewCache.make_key(pdf_path, page_number, zoom, (column, row, tile_size))
+
+        with document_pool.lock:
+            pix = PreviewGenerator.cache.get(key)
+            if pix is not None:
+                return pix
+
+            doc = document_pool.get(pdf_path)
+            if not (0 <= page_number < len(doc)):
+                raise ValueError(f"Número de página inválido: {page_number}")
+            page = doc[page_number]
+            step = tile_size / zoom  # Lado del mosaico en puntos PDF
+            clip = fitz.Rect(
+                page.rect.x0 + column * step, page.rect.y0 + row * step,
+                page.rect.x0 + (column + 1) * step, page.rect.y0 + (row + 1) * step
+            ) & page.rect
+            if clip.is_empty:
+                raise ValueError(f"Mosaico fuera de la página: {tile}")
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+
+            PreviewGenerator.cache.put(key, pix)
+        PreviewGenerator.cache.flush()
+        return pix
+
+    @staticmethod
+    def get_cached_tile(pdf_path: str, page_number: int, zoom: float,
+                        tile: Tuple[int, int], tile_size: int = 512) -> Optional[fitz.Pixmap]:
+        """Retorna un mosaico si ya está renderizado en memoria, sin rasterizar"""
+        try:
+            key = PreviewCache.make_key(pdf_path, page_number, zoom, (tile[0], tile[1], tile_size))
+        except OSError:
+            return None
+        return PreviewGenerator.cache.memory.get(key)
+
+    @staticmethod
+    def get_cached_page(pdf_path: str, page_number: int, zoom: float = 2.0) -> Optional[fitz.Pixmap]:
+        """Retorna la página si ya está renderizada en memoria, sin rasterizar"""
+        try:
+            key = PreviewCache.make_key(pdf_path, page_number, zoom)
+        except OSError:
+            return None
+        return PreviewGenerator.cache.memory.get(key)
+
+    @staticmethod
+    def generate_page_preview(pdf_path: str, page_number: int | None, zoom: float = 2.0) -> Image:
         """Genera una vista previa de una página del PDF"""
         try:
             # Validar parámetros
@@ -30,34 +133,22 @@ class PreviewGenerator:
             if page_number is None:
                 raise ValueError("Número de página no especificado")
             
-            # Abrir documento
-            doc = fitz.open(pdf_path)
-            if not (0 <= page_number < len(doc)):
-                raise ValueError(f"Número de página inválido: {page_number}")
-            
-            # Obtener página
-            page = doc[page_number]
-            
-            # Generar imagen
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-            img_data = pix.tobytes("png")
+            # Obtener página renderizada (desde caché si ya existe)
+            pix = PreviewGenerator.render_page(pdf_path, page_number, zoom)
             
-            # Convertir a imagen PIL
-            return Image.open(io.BytesIO(img_data))
+            # Convertir a imagen PIL directamente desde las muestras (sin PNG)
+            return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
             
-        except Exception as e:
-            print(f"Error generando vista previa: {str(e)}")
+        except Exception:
+            logger.exception("Error generando vista previa de %s (página %s)", pdf_path, page_number)
             # Retornar una imagen en blanco como fallback
             return Image.new('RGB', (595, 842), 'white')  # Tamaño A4
-        finally:
-            if 'doc' in locals():
-                doc.close()
 
     def _overlay_signature(self, preview: Image.Image, signature: Dict) -> None:
         """Superpone una firma en la vista previa"""
         try:
             # Obtener imagen de firma
-            sig_image = Image.open(signature["image_path"])
+            sig_image = signature_assets.image(signature["image_path"])
             
             # Calcular posición y tamaño
             pos_x = int(signature["position"].x * self._scale_factor)
@@ -84,8 +175,8 @@ class PreviewGenerator:
             # Pegar firma
             preview.paste(sig_image, (pos_x, pos_y), mask)
             
-        except Exception as e:
-            print(f"Error al superponer firma: {e}")
+        except Exception:
+            logger.exception("Error al superponer la firma %s", signature.get("image_path"))
 
     def generate_thumbnail(
         self,
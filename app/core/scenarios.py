@@ -0,0 +1,184 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import fitz
+from app.models.page_set import PageSet
+from app.core.signature_assets import signature_assets
+
+# Umbrales para detección de cada escenario (en puntos, aproximación de A4)
+UMBRAL_A4_ANCHO = 595
+UMBRAL_A4_ALTO = 842
+MARGEN_ERROR = 50  # Tolerancia para considerar la página como A4
+
+# Escenarios de colocación automática de firmas y sellos. Los diccionarios
+# son compartidos: quien los reciba no debe modificarlos.
+ESCENARIOS: Dict[str, Dict[str, Any]] = {
+    # A4 Vertical (aprox. 595×842 pt): esquina inferior derecha
+    "A4_VERTICAL": {
+        "nombre": "A4 Vertical",
+        "orientacion": "vertical",
+        "ancho_deseado": 120,
+        "separacion_derecha": 100,
+        "separacion_inferior": 50,
+        "variabilidad_horizontal_pct": 80,
+        "variabilidad_vertical_pct": 20,
+        "variabilidad_giro": 5,
+        "rotacion_base": 0,
+    },
+    # A4 Horizontal (aprox. 842×595 pt): las separaciones se intercambian
+    "A4_HORIZONTAL": {
+        "nombre": "A4 Horizontal",
+        "orientacion": "horizontal",
+        "ancho_deseado": 70,
+        "separacion_derecha": 100,  # Actúa en el eje vertical
+        "separacion_inferior": 250,  # Actúa en el eje horizontal
+        "variabilidad_horizontal_pct": 80,
+        "variabilidad_vertical_pct": 20,
+        "variabilidad_giro": 5,
+        "rotacion_base": 90,  # Para orientar el sello en la página horizontal
+    },
+    # Hojas grandes (planos o tamaños mayores a A4); la orientación
+    # depende de las dimensiones reales de la página
+    "PLANOS": {
+        "nombre": "Planos / Hojas Grandes",
+        "orientacion": "vertical",
+        "ancho_deseado": 180,
+        "separacion_derecha": 90,
+        "separacion_inferior": 100,
+        "variabilidad_horizontal_pct": 50,
+        "variabilidad_vertical_pct": 20,
+        "variabilidad_giro": 5,
+        "rotacion_base": 0,
+    },
+}
+_PLANOS_HORIZONTAL = dict(ESCENARIOS["PLANOS"], orientacion="horizontal")
+
+@lru_cache(maxsize=256)
+def detect_scenario(width: float, height: float) -> Dict[str, Any]:
+    """
+    Escenario que corresponde a una página según sus dimensiones
+
+    Se memoriza por tamaño: un documento suele tener pocos tamaños de página
+    distintos, así detectar los escenarios de miles de páginas cuesta una
+    consulta a la caché por página.
+
+    Args:
+        width (float): Ancho de la página en puntos PDF
+        height (float): Alto de la página en puntos PDF
+
+    Returns:
+        Dict[str, Any]: Escenario (compartido, no modificar)
+    """
+    if (abs(width - UMBRAL_A4_ANCHO) <= MARGEN_ERROR
+            and abs(height - UMBRAL_A4_ALTO) <= MARGEN_ERROR
+            and width < height):
+        return ESCENARIOS["A4_VERTICAL"]
+
+    if (abs(width - UMBRAL_A4_ALTO) <= MARGEN_ERROR
+            and abs(height - UMBRAL_A4_ANCHO) <= MARGEN_ERROR
+            and width > height):
+        return ESCENARIOS["A4_HORIZONTAL"]
+
+    return _PLANOS_HORIZONTAL if width > height else ESCENARIOS["PLANOS"]
+
+def assign_scenarios(page_sizes: Iterable[Tuple[float, float]]) -> List[Dict[str, Any]]:
+    """
+    Escenario de cada página de un documento en una sola pasada
+
+    Args:
+        page_sizes (Iterable[Tuple[float, float]]): (ancho, alto) de cada página
+
+    Returns:
+        List[Dict[str, Any]]: Un escenario por página, en orden
+    """
+    return [detect_scenario(width, height) for width, height in page_sizes]
+
+def stamp_size(scenario: Dict[str, Any], aspect_ratio: float) -> Tuple[float, float]:
+    """
+    Tamaño de la firma en un escenario, ya aplicada su rotación base
+
+    El ancho (tras rotar) es el ancho_deseado del escenario y el alto
+    conserva la proporción de la imagen.
+
+    Args:
+        scenario (Dict[str, Any]): Escenario de la página
+        aspect_ratio (float): Relación alto / ancho de la imagen sin rotar
+
+    Returns:
+        Tuple[float, float]: (ancho, alto) en puntos PDF
+    """
+    width = scenario["ancho_deseado"]
+    if scenario["rotacion_base"] % 180 == 90:
+        return width, width / aspect_ratio
+    return width, width * aspect_ratio
+
+def placement_rect(page_rect: fitz.Rect, scenario: Dict[str, Any], width: float, height: float,
+                   offset_x: float = 0.0, offset_y: float = 0.0) -> fitz.Rect:
+    """
+    Rectángulo donde va la firma en una página según su escenario
+
+    En páginas verticales la firma se ubica en la esquina inferior derecha.
+    En las horizontales el 'abajo' de lectura queda en y=rect.y0, así que se
+    intercambian las separaciones: separacion_inferior desplaza en horizontal
+    y separacion_derecha en vertical.
+
+    Args:
+        page_rect (fitz.Rect): Rectángulo de la página
+        scenario (Dict[str, Any]): Escenario de la página
+        width (float): Ancho de la firma en puntos PDF
+        height (float): Alto de la firma en puntos PDF
+        offset_x (float): Desplazamiento horizontal adicional (variabilidad)
+        offset_y (float): Desplazamiento vertical adicional (variabilidad)
+
+    Returns:
+        fitz.Rect: Rectángulo de inserción
+    """
+    if scenario["orientacion"] == "horizontal":
+        x0 = page_rect.x1 - width - scenario["separacion_inferior"] + offset_x
+        y0 = page_rect.y0 + scenario["separacion_derecha"] + offset_y
+    else:
+        x0 = page_rect.x1 - width - scenario["separacion_derecha"] + offset_x
+        y0 = page_rect.y1 - height - scenario["separacion_inferior"] + offset_y
+    return fitz.Rect(x0, y0, x0 + width, y0 + height)
+
+def scenario_placements(image_path: str, page_size: Callable[[int], Tuple[float, float]],
+                        pages: Iterable[int], aspect_ratio: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Firmas colocadas por escenario, en el formato de PDFSigner.insert_signature
+
+    Las páginas con el mismo tamaño comparten escenario y rectángulo, por eso
+    se agrupan: se genera una entrada por tamaño de página con sus páginas
+    en 'pages' (PageSet), no una por página.
+
+    Args:
+        image_path (str): Ruta de la imagen de firma
+        page_size (Callable[[int], Tuple[float, float]]): (ancho, alto) de una
+            página, p. ej. PageGeometry.size
+        pages (Iterable[int]): Páginas a firmar
+        aspect_ratio (Optional[float]): Relación alto / ancho de la imagen
+            (por defecto se lee de la imagen)
+
+    Returns:
+        List[Dict[str, Any]]: Una entrada por tamaño de página, con 'rotation'
+    """
+    if aspect_ratio is None:
+        aspect_ratio = signature_assets.info(image_path).aspect_ratio
+
+    by_size: Dict[Tuple[float, float], List[int]] = {}
+    for page_number in pages:
+        width, height = page_size(page_number)
+        by_size.setdefault((float(width), float(height)), []).append(page_number)
+
+    placements = []
+    for (page_width, page_height), page_numbers in by_size.items():
+        scenario = detect_scenario(page_width, page_height)
+        width, height = stamp_size(scenario, aspect_ratio)
+        rect = placement_rect(fitz.Rect(0, 0, page_width, page_height), scenario, width, height)
+        placements.append({
+            'image_path': image_path,
+            'page_number': page_numbers[0],
+            'pages': PageSet(page_numbers),
+            'position': {'x': rect.x0, 'y': rect.y0},
+            'size': {'width': width, 'height': height},
+            'rotation': scenario["rotacion_base"],
+        })
+    return placements
@@ -0,0 +1,91 @@
+from PIL import Image
+from typing import Any, NamedTuple, Tuple
+from app.utils.lru_cache import LRUCache
+import os
+
+AssetKey = Tuple[str, int]
+
+class SignatureInfo(NamedTuple):
+    """Metadatos de una imagen de firma (se leen de la cabecera, sin decodificar)"""
+    width: int
+    height: int
+    aspect_ratio: float  # alto / ancho
+    format: str
+
+class SignatureAssetCache:
+    def __init__(self, max_memory_mb: float = 64, max_entries: int = 256):
+        """
+        Caché compartida de imágenes de firma
+
+        Evita abrir y decodificar la misma firma en cada refresco de la vista
+        previa, en cada tick del control de tamaño y en cada firmado. Por
+        archivo guarda sus metadatos, el bitmap RGBA decodificado y, en la
+        interfaz, su QPixmap. La clave incluye la fecha de modificación, así
+        que una firma reemplazada en disco se vuelve a leer.
+
+        Las imágenes retornadas se comparten: no deben modificarse.
+
+        Args:
+            max_memory_mb (float): Memoria máxima para bitmaps y QPixmaps en megabytes
+            max_entries (int): Máximo de archivos con metadatos en caché
+        """
+        max_bytes = int(max_memory_mb * 1024 * 1024)
+        self.infos = LRUCache(max_entries, sizeof=lambda info: 1)
+        self.images = LRUCache(max_bytes, sizeof=lambda img: img.width * img.height * 4)
+        self.pixmaps = LRUCache(max_bytes, sizeof=lambda pix: pix.width() * pix.height() * 4)
+
+    @staticmethod
+    def make_key(image_path: str) -> AssetKey:
+        """Clave de un archivo: ruta absoluta y fecha de modificación"""
+        path = os.path.abspath(image_path)
+        return (path, os.stat(path).st_mtime_ns)
+
+    def info(self, image_path: str) -> SignatureInfo:
+        """
+        Retorna las dimensiones y el formato de una firma
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+        """
+        key = self.make_key(image_path)
+        info = self.infos.get(key)
+        if info is None:
+            with Image.open(key[0]) as img:
+                info = SignatureInfo(img.width, img.height, img.height / img.width, img.format)
+            self.infos.put(key, info)
+        return info
+
+    def image(self, image_path: str) -> Image.Image:
+        """Retorna la firma decodificada en modo RGBA"""
+        key = self.make_key(image_path)
+        img = self.images.get(key)
+        if img is None:
+            with Image.open(key[0]) as source:
+                img = source.convert('RGBA')
+            self.images.put(key, img)
+        return img
+
+    def qpixmap(self, image_path: str) -> Any:
+        """
+        Retorna la firma como QPixmap (solo desde el hilo de la interfaz)
+
+        Qt se importa aquí para que el resto del módulo pueda usarse sin interfaz.
+        """
+        from PySide6.QtGui import QPixmap
+        from PIL.ImageQt import ImageQt
+
+        key = self.make_key(image_path)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(ImageQt(self.image(image_path)))
+            self.pixmaps.put(key, pixmap)
+        return pixmap
+
+    def clear(self) -> None:
+        """Vacía la caché"""
+        self.infos.clear()
+        self.images.clear()
+        self.pixmaps.clear()
+
+# Caché compartida por modelos, interfaz y firmador
+signature_assets = SignatureAssetCache()
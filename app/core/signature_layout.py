@@ -0,0 +1,102 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from app.models.page_set import PageSet
+from app.core.scenarios import scenario_placements
+from app.models.signature_mode_config import SignatureMode, SignatureModeConfig
+import json
+import os
+
+class SignatureLayout:
+    def __init__(self, signatures: List[Dict[str, Any]], base_dir: str = "."):
+        """
+        Disposición de firmas aplicable a cualquier documento
+
+        Cada firma indica su imagen, posición y tamaño (en puntos PDF) y las
+        páginas donde va, ya sea como lista de números (los negativos cuentan
+        desde el final, -1 = última) o como un modo de firma:
+
+            {"image_path": "firma.png",
+             "position": {"x": 400, "y": 700},
+             "size": {"width": 120, "height": 60},
+             "pages": [0, -1]}
+
+            {"image_path": "firma.png", ..., "mode": "plantilla", "pattern_interval": 2}
+
+        Con "scenario": true la posición, el tamaño y la rotación se calculan
+        según el escenario de cada página (A4 vertical, A4 horizontal, planos)
+        y no hace falta indicar 'position' ni 'size':
+
+            {"image_path": "firma.png", "scenario": true, "mode": "libre"}
+
+        Args:
+            signatures (List[Dict[str, Any]]): Firmas de la disposición
+            base_dir (str): Carpeta contra la que se resuelven rutas relativas
+        """
+        self.signatures = []
+        for index, signature in enumerate(signatures, 1):
+            if 'image_path' not in signature:
+                raise ValueError(f"Firma #{index}: se requiere 'image_path'")
+            if not signature.get('scenario') and ('position' not in signature or 'size' not in signature):
+                raise ValueError(f"Firma #{index}: se requieren 'position' y 'size' (o 'scenario': true)")
+            image_path = os.path.join(base_dir, signature['image_path'])
+            if not os.path.exists(image_path):
+                raise ValueError(f"Firma #{index}: no existe la imagen {image_path}")
+            self.signatures.append(dict(signature, image_path=os.path.abspath(image_path)))
+
+    @classmethod
+    def load(cls, layout_path: str) -> "SignatureLayout":
+        """
+        Carga una disposición desde un archivo JSON
+
+        El archivo contiene {"signatures": [...]}; las rutas de imagen
+        relativas se resuelven desde la carpeta del archivo.
+        """
+        with open(layout_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('signatures', []), os.path.dirname(os.path.abspath(layout_path)))
+
+    @staticmethod
+    def _resolve_pages(signature: Dict[str, Any], total_pages: int) -> PageSet:
+        """Páginas de una firma para un documento de total_pages páginas"""
+        mode: Union[str, None] = signature.get('mode')
+        if mode is not None:
+            config = SignatureModeConfig(SignatureMode(mode))
+            config.pattern_interval = signature.get('pattern_interval', 1)
+            config.affected_pages = signature.get('affected_pages', [])
+            config.excluded_pages = signature.get('excluded_pages', [])
+            return config.pages(total_pages)
+
+        pages = [page + total_pages if page < 0 else page for page in signature.get('pages', [0])]
+        return PageSet(page for page in pages if 0 <= page < total_pages)
+
+    def placements(self, total_pages: int,
+                   page_size: Optional[Callable[[int], Tuple[float, float]]] = None) -> List[Dict[str, Any]]:
+        """
+        Firmas en el formato de PDFSigner.insert_signature para un documento
+
+        Args:
+            total_pages (int): Número de páginas del documento
+            page_size (Optional[Callable[[int], Tuple[float, float]]]): (ancho, alto)
+                de una página; solo se usa en las firmas por escenario
+
+        Returns:
+            List[Dict[str, Any]]: Una entrada por firma (por tamaño de página en
+                las firmas por escenario), con sus páginas en 'pages'
+        """
+        placements = []
+        for signature in self.signatures:
+            pages = self._resolve_pages(signature, total_pages)
+            if not pages:
+                continue
+            if signature.get('scenario'):
+                if page_size is None:
+                    raise ValueError("Las firmas por escenario requieren las dimensiones de página")
+                placements.extend(scenario_placements(signature['image_path'], page_size, pages))
+                continue
+            placements.append({
+                'image_path': signature['image_path'],
+                'page_number': next(iter(pages)),
+                'pages': pages,
+                'position': {'x': signature['position']['x'], 'y': signature['position']['y']},
+                'size': {'width': signature['size']['width'], 'height': signature['size']['height']}
+            })
+        return placements
@@ -1,13 +1,30 @@
 from PIL import Image
 from PyPDF2 import PdfReader, PdfWriter
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional, Union
+from app.core.signature_assets import signature_assets
+from app.utils.lru_cache import LRUCache
 import os
 import math
 
+def _image_nbytes(image: Image.Image) -> int:
+    """Tamaño aproximado en memoria de una imagen decodificada"""
+    return image.width * image.height * len(image.getbands())
+
 class SignatureManager:
-    def __init__(self):
-        """Inicializa el gestor de firmas"""
-        self.signature_cache = {}  # Cache para imágenes de firma
+    def __init__(self, max_variants_mb: float = 32):
+        """
+        Inicializa el gestor de firmas
+
+        Las imágenes originales no se guardan aquí: se usan las de
+        signature_assets, que ya las comparte y acota para toda la
+        aplicación. Este gestor solo guarda lo que deriva de ellas.
+
+        Args:
+            max_variants_mb (float): Memoria máxima para firmas preparadas
+                (redimensionadas/rotadas) en megabytes
+        """
+        # Cache de variantes preparadas, por (archivo, tamaño, rotación)
+        self.variant_cache = LRUCache(int(max_variants_mb * 1024 * 1024), sizeof=_image_nbytes)
 
     def load_signature(self, image_path: str) -> Image.Image:
         """
@@ -17,41 +34,51 @@ class SignatureManager:
             image_path (str): Ruta a la imagen PNG de la firma
             
         Returns:
-            Image.Image: Imagen de firma en formato RGBA
+            Image.Image: Imagen de firma en formato RGBA (compartida, no modificar)
         """
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"No se encontró la imagen: {image_path}")
             
-        if image_path not in self.signature_cache:
-            image = Image.open(image_path)
-            if image.format != 'PNG':
-                raise ValueError("La imagen debe estar en formato PNG")
-            
-            # Convertir a RGBA si no lo está
-            if image.mode != 'RGBA':
-                image = image.convert('RGBA')
-                
-            self.signature_cache[image_path] = image
-            
-        return self.signature_cache[image_path]
+        if signature_assets.info(image_path).format != 'PNG':
+            raise ValueError("La imagen debe estar en formato PNG")
+
+        # Bitmap RGBA compartido con el resto de la aplicación
+        return signature_assets.image(image_path)
 
     def prepare_signature(
         self,
-        image: Image.Image,
+        image: Union[Image.Image, str],
         size: Tuple[float, float],
         rotation: float = 0
     ) -> Image.Image:
         """
         Prepara una imagen de firma con el tamaño y rotación especificados
         
+        Si se pasa la ruta de la firma, el resultado se guarda en caché y se
+        reutiliza para el mismo tamaño y rotación. La imagen retornada en ese
+        caso es compartida: no debe modificarse.
+        
         Args:
-            image (Image.Image): Imagen original de la firma
+            image (Union[Image.Image, str]): Imagen original de la firma o su ruta
             size (Tuple[float, float]): (ancho, alto) en puntos
             rotation (float): Ángulo de rotación en grados
             
         Returns:
             Image.Image: Imagen procesada
         """
+        if isinstance(image, str):
+            key = (signature_assets.make_key(image), (int(size[0]), int(size[1])), rotation % 360)
+            prepared = self.variant_cache.get(key)
+            if prepared is None:
+                prepared = self._prepare(self.load_signature(image), size, rotation)
+                self.variant_cache.put(key, prepared)
+            return prepared
+
+        return self._prepare(image, size, rotation)
+
+    @staticmethod
+    def _prepare(image: Image.Image, size: Tuple[float, float], rotation: float) -> Image.Image:
+        """Redimensiona y rota una imagen de firma"""
         # Redimensionar
         resized_image = image.resize((int(size[0]), int(size[1])), Image.Resampling.LANCZOS)
         
@@ -65,6 +92,13 @@ class SignatureManager:
             
         return resized_image
 
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Retorna estadísticas de las cachés de firmas (compartida) y de variantes"""
+        return {
+            "signatures": signature_assets.images.stats(),
+            "variants": self.variant_cache.stats()
+        }
+
     def insert_signature(
         self,
         pdf_page: PdfReader,
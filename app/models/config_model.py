@@ -15,6 +15,15 @@ class ApplicationConfig(BaseModel):
         default="high",
         description="Calidad de vista previa (low/medium/high)"
     )
+    preview_cache_mb: int = Field(
+        default=256,
+        gt=0,
+        description="Memoria máxima para páginas renderizadas (MB)"
+    )
+    preview_cache_dir: str = Field(
+        default="",
+        description="Carpeta de la caché de vistas previas en disco (vacío = desactivada)"
+    )
     auto_save: bool = Field(
         default=True,
         description="Guardar cambios automáticamente"
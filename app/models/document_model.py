@@ -1,56 +1,18 @@
 from pydantic import BaseModel, Field, validator
-from typing import List, Dict, Optional, ClassVar
+from typing import Any, Dict, Iterator, List, ClassVar
 from .signature_model import SignatureModel
+import logging
 import os
-from enum import Enum
 from .signature_mode_config import SignatureMode, SignatureModeConfig
+from .page_geometry import PageDimensions, PageGeometry
+from .page_set import PageSet
 
-class PageDimensions(BaseModel):
-    width: float = Field(..., gt=0, description="Ancho de la página en puntos PDF")
-    height: float = Field(..., gt=0, description="Alto de la página en puntos PDF")
-
-class SignatureMode(Enum):
-    LIBRE = "libre"          # Modo actual: página por página
-    MASIVO = "masivo"        # Primera hoja define todas excepto última
-    PLANTILLA = "plantilla"  # Patrón definido (cada N páginas)
-    SELECTIVO = "selectivo"  # Una configuración para páginas seleccionadas
-
-class SignatureModeConfig:
-    def __init__(self, mode: SignatureMode):
-        self.mode = mode
-        self.affected_pages: List[int] = []  # Páginas que serán firmadas
-        self.excluded_pages: List[int] = []  # Páginas excluidas
-        self.pattern_interval: int = 1       # Para modo plantilla
-        self.template_page: int = 0          # Página de referencia
-
-    def validate_for_document(self, total_pages: int) -> bool:
-        """Valida si el modo es aplicable al documento actual"""
-        if total_pages < 1:
-            return False
-            
-        return {
-            SignatureMode.LIBRE: self._validate_libre,
-            SignatureMode.MASIVO: self._validate_masivo,
-            SignatureMode.PLANTILLA: self._validate_plantilla,
-            SignatureMode.SELECTIVO: self._validate_selectivo
-        }[self.mode](total_pages)
-
-    def _validate_libre(self, total_pages: int) -> bool:
-        return True  # Siempre válido
-
-    def _validate_masivo(self, total_pages: int) -> bool:
-        return total_pages >= 2  # Mínimo 2 páginas
-
-    def _validate_plantilla(self, total_pages: int) -> bool:
-        return total_pages >= self.pattern_interval
-
-    def _validate_selectivo(self, total_pages: int) -> bool:
-        return all(page < total_pages for page in self.affected_pages)
+logger = logging.getLogger(__name__)
 
 class DocumentModel(BaseModel):
     pdf_path: str = Field(..., description="Ruta al archivo PDF")
     total_pages: int = Field(..., gt=0, description="Número total de páginas")
-    page_dimensions: Dict[int, PageDimensions] = Field(
+    page_dimensions: PageGeometry = Field(
         ...,
         description="Dimensiones de cada página indexadas por número de página"
     )
@@ -75,6 +37,13 @@ class DocumentModel(BaseModel):
             raise ValueError("El archivo debe ser un PDF")
         return v
 
+    @validator('page_dimensions', pre=True)
+    def validate_page_dimensions(cls, v):
+        # Se aceptan diccionarios {página: dimensiones} ya calculados
+        if isinstance(v, PageGeometry):
+            return v
+        return PageGeometry.from_dict(v)
+
     @staticmethod
     def points_to_cm(points: float) -> float:
         return points / DocumentModel.POINTS_PER_CM
@@ -84,86 +53,105 @@ class DocumentModel(BaseModel):
         return cm * DocumentModel.POINTS_PER_CM
 
     def add_signature(self, signature: SignatureModel) -> None:
-        """Añade una firma al documento"""
+        """
+        Añade una firma al documento
+
+        En los modos MASIVO, PLANTILLA y SELECTIVO la firma se guarda una sola
+        vez como plantilla junto con el conjunto de páginas donde se replica;
+        las copias por página solo se generan al firmar (expand_signatures).
+        """
         if signature.page_number >= self.total_pages:
             raise ValueError(f"Número de página inválido: {signature.page_number}")
         
-        print(f"\n=== Añadiendo firma en modo {self.signature_mode.mode.value} ===")
-        print(f"Página inicial: {signature.page_number + 1}")
-        print(f"Total de páginas en documento: {self.total_pages}")
-        
-        # En modo masivo, replicar la firma en todas las páginas excepto la última
-        if self.signature_mode.mode == SignatureMode.MASIVO:
-            print("\n=== DEBUG MODO MASIVO ===")
-            print(f"Página de firma actual: {signature.page_number + 1}")
-            
-            if signature.page_number == 0:  # Si es la primera página
-                print("Detectada firma en primera página - Replicando...")
-                print(f"Replicando firma en {self.total_pages - 1} páginas")
-                
-                # Limpiar firmas existentes en modo masivo
-                self.signatures = []
-                print("Firmas existentes limpiadas")
-                
-                # Crear copias para todas las páginas excepto la última
-                for page in range(self.total_pages - 1):
-                    new_sig = SignatureModel(
-                        image_path=signature.image_path,
-                        position=SignaturePosition(
-                            x=signature.position.x,
-                            y=signature.position.y
-                        ),
-                        size=SignatureSize(
-                            width=signature.size.width,
-                            height=signature.size.height
-                        ),
-                        page_number=page
-                    )
-                    print(f"Creada firma para página {page + 1}")
-                    self.signatures.append(new_sig)
-                
-                print(f"Total de firmas creadas: {len(self.signatures)}")
-                
+        mode = self.signature_mode.mode
+
+        if mode == SignatureMode.MASIVO:
+            if signature.page_number == 0:
+                # La firma de la primera página define todas excepto la última
+                signature.pages = self.get_pages_to_sign()
+                self.signatures = [signature]
             elif signature.page_number == self.total_pages - 1:
-                print("\nAñadiendo firma específica para última página")
+                # Firma específica para la última página
                 self.signatures.append(signature)
-            
-            print(f"\nEstado final de firmas:")
-            print(f"Total de firmas en documento: {len(self.signatures)}")
-            for idx, sig in enumerate(self.signatures):
-                print(f"Firma #{idx + 1}: Página {sig.page_number + 1}")
+        elif mode in (SignatureMode.PLANTILLA, SignatureMode.SELECTIVO):
+            signature.pages = self.get_pages_to_sign()
+            self.signatures.append(signature)
         else:
-            print("Añadiendo firma en modo normal")
             self.signatures.append(signature)
 
-    def get_pages_to_sign(self) -> List[int]:
-        """Retorna lista de páginas que serán firmadas según el modo"""
+        logger.debug("Firma añadida en modo %s (página %d, %d páginas destino)",
+                     mode.value, signature.page_number + 1, len(signature.target_pages()))
+
+    def set_signature_mode(self, mode_config: SignatureModeConfig) -> None:
+        """
+        Cambia el modo de firma y actualiza las páginas de las plantillas
+
+        En modo LIBRE no hay plantillas: cada firma vuelve a quedar solo en
+        su propia página.
+        """
+        self.signature_mode = mode_config
+        if mode_config.mode == SignatureMode.LIBRE:
+            pages = None
+        else:
+            pages = self.get_pages_to_sign()
+        for signature in self.signatures:
+            if signature.is_template:
+                signature.pages = pages
+
+    def signatures_on_page(self, page_number: int) -> List[int]:
+        """Índices de las firmas que se insertarán (o se editan) en una página"""
+        return [
+            i for i, signature in enumerate(self.signatures)
+            if signature.page_number == page_number or page_number in signature.target_pages()
+        ]
+
+    def signature_placements(self) -> Iterator[Dict[str, Any]]:
+        """
+        Genera las firmas en el formato de PDFSigner.insert_signature sin expandirlas
+
+        Cada plantilla produce una sola entrada con su conjunto de páginas en
+        'pages'; PDFSigner resuelve qué firmas caen en cada página. Las firmas
+        sueltas van sin 'pages' y se ubican solo por 'page_number'.
+        """
+        for signature in self.signatures:
+            placement = {
+                'image_path': signature.image_path,
+                'page_number': signature.page_number,
+                'position': {'x': signature.position.x, 'y': signature.position.y},
+                'size': {'width': signature.size.width, 'height': signature.size.height}
+            }
+            if signature.is_template:
+                placement['pages'] = signature.target_pages()
+            yield placement
+
+    def expand_signatures(self) -> Iterator[Dict[str, Any]]:
+        """
+        Genera las firmas por página en el formato de PDFSigner.insert_signature
+
+        Las plantillas se expanden aquí, al firmar, una entrada por página.
+        """
+        for signature in self.signatures:
+            position = {'x': signature.position.x, 'y': signature.position.y}
+            size = {'width': signature.size.width, 'height': signature.size.height}
+            for page_number in signature.target_pages():
+                yield {
+                    'image_path': signature.image_path,
+                    'page_number': page_number,
+                    'position': position,
+                    'size': size
+                }
+
+    def get_pages_to_sign(self) -> PageSet:
+        """Retorna las páginas que serán firmadas según el modo"""
         try:
-            if not self.signature_mode.validate_for_document(self.total_pages):
-                print("Modo de firma no válido para este documento")
-                return []
-            
-            if self.signature_mode.mode == SignatureMode.LIBRE:
-                return list(range(self.total_pages))
-            
-            elif self.signature_mode.mode == SignatureMode.MASIVO:
-                # Todas excepto la última
-                return list(range(self.total_pages - 1))
-            
-            elif self.signature_mode.mode == SignatureMode.PLANTILLA:
-                # Cada N páginas
-                return list(range(0, self.total_pages, 
-                                self.signature_mode.pattern_interval))
-            
-            elif self.signature_mode.mode == SignatureMode.SELECTIVO:
-                # Solo páginas seleccionadas
-                return [p for p in self.signature_mode.affected_pages 
-                       if p not in self.signature_mode.excluded_pages]
-                   
-            return []  # Por defecto, lista vacía
-        except Exception as e:
-            print(f"Error en get_pages_to_sign: {e}")
-            return []
+            pages = self.signature_mode.pages(self.total_pages)
+            if not pages and not self.signature_mode.validate_for_document(self.total_pages):
+                logger.warning("Modo de firma %s no válido para un documento de %d páginas",
+                               self.signature_mode.mode.value, self.total_pages)
+            return pages
+        except Exception:
+            logger.exception("Error en get_pages_to_sign")
+            return PageSet()
 
     class Config:
         arbitrary_types_allowed = True 
\ No newline at end of file
@@ -0,0 +1,98 @@
+from array import array
+from collections.abc import Mapping
+from pydantic import BaseModel, Field
+from typing import Any, Callable, Iterator, Optional, Tuple
+import math
+
+class PageDimensions(BaseModel):
+    width: float = Field(..., gt=0, description="Ancho de la página en puntos PDF")
+    height: float = Field(..., gt=0, description="Alto de la página en puntos PDF")
+
+# Retorna (ancho, alto) en puntos PDF de una página
+PageSizeLoader = Callable[[int], Tuple[float, float]]
+
+class PageGeometry(Mapping):
+    def __init__(self, total_pages: int, loader: Optional[PageSizeLoader] = None):
+        """
+        Dimensiones de las páginas de un documento, leídas bajo demanda
+
+        Se comporta como un Dict[int, PageDimensions] de solo lectura. Los
+        anchos y altos se guardan en dos arreglos de floats (NaN = página aún
+        no leída) y cada página se consulta al loader la primera vez que se
+        accede a ella; los PageDimensions se crean al vuelo en cada acceso.
+        Así un documento de miles de páginas se abre sin recorrerlas y ocupa
+        16 bytes por página.
+
+        Args:
+            total_pages (int): Número de páginas del documento
+            loader (Optional[PageSizeLoader]): Función que retorna (ancho, alto)
+                de una página; sin loader solo existen las páginas asignadas
+                con set_size
+        """
+        self.total_pages = total_pages
+        self._loader = loader
+        self._widths = array('d', [math.nan]) * total_pages
+        self._heights = array('d', [math.nan]) * total_pages
+
+    @classmethod
+    def from_dict(cls, dimensions: Mapping) -> "PageGeometry":
+        """
+        Crea la geometría a partir de un diccionario ya calculado
+
+        Args:
+            dimensions (Mapping): {página: PageDimensions o {"width", "height"}}
+        """
+        pages = {int(page): dims for page, dims in dimensions.items()}
+        geometry = cls(max(pages, default=-1) + 1)
+        for page, dims in pages.items():
+            if not isinstance(dims, PageDimensions):
+                dims = PageDimensions(**dims)
+            geometry.set_size(page, dims.width, dims.height)
+        return geometry
+
+    def set_size(self, page_number: int, width: float, height: float) -> None:
+        """Asigna las dimensiones de una página (en puntos PDF)"""
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Dimensiones inválidas para la página {page_number}: {width}x{height}")
+        self._widths[page_number] = width
+        self._heights[page_number] = height
+
+    def size(self, page_number: int) -> Tuple[float, float]:
+        """
+        Retorna (ancho, alto) de una página sin crear un PageDimensions
+
+        Raises:
+            KeyError: Si la página no existe
+        """
+        if not isinstance(page_number, int) or not (0 <= page_number < self.total_pages):
+            raise KeyError(page_number)
+        width = self._widths[page_number]
+        if math.isnan(width):
+            if self._loader is None:
+                raise KeyError(page_number)
+            self.set_size(page_number, *self._loader(page_number))
+            width = self._widths[page_number]
+        return width, self._heights[page_number]
+
+    @property
+    def loaded_count(self) -> int:
+        """Número de páginas cuyas dimensiones ya se conocen"""
+        return sum(1 for width in self._widths if not math.isnan(width))
+
+    def __getitem__(self, page_number: Any) -> PageDimensions:
+        width, height = self.size(page_number)
+        # Los valores ya se validaron al asignarlos
+        return PageDimensions.model_construct(width=width, height=height)
+
+    def __iter__(self) -> Iterator[int]:
+        if self._loader is not None:
+            return iter(range(self.total_pages))
+        return (page for page, width in enumerate(self._widths) if not math.isnan(width))
+
+    def __len__(self) -> int:
+        return self.total_pages if self._loader is not None else self.loaded_count
+
+    def __contains__(self, page_number: Any) -> bool:
+        if not isinstance(page_number, int) or not (0 <= page_number < self.total_pages):
+            return False
+        return self._loader is not None or not math.isnan(self._widths[page_number])
@@ -0,0 +1,112 @@
+from typing import Iterable, Iterator, Optional, Union
+
+class PageSet:
+    def __init__(self, pages: Union[range, Iterable[int]] = ()):
+        """
+        Conjunto de números de página (desde 0)
+
+        Se guarda como un range si las páginas siguen un patrón regular
+        (todas, cada N páginas) y si no como una máscara de bits en un int,
+        donde el bit p indica que la página p pertenece al conjunto. En
+        ambos casos la pertenencia es O(1) y la unión, diferencia e
+        intersección operan sobre enteros, sin recorrer listas.
+
+        Args:
+            pages (Union[range, Iterable[int]]): Páginas del conjunto
+        """
+        self._range: Optional[range] = None
+        self._mask = 0
+        if isinstance(pages, range) and (pages.step > 0 or len(pages) == 0):
+            if pages and pages.start < 0:
+                raise ValueError(f"Número de página inválido: {pages.start}")
+            self._range = pages
+        elif isinstance(pages, PageSet):
+            self._range, self._mask = pages._range, pages._mask
+        else:
+            for page in pages:
+                if page < 0:
+                    raise ValueError(f"Número de página inválido: {page}")
+                self._mask |= 1 << page
+
+    @classmethod
+    def _from_mask(cls, mask: int) -> "PageSet":
+        page_set = cls()
+        page_set._mask = mask
+        return page_set
+
+    @property
+    def mask(self) -> int:
+        """Máscara de bits del conjunto"""
+        if self._range is None:
+            return self._mask
+        pages = self._range
+        if not pages:
+            return 0
+        if pages.step == 1:
+            return ((1 << pages.stop) - 1) ^ ((1 << pages.start) - 1)
+        # Patrón de un bit cada `step` posiciones, duplicado hasta cubrir el rango
+        mask, width = 1, pages.step
+        count = len(pages)
+        built = 1
+        while built < count:
+            take = min(built, count - built)
+            mask |= (mask & ((1 << (take * width)) - 1)) << (built * width)
+            built += take
+        return mask << pages.start
+
+    def __contains__(self, page_number: int) -> bool:
+        if self._range is not None:
+            return page_number in self._range
+        return page_number >= 0 and (self._mask >> page_number) & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        if self._range is not None:
+            return iter(self._range)
+        return self._iter_mask()
+
+    def _iter_mask(self) -> Iterator[int]:
+        mask = self._mask
+        while mask:
+            low = mask & -mask  # Bit menos significativo
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __len__(self) -> int:
+        if self._range is not None:
+            return len(self._range)
+        return self._mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __or__(self, other: "PageSet") -> "PageSet":
+        return PageSet._from_mask(self.mask | PageSet(other).mask)
+
+    def __and__(self, other: "PageSet") -> "PageSet":
+        return PageSet._from_mask(self.mask & PageSet(other).mask)
+
+    def __sub__(self, other: "PageSet") -> "PageSet":
+        return PageSet._from_mask(self.mask & ~PageSet(other).mask)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (range, list, tuple, set, frozenset)):
+            other = PageSet(other)
+        if not isinstance(other, PageSet):
+            return NotImplemented
+        return self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        if self._range is not None:
+            return f"PageSet({self._range!r})"
+        return f"PageSet({list(self)!r})"
+
+    @staticmethod
+    def union(page_sets: Iterable["PageSet"]) -> "PageSet":
+        """Unión de varios conjuntos"""
+        mask = 0
+        for page_set in page_sets:
+            mask |= PageSet(page_set).mask
+        return PageSet._from_mask(mask)
@@ -1,5 +1,6 @@
 from enum import Enum
 from typing import List
+from .page_set import PageSet
 
 class SignatureMode(Enum):
     LIBRE = "libre"
@@ -27,6 +28,30 @@ class SignatureModeConfig:
             SignatureMode.SELECTIVO: self._validate_selectivo
         }[self.mode](total_pages)
 
+    def pages(self, total_pages: int) -> PageSet:
+        """
+        Páginas a las que se aplica el modo en un documento
+
+        Args:
+            total_pages (int): Número de páginas del documento
+
+        Returns:
+            PageSet: Conjunto de páginas (vacío si el modo no es válido)
+        """
+        if not self.validate_for_document(total_pages):
+            return PageSet()
+
+        if self.mode == SignatureMode.LIBRE:
+            return PageSet(range(total_pages))
+        if self.mode == SignatureMode.MASIVO:
+            # Todas excepto la última
+            return PageSet(range(total_pages - 1))
+        if self.mode == SignatureMode.PLANTILLA:
+            # Cada N páginas
+            return PageSet(range(0, total_pages, self.pattern_interval))
+        # SELECTIVO: páginas seleccionadas menos las excluidas
+        return PageSet(self.affected_pages) - PageSet(self.excluded_pages)
+
     def _validate_libre(self, total_pages: int) -> bool:
         return True  # Siempre válido
 
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, validator
 from typing import Tuple, Optional
 from PIL import Image
+from .page_set import PageSet
 import os
 from enum import Enum
 
@@ -25,16 +26,34 @@ class SignatureSize(BaseModel):
     height: float = Field(..., gt=0, description="Alto en puntos PDF")
 
 class SignatureModel:
-    def __init__(self, image_path: str, position: SignaturePosition, size: SignatureSize, page_number: int):
+    def __init__(self, image_path: str, position: SignaturePosition, size: SignatureSize, page_number: int,
+                 pages: Optional[PageSet] = None, aspect_ratio: Optional[float] = None):
+        """
+        Args:
+            aspect_ratio (Optional[float]): Relación alto / ancho de la imagen, si
+                el llamador ya la conoce (p. ej. de signature_assets.info); si se
+                omite se lee de la cabecera de la imagen
+        """
         self.image_path = image_path
         self.position = position
         self.size = size
         self.page_number = page_number
+        # Plantilla: páginas donde se replica la firma (None = solo page_number)
+        self.pages = pages
         
         # Validar y ajustar tamaño inicial
-        with Image.open(image_path) as img:
-            aspect_ratio = img.height / img.width
-            self.size.height = int(self.size.width * aspect_ratio)
+        if aspect_ratio is None:
+            with Image.open(image_path) as img:
+                aspect_ratio = img.height / img.width
+        self.size.height = int(self.size.width * aspect_ratio)
+
+    @property
+    def is_template(self) -> bool:
+        return self.pages is not None
+
+    def target_pages(self) -> PageSet:
+        """Páginas donde se insertará la firma"""
+        return self.pages if self.pages is not None else PageSet((self.page_number,))
 
     @validator('image_path')
     def validate_image_path(cls, v):
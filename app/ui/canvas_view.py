@@ -2,18 +2,55 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QGraphicsView, QGraphicsScene,
     QGraphicsPixmapItem, QComboBox, QLabel, QHBoxLayout, QPushButton
 )
-from PySide6.QtCore import Qt, QRectF, QPointF
+from PySide6.QtCore import Qt, QRectF, QPointF, QTimer
 from PySide6.QtGui import QPixmap, QImage, QPainter
-from PIL.ImageQt import ImageQt
-from PIL import Image
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from .mode_selector import ModeSelector
 from ..models.document_model import DocumentModel
+from ..models.config_model import ApplicationConfig
 from ..models.signature_mode_config import SignatureMode, SignatureModeConfig
 from ..core.preview_generator import PreviewGenerator
+from ..core.signature_assets import signature_assets
+from .preview_renderer import PreviewRenderer
 from PyPDF2 import PdfReader
 import fitz  # PyMuPDF
 import io
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# Escala de la escena respecto a puntos PDF
+PREVIEW_ZOOM = 2.0
+# Los zoom de render se redondean hacia arriba a múltiplos de este paso
+# para que la caché de páginas se reutilice entre niveles de zoom cercanos
+RENDER_ZOOM_STEP = 0.25
+# Espera antes de refinar la página tras un cambio de zoom (ms)
+REFINE_DELAY_MS = 150
+# Páginas cuyo render de detalle supera estos píxeles se muestran por mosaicos
+# (planos A0, etc.): solo se rasteriza la zona visible
+TILED_RENDER_MIN_PIXELS = 8_000_000
+# Lado de cada mosaico en píxeles de render
+TILE_SIZE = 512
+
+def pixmap_to_qimage(pix: fitz.Pixmap) -> QImage:
+    """
+    Envuelve las muestras de un fitz.Pixmap en un QImage sin copiarlas
+
+    El QImage comparte el buffer del pixmap (mismo stride), así que se guarda
+    una referencia al pixmap en el propio QImage para mantenerlo vivo.
+    """
+    if pix.n - pix.alpha != 3:
+        pix = fitz.Pixmap(fitz.csRGB, pix)  # Gris, CMYK, etc.: convertir a RGB
+
+    if pix.alpha:
+        image_format = QImage.Format.Format_RGBA8888_Premultiplied
+    else:
+        image_format = QImage.Format.Format_RGB888
+
+    image = QImage(pix.samples_mv, pix.width, pix.height, pix.stride, image_format)
+    image._source_pixmap = pix
+    return image
 
 class SignatureItem(QGraphicsPixmapItem):
     def __init__(self, pixmap, signature_index: int, original_size: tuple):
@@ -21,6 +58,8 @@ class SignatureItem(QGraphicsPixmapItem):
         self.signature_index = signature_index
         self.original_pixmap = pixmap
         self.original_size = original_size  # (width, height)
+        self.display_size = None  # Tamaño aplicado con update_size
+        self.image_path = None    # Imagen de origen, para detectar reemplazos
         self.setFlag(QGraphicsPixmapItem.ItemIsMovable)
         self.setFlag(QGraphicsPixmapItem.ItemIsSelectable)
         
@@ -32,6 +71,19 @@ class SignatureItem(QGraphicsPixmapItem):
             Qt.TransformationMode.SmoothTransformation
         )
         self.setPixmap(scaled_pixmap)
+        self.setScale(1.0)
+        self.display_size = tuple(new_size)
+
+    def preview_size(self, new_size: tuple):
+        """
+        Escala el item al nuevo tamaño sin volver a remuestrear la imagen
+
+        Es barato y se usa mientras el usuario arrastra el control de tamaño;
+        update_size aplica después el remuestreo definitivo.
+        """
+        current_width = self.display_size[0] if self.display_size else self.pixmap().width()
+        if current_width > 0:
+            self.setScale(new_size[0] / current_width)
         
     def mousePressEvent(self, event):
         """Selecciona el item al hacer clic"""
@@ -64,21 +116,20 @@ class PDFScene(QGraphicsScene):
             page_dims = self.document.page_dimensions[signature.page_number]
             page_height_cm = DocumentModel.points_to_cm(float(page_dims.height))
             
-            print("\n=== DEBUG: Actualización de posición ===")
-            print(f"Posición UI (raw): ({pos.x()}, {pos.y()})")
-            
             # Convertir a centímetros
             pos_x_cm = DocumentModel.points_to_cm(pos.x() / zoom)
             pos_y_cm = DocumentModel.points_to_cm(pos.y() / zoom)
             
-            print(f"Posición en cm desde arriba: ({pos_x_cm:.2f}, {pos_y_cm:.2f})")
-            print(f"Altura página en cm: {page_height_cm:.2f}")
-            
             # Guardar posición en el modelo (en puntos PDF)
             signature.position.x = DocumentModel.cm_to_points(pos_x_cm)
             signature.position.y = DocumentModel.cm_to_points(pos_y_cm)
             
-            print(f"Posición guardada en puntos PDF: ({signature.position.x:.2f}, {signature.position.y:.2f})")
+            logger.debug(
+                "Firma #%d movida: UI (%.1f, %.1f), %.2f x %.2f cm desde arriba "
+                "(altura de página %.2f cm), PDF (%.2f, %.2f) pt",
+                item.signature_index + 1, pos.x(), pos.y(), pos_x_cm, pos_y_cm,
+                page_height_cm, signature.position.x, signature.position.y
+            )
 
     def wheelEvent(self, event):
         """Maneja el zoom con la rueda del mouse"""
@@ -91,6 +142,8 @@ class PDFScene(QGraphicsScene):
             
             # Aplicar zoom
             view.scale(factor, factor)
+            if isinstance(self.parent(), CanvasView):
+                self.parent().schedule_refine()
         else:
             super().wheelEvent(event)
 
@@ -98,15 +151,33 @@ class PDFScene(QGraphicsScene):
         """Sobrescribir clear para limpiar también signature_items"""
         super().clear()
         self.signature_items.clear()
-        self.document = None
 
 class CanvasView(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, config: ApplicationConfig | None = None):
         super().__init__(parent)
+        self.config = config or ApplicationConfig()
         self.document = None
         self.current_page = 0
         self.mode_indicator = QLabel()
         self.affected_pages_indicator = QLabel()
+        self.page_item = None
+        self._page_zoom = 0.0
+        self._shown_page = None  # (ruta, página) del page_item actual
+        self._tile_items: Dict[Tuple[int, int], QGraphicsPixmapItem] = {}
+        self._tile_zoom = 0.0
+
+        # Render de páginas en segundo plano
+        self.renderer = PreviewRenderer(self)
+        self.renderer.page_rendered.connect(self.on_page_rendered)
+        self.renderer.render_failed.connect(self.on_render_failed)
+        # Los mosaicos van en su propia cola para no cancelar la pasada de la página
+        self.tile_renderer = PreviewRenderer(self)
+        self.tile_renderer.tile_rendered.connect(self.on_tile_rendered)
+        self.tile_renderer.render_failed.connect(self.on_render_failed)
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(REFINE_DELAY_MS)
+        self._refine_timer.timeout.connect(self._refine_page)
         self.init_ui()
 
     def init_ui(self):
@@ -148,6 +219,8 @@ class CanvasView(QWidget):
         self.graphics_view.setRenderHint(QPainter.SmoothPixmapTransform)
         self.graphics_view.setDragMode(QGraphicsView.ScrollHandDrag)
         self.graphics_view.setBackgroundBrush(Qt.white)
+        self.graphics_view.horizontalScrollBar().valueChanged.connect(self._on_view_scrolled)
+        self.graphics_view.verticalScrollBar().valueChanged.connect(self._on_view_scrolled)
         layout.addWidget(self.graphics_view)
         
         # Debug label
@@ -169,6 +242,7 @@ class CanvasView(QWidget):
         """Carga un nuevo documento"""
         self.document = document
         self.scene.document = document
+        self._shown_page = None  # El archivo pudo cambiar aunque la ruta sea la misma
         
         # Actualizar selector de páginas
         self.page_selector.clear()
@@ -192,8 +266,8 @@ class CanvasView(QWidget):
     def on_mode_changed(self, mode_config: SignatureModeConfig):
         """Maneja cambios en el modo de firma"""
         if self.document:
-            print(f"Actualizando modo a: {mode_config.mode.value}")
-            self.document.signature_mode = mode_config
+            logger.info("Modo de firma: %s", mode_config.mode.value)
+            self.document.set_signature_mode(mode_config)
             
             # Actualizar selector de páginas según el modo
             self.page_selector.clear()
@@ -217,70 +291,274 @@ class CanvasView(QWidget):
     def update_preview(self):
         """Actualiza la vista previa del PDF"""
         if not self.document or not hasattr(self, 'scene'):
-            print("No hay documento o escena para mostrar")
+            logger.debug("No hay documento o escena para mostrar")
             return
         
         try:
             # Validar página actual
             if self.current_page is None:
-                print("No hay página seleccionada")
+                logger.debug("No hay página seleccionada")
                 return
             
             if not (0 <= self.current_page < self.document.total_pages):
-                print(f"Página inválida: {self.current_page}")
+                logger.warning("Página inválida: %s", self.current_page)
                 return
             
-            print(f"Actualizando vista previa de página {self.current_page + 1}")
-            
-            # Limpiar escena
-            self.scene.clear()
-            
-            # Factor de zoom para la vista previa (2x por defecto)
-            zoom = 2.0
-            
-            # Generar vista previa de la página actual
-            preview = PreviewGenerator.generate_page_preview(
-                self.document.pdf_path, 
-                self.current_page
-            )
+            # La página solo se vuelve a mostrar si cambió; las ediciones de
+            # firmas conservan el page_item y actualizan únicamente sus items
+            shown_page = (self.document.pdf_path, self.current_page)
+            if shown_page != self._shown_page:
+                logger.debug("Mostrando página %d", self.current_page + 1)
+                self._remove_page_items()
+                # El render pesado ocurre en segundo plano
+                self._show_page(self.current_page)
+                self._shown_page = shown_page
             
-            # Convertir a QPixmap y mostrar
-            pixmap = QPixmap.fromImage(ImageQt(preview))
-            page_item = self.scene.addPixmap(pixmap)
-            
-            # Añadir firmas si existen
-            if self.document.signatures:
-                for i, signature in enumerate(self.document.signatures):
-                    if signature.page_number == self.current_page:
-                        # Cargar imagen de firma
-                        sig_image = Image.open(signature.image_path)
-                        sig_pixmap = QPixmap.fromImage(ImageQt(sig_image))
-                        
-                        # Tamaño original en puntos PDF
-                        original_size = (
-                            signature.size.width * zoom,
-                            signature.size.height * zoom
-                        )
-                        
-                        # Crear y posicionar item de firma
-                        sig_item = SignatureItem(sig_pixmap, i, original_size)
-                        sig_item.setPos(
-                            signature.position.x * zoom,
-                            signature.position.y * zoom
-                        )
-                        sig_item.update_size(original_size)
-                        self.scene.addItem(sig_item)
-                        self.scene.signature_items[i] = sig_item
+            self.sync_signatures()
             
             # Actualizar indicadores
             self.update_mode_indicators()
             
         except Exception as e:
-            print(f"Error en update_preview: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error en update_preview")
             self.debug_label.setText(f"Error en vista previa: {str(e)}")
 
+    def sync_signatures(self):
+        """
+        Sincroniza los items de firma de la escena con el modelo
+
+        Solo crea, elimina, mueve o redimensiona los items que cambiaron;
+        los demás (y la página) se conservan tal cual.
+        """
+        zoom = PREVIEW_ZOOM
+        wanted = {
+            i: self.document.signatures[i]
+            for i in self.document.signatures_on_page(self.current_page)
+        }
+
+        items = self.scene.signature_items
+        for i in list(items):
+            signature = wanted.get(i)
+            if signature is None or items[i].image_path != signature.image_path:
+                self.scene.removeItem(items.pop(i))
+
+        for i, signature in wanted.items():
+            position = QPointF(signature.position.x * zoom, signature.position.y * zoom)
+            size = (signature.size.width * zoom, signature.size.height * zoom)
+
+            sig_item = items.get(i)
+            if sig_item is None:
+                sig_pixmap = signature_assets.qpixmap(signature.image_path)
+                sig_item = SignatureItem(sig_pixmap, i, size)
+                sig_item.image_path = signature.image_path
+                self.scene.addItem(sig_item)
+                items[i] = sig_item
+
+            if sig_item.pos() != position:
+                sig_item.setPos(position)
+            if sig_item.display_size != size:
+                sig_item.update_size(size)
+
+    def _remove_page_items(self):
+        """Quita de la escena la página mostrada y sus mosaicos"""
+        self._reset_tiles()
+        if self.page_item is not None:
+            self.scene.removeItem(self.page_item)
+            self.page_item = None
+        self._shown_page = None
+
+    def _quantize_zoom(self, zoom: float) -> float:
+        """Redondea un zoom de render al paso configurado, sin superar el DPI máximo"""
+        max_zoom = self.config.preview_dpi / 72.0
+        zoom = math.ceil(zoom / RENDER_ZOOM_STEP) * RENDER_ZOOM_STEP
+        return max(RENDER_ZOOM_STEP, min(zoom, max_zoom))
+
+    def _viewport_zoom(self, page_number: int) -> float:
+        """Zoom con el que la página completa cabe en el área visible"""
+        page_dims = self.document.page_dimensions[page_number]
+        viewport = self.graphics_view.viewport()
+        ratio = self.graphics_view.devicePixelRatioF()
+        fit = min(viewport.width() / page_dims.width, viewport.height() / page_dims.height)
+        return self._quantize_zoom(fit * ratio)
+
+    def _detail_zoom(self) -> float:
+        """Zoom de render necesario para la escala actual de la vista"""
+        view_scale = self.graphics_view.transform().m11()
+        ratio = self.graphics_view.devicePixelRatioF()
+        return self._quantize_zoom(PREVIEW_ZOOM * view_scale * ratio)
+
+    def _show_page(self, page_number: int):
+        """
+        Muestra una página en la escena
+
+        Si la página ya está renderizada en caché con el detalle necesario se
+        muestra de inmediato. Si no, se coloca un marcador en blanco del tamaño
+        de la página y se solicita el render en segundo plano: primero una
+        pasada rápida ajustada al área visible y luego la resolución que
+        requiere la escala actual de la vista.
+        """
+        self.page_item = self.scene.addPixmap(QPixmap())
+        self.page_item.setZValue(-1)  # Siempre debajo de las firmas
+        self._page_zoom = 0.0
+        self._reset_tiles()
+
+        detail_zoom = self._detail_zoom()
+        first_zoom = self._viewport_zoom(page_number)
+        tiled = self._needs_tiles(page_number, detail_zoom)
+        if tiled:
+            # La página completa solo se rasteriza a baja resolución como fondo;
+            # el detalle llega por mosaicos de la zona visible
+            detail_zoom = min(first_zoom, detail_zoom)
+
+        pix = PreviewGenerator.get_cached_page(self.document.pdf_path, page_number, detail_zoom)
+        if pix is not None:
+            self.renderer.cancel()
+            self.on_page_rendered(page_number, detail_zoom, pix)
+        else:
+            page_dims = self.document.page_dimensions[page_number]
+            placeholder = QPixmap(max(1, int(page_dims.width)), max(1, int(page_dims.height)))
+            placeholder.fill(Qt.white)
+            self.page_item.setPixmap(placeholder)
+            self.page_item.setScale(PREVIEW_ZOOM)
+
+            zooms = [detail_zoom]
+            if first_zoom < detail_zoom:
+                zooms.insert(0, first_zoom)
+            self.renderer.request(self.document.pdf_path, page_number, zooms)
+
+        if tiled:
+            self.schedule_refine()
+
+    def schedule_refine(self):
+        """Programa el refinado de la página tras un cambio de zoom o tamaño"""
+        if self.document and self.page_item is not None:
+            self._refine_timer.start()
+
+    def _refine_page(self):
+        """Vuelve a renderizar la página si la vista necesita más detalle"""
+        if not self.document or self.page_item is None:
+            return
+        detail_zoom = self._detail_zoom()
+        if self._needs_tiles(self.current_page, detail_zoom):
+            self._update_tiles(detail_zoom)
+            return
+
+        self._reset_tiles()
+        if detail_zoom > self._page_zoom:
+            self.renderer.request(self.document.pdf_path, self.current_page, [detail_zoom])
+
+    def _on_view_scrolled(self, _value: int):
+        """Al desplazar la vista, los mosaicos visibles cambian"""
+        if self._tile_zoom:
+            self.schedule_refine()
+
+    def _needs_tiles(self, page_number: int, zoom: float) -> bool:
+        """Indica si la página a este zoom es demasiado grande para rasterizarla entera"""
+        page_dims = self.document.page_dimensions[page_number]
+        return page_dims.width * page_dims.height * zoom * zoom > TILED_RENDER_MIN_PIXELS
+
+    def _visible_tiles(self, page_number: int, zoom: float) -> List[Tuple[int, int]]:
+        """
+        Mosaicos que cubren el área visible más un anillo de vecinos para precarga
+
+        Returns:
+            List[Tuple[int, int]]: (columna, fila) de cada mosaico, los visibles
+                primero y el resto ordenados por cercanía al centro de la vista
+        """
+        page_dims = self.document.page_dimensions[page_number]
+        columns = math.ceil(page_dims.width * zoom / TILE_SIZE)
+        rows = math.ceil(page_dims.height * zoom / TILE_SIZE)
+
+        visible = self.graphics_view.mapToScene(self.graphics_view.viewport().rect()).boundingRect()
+        scale = zoom / PREVIEW_ZOOM / TILE_SIZE  # Coordenadas de escena -> índice de mosaico
+        first_col = max(0, int(visible.left() * scale))
+        last_col = min(columns - 1, int(visible.right() * scale))
+        first_row = max(0, int(visible.top() * scale))
+        last_row = min(rows - 1, int(visible.bottom() * scale))
+        center = ((first_col + last_col) / 2, (first_row + last_row) / 2)
+
+        def priority(tile):
+            column, row = tile
+            outside = not (first_col <= column <= last_col and first_row <= row <= last_row)
+            return (outside, abs(column - center[0]) + abs(row - center[1]))
+
+        tiles = [
+            (column, row)
+            for column in range(max(0, first_col - 1), min(columns, last_col + 2))
+            for row in range(max(0, first_row - 1), min(rows, last_row + 2))
+        ]
+        return sorted(tiles, key=priority)
+
+    def _update_tiles(self, zoom: float):
+        """Muestra los mosaicos de la zona visible y solicita los que faltan"""
+        if zoom != self._tile_zoom:
+            self._reset_tiles()
+            self._tile_zoom = zoom
+
+        wanted = self._visible_tiles(self.current_page, zoom)
+        # Liberar los mosaicos que quedaron lejos de la vista
+        wanted_set = set(wanted)
+        for tile in [tile for tile in self._tile_items if tile not in wanted_set]:
+            self.scene.removeItem(self._tile_items.pop(tile))
+
+        missing = []
+        for tile in wanted:
+            if tile in self._tile_items:
+                continue
+            pix = PreviewGenerator.get_cached_tile(
+                self.document.pdf_path, self.current_page, zoom, tile, TILE_SIZE
+            )
+            if pix is not None:
+                self.on_tile_rendered(self.current_page, zoom, tile, pix)
+            else:
+                missing.append(tile)
+
+        if missing:
+            self.tile_renderer.request_tiles(
+                self.document.pdf_path, self.current_page, zoom, missing, TILE_SIZE
+            )
+        else:
+            self.tile_renderer.cancel()
+
+    def _reset_tiles(self):
+        """Descarta los mosaicos mostrados y cancela los pendientes"""
+        self.tile_renderer.cancel()
+        for item in self._tile_items.values():
+            if item.scene() is self.scene:
+                self.scene.removeItem(item)
+        self._tile_items.clear()
+        self._tile_zoom = 0.0
+
+    def on_tile_rendered(self, page_number: int, zoom: float, tile, pix):
+        """Coloca un mosaico renderizado sobre la página de baja resolución"""
+        if (not self.document or self.page_item is None or page_number != self.current_page
+                or zoom != self._tile_zoom or tile in self._tile_items):
+            return
+
+        item = self.scene.addPixmap(QPixmap.fromImage(pixmap_to_qimage(pix)))
+        item.setZValue(-0.5)  # Sobre la página, debajo de las firmas
+        item.setScale(PREVIEW_ZOOM / zoom)
+        # pix.x / pix.y: origen del mosaico en píxeles de render
+        item.setPos(pix.x * PREVIEW_ZOOM / zoom, pix.y * PREVIEW_ZOOM / zoom)
+        self._tile_items[tile] = item
+
+    def on_page_rendered(self, page_number: int, zoom: float, pix):
+        """Reemplaza la página mostrada cuando llega un render más detallado"""
+        if not self.document or self.page_item is None or page_number != self.current_page:
+            return
+        if zoom < self._page_zoom:
+            return  # Ya se muestra una versión con más detalle
+
+        self.page_item.setPixmap(QPixmap.fromImage(pixmap_to_qimage(pix)))
+        # Mantener las coordenadas de escena en PREVIEW_ZOOM sea cual sea el render
+        self.page_item.setScale(PREVIEW_ZOOM / zoom)
+        self._page_zoom = zoom
+
+    def on_render_failed(self, page_number: int, message: str):
+        """Informa un error de render (se mantiene la página en blanco)"""
+        logger.error("Error generando vista previa de la página %d: %s", page_number + 1, message)
+        self.debug_label.setText(f"Error en vista previa: {message}")
+
     def _get_preview_pages(self) -> List[int]:
         """Determina qué páginas mostrar según el modo actual"""
         if not self.document:
@@ -299,11 +577,10 @@ class CanvasView(QWidget):
         if index >= 0 and self.document:
             page_number = self.page_selector.itemData(index)
             if page_number is not None:
-                print(f"\n=== Cambiando a página {page_number + 1} ===")
                 self.current_page = page_number
                 self.update_preview()
             else:
-                print(f"Error: Índice de página inválido: {index}")
+                logger.warning("Índice de página inválido: %s", index)
 
     def resizeEvent(self, event):
         """Ajusta la vista cuando se redimensiona el widget"""
@@ -313,6 +590,7 @@ class CanvasView(QWidget):
                 self.scene.sceneRect(),
                 Qt.AspectRatioMode.KeepAspectRatio
             )
+            self.schedule_refine()
 
     def wheelEvent(self, event):
         """Redirige el evento de rueda al QGraphicsView"""
@@ -321,6 +599,7 @@ class CanvasView(QWidget):
     def zoom(self, factor):
         """Aplica zoom a la vista"""
         self.graphics_view.scale(factor, factor)
+        self.schedule_refine()
 
     def fit_to_view(self):
         """Ajusta el contenido a la vista"""
@@ -329,6 +608,7 @@ class CanvasView(QWidget):
                 self.scene.sceneRect(),
                 Qt.AspectRatioMode.KeepAspectRatio
             )
+            self.schedule_refine()
 
     def update_view(self):
         """Actualiza la vista completa"""
@@ -340,26 +620,13 @@ class CanvasView(QWidget):
         """Actualiza la posición de la firma en el modelo"""
         if self.document and item.signature_index < len(self.document.signatures):
             signature = self.document.signatures[item.signature_index]
-            old_page = signature.page_number
             
-            print("\n=== Actualizando posición de firma ===")
-            print(f"Firma #{item.signature_index + 1} en página {self.current_page + 1}")
+            # Actualizar página actual (una plantilla conserva su página de referencia)
+            if not signature.is_template:
+                signature.page_number = self.current_page
             
-            # Actualizar página actual
-            signature.page_number = self.current_page
-            
-            # En modo masivo, actualizar todas las firmas si movemos la primera
-            if (self.document.signature_mode.mode == SignatureMode.MASIVO and 
-                old_page == 0 and self.current_page == 0):
-                pos = item.pos()
-                print("Modo masivo: Actualizando todas las firmas")
-                for sig in self.document.signatures[:-1]:  # Excluir última página
-                    sig.position.x = pos.x() / 2.0  # Convertir coordenadas UI a PDF
-                    sig.position.y = pos.y() / 2.0
-                    print(f"Posición actualizada: ({sig.position.x:.2f}, {sig.position.y:.2f})")
-            else:
-                # Actualizar posición normal
-                self.scene.update_signature_position(item)
+            # Una plantilla es un único modelo: moverla mueve todas sus páginas
+            self.scene.update_signature_position(item)
             
             # Actualizar vista previa
             self.update_preview()
@@ -390,11 +657,17 @@ class CanvasView(QWidget):
                 affected += f" (excluidas: {excluded})"
             self.affected_pages_indicator.setText(affected)
             
-        except Exception as e:
-            print(f"Error actualizando indicadores: {e}")
+        except Exception:
+            logger.exception("Error actualizando indicadores")
             self.mode_indicator.setText("Error en modo")
             self.affected_pages_indicator.setText("")
 
+    def preview_signature_size(self, signature_index: int, new_size: tuple):
+        """Escala en vivo el item de una firma (new_size en coordenadas de escena)"""
+        sig_item = self.scene.signature_items.get(signature_index)
+        if sig_item is not None:
+            sig_item.preview_size(new_size)
+
     def update_signature_size(self, signature_index: int, new_size: tuple):
         """Actualiza el tamaño de una firma específica"""
         if signature_index in self.scene.signature_items:
@@ -406,8 +679,19 @@ class CanvasView(QWidget):
             signature.size.width = new_size[0] / 2.0  # Convertir de UI a puntos PDF
             signature.size.height = new_size[1] / 2.0 
 
+    def shutdown(self):
+        """Detiene el render en segundo plano (al cerrar la aplicación)"""
+        self._refine_timer.stop()
+        self.renderer.shutdown()
+        self.tile_renderer.shutdown()
+
     def clear_view(self):
         """Limpia la vista del canvas"""
+        self.renderer.cancel()
+        self._reset_tiles()
+        self._refine_timer.stop()
+        self.page_item = None
+        self._shown_page = None
         if hasattr(self, 'scene'):
             # Limpiar escena
             self.scene.clear()
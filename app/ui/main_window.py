@@ -7,18 +7,26 @@ from ..models.document_model import DocumentModel
 from ..models.config_model import ApplicationConfig
 from .signature_panel import SignaturePanel
 from .canvas_view import CanvasView
+import logging
 import os
-from PyPDF2 import PdfWriter, PdfReader
 from PIL import Image
 import io
 from ..core.pdf_signer import PDFSigner
-import traceback
-from ..models.signature_mode_config import SignatureMode
+from ..core.preview_generator import PreviewGenerator
+from ..core.preview_cache import PreviewCache
+from ..core.document_pool import document_pool
+from ..core.document_loader import load_document_model
+
+logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.config = ApplicationConfig()
+        PreviewGenerator.cache = PreviewCache(
+            max_memory_mb=self.config.preview_cache_mb,
+            disk_dir=self.config.preview_cache_dir or None
+        )
         self.document = None
         self.pdf_signer = PDFSigner()
         self.init_ui()
@@ -60,7 +68,7 @@ class MainWindow(QMainWindow):
         toolbar_layout.addStretch()
         
         # Vista de canvas
-        self.canvas_view = CanvasView(self)
+        self.canvas_view = CanvasView(self, config=self.config)
         central_layout.addWidget(self.canvas_view, stretch=1)
 
     def open_pdf(self):
@@ -86,33 +94,18 @@ class MainWindow(QMainWindow):
 
     def load_document(self, pdf_path: str):
         """Carga un documento PDF"""
-        # Crear manejador de PDF
-        reader = PdfReader(pdf_path)
-        
-        # Obtener dimensiones de páginas
-        page_dimensions = {}
-        for i in range(len(reader.pages)):
-            page = reader.pages[i]
-            width = float(page.mediabox.width)
-            height = float(page.mediabox.height)
-            page_dimensions[i] = {"width": width, "height": height}
-        
         # Obtener el modo actual si existe
         current_mode = None
         if hasattr(self, 'canvas_view') and hasattr(self.canvas_view, 'mode_selector'):
             current_mode = self.canvas_view.mode_selector.current_config
         
-        # Crear modelo de documento
-        self.document = DocumentModel(
-            pdf_path=pdf_path,
-            total_pages=len(reader.pages),
-            page_dimensions=page_dimensions
-        )
+        # Crear modelo de documento (las dimensiones se leen bajo demanda)
+        self.document = load_document_model(pdf_path)
         
         # Restaurar el modo si existía
         if current_mode:
-            print(f"Restaurando modo: {current_mode.mode.value}")
-            self.document.signature_mode = current_mode
+            logger.debug("Restaurando modo: %s", current_mode.mode.value)
+            self.document.set_signature_mode(current_mode)
         
         # Actualizar vista
         self.canvas_view.load_document(self.document)
@@ -133,76 +126,21 @@ class MainWindow(QMainWindow):
             )
             
             if file_path:
-                print("\n=== Preparando firmas para inserción ===")
-                print(f"Modo actual: {self.document.signature_mode.mode.value}")
-                print(f"Total de firmas en documento: {len(self.document.signatures)}")
-                print("\nFirmas actuales:")
-                for idx, sig in enumerate(self.document.signatures):
-                    print(f"Firma #{idx + 1}:")
-                    print(f"  - Página: {sig.page_number + 1}")
-                    print(f"  - Posición: ({sig.position.x:.2f}, {sig.position.y:.2f})")
-                    print(f"  - Tamaño: {sig.size.width}x{sig.size.height}")
-                    print(f"  - Archivo: {sig.image_path}")
-                
-                # Convertir firmas al formato esperado por PDFSigner
-                signatures = []
-                
-                # En modo masivo, replicar la firma de la primera página
-                if self.document.signature_mode.mode == SignatureMode.MASIVO:
-                    print("\n=== Procesando modo masivo ===")
-                    
-                    # Buscar firma en la primera página
-                    first_page_sig = None
-                    last_page_sig = None
-                    
-                    for sig in self.document.signatures:
-                        if sig.page_number == 0:
-                            first_page_sig = sig
-                            print("Encontrada firma de primera página")
-                        elif sig.page_number == self.document.total_pages - 1:
-                            last_page_sig = sig
-                            print("Encontrada firma de última página")
-                    
-                    print(f"Firma de primera página encontrada: {first_page_sig is not None}")
-                    
-                    if first_page_sig:
-                        print(f"Replicando firma en {self.document.total_pages - 1} páginas")
-                        # Replicar en todas las páginas excepto la última
-                        for page in range(self.document.total_pages - 1):
-                            signatures.append({
-                                'image_path': first_page_sig.image_path,
-                                'page_number': page,
-                                'position': {
-                                    'x': first_page_sig.position.x,
-                                    'y': first_page_sig.position.y
-                                },
-                                'size': {
-                                    'width': first_page_sig.size.width,
-                                    'height': first_page_sig.size.height
-                                }
-                            })
-                            print(f"Firma replicada en página {page + 1}")
-                else:
-                    print("\nProcesando modo normal")
-                    # Modo normal: usar firmas tal cual están
-                    for sig in self.document.signatures:
-                        signatures.append({
-                            'image_path': sig.image_path,
-                            'page_number': sig.page_number,
-                            'position': {'x': sig.position.x, 'y': sig.position.y},
-                            'size': {'width': sig.size.width, 'height': sig.size.height}
-                        })
+                logger.info("Guardando %s en modo %s con %d firmas",
+                            file_path, self.document.signature_mode.mode.value,
+                            len(self.document.signatures))
+                if logger.isEnabledFor(logging.DEBUG):
+                    for idx, sig in enumerate(self.document.signatures):
+                        logger.debug("Firma #%d: %s en %d página(s)",
+                                     idx + 1, sig.image_path, len(sig.target_pages()))
+
+                # Las plantillas viajan con su conjunto de páginas (sin expandir)
+                signatures = self.document.signature_placements()
                 
-                print(f"\nTotal de firmas preparadas: {len(signatures)}")
-                print("Detalle de firmas a insertar:")
-                for idx, sig in enumerate(signatures, 1):
-                    print(f"""
-Firma preparada #{idx}:
-  - Página: {sig['page_number'] + 1}
-  - Posición: ({sig['position']['x']:.2f}, {sig['position']['y']:.2f})
-  - Tamaño: {sig['size']['width']}x{sig['size']['height']}
-  - Archivo: {sig['image_path']}
-""")
+                # Detener el render en segundo plano (MuPDF no es seguro entre hilos)
+                for renderer in (self.canvas_view.renderer, self.canvas_view.tile_renderer):
+                    renderer.cancel()
+                    renderer.wait()
                 
                 # Insertar firmas
                 self.pdf_signer.insert_signature(
@@ -214,19 +152,19 @@ Firma preparada #{idx}:
                 QMessageBox.information(self, "Éxito", "PDF guardado correctamente")
                 
         except Exception as e:
-            print(f"Error al guardar PDF: {e}")
-            traceback.print_exc()
+            logger.exception("Error al guardar PDF")
             QMessageBox.critical(self, "Error", f"Error al guardar el PDF: {str(e)}")
 
     def closeEvent(self, event):
         """Maneja el cierre de la ventana"""
         # TODO: Verificar cambios sin guardar
+        # Detener el render antes de cerrar los documentos que usa
+        self.canvas_view.shutdown()
+        document_pool.close_all()
         event.accept()
 
     def reset_application_state(self):
         """Resetea el estado de la aplicación al cambiar de modo"""
-        print("\n=== Reseteando estado de la aplicación ===")
-        
         # Limpiar documento actual
         self.document = None
         
@@ -242,7 +180,7 @@ Firma preparada #{idx}:
         # Deshabilitar botones que requieren documento
         self.btn_save.setEnabled(False)
         
-        print("Estado de la aplicación reseteado")
+        logger.debug("Estado de la aplicación reseteado")
         
         # Mostrar mensaje al usuario
         QMessageBox.information(
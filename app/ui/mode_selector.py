@@ -4,6 +4,9 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Signal, Qt
 from ..models.signature_mode_config import SignatureMode, SignatureModeConfig
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ModeSelector(QWidget):
     mode_changed = Signal(SignatureModeConfig)  # Señal cuando cambia el modo
@@ -78,25 +81,20 @@ class ModeSelector(QWidget):
         """Maneja cambios en el modo de firma"""
         # Obtener el modo directamente del índice
         mode = list(SignatureMode)[index]
-        print(f"\n=== Cambiando a modo: {mode.value} ===")
-        
         # Actualizar la configuración actual
         self.current_config = SignatureModeConfig(mode)
         self.config_stack.setCurrentIndex(index)
         
         # Configurar modo según selección
         if mode == SignatureMode.MASIVO:
-            print("Configurando modo masivo")
-            # No necesita configuración adicional
+            pass  # No necesita configuración adicional
         elif mode == SignatureMode.PLANTILLA:
-            print("Configurando modo plantilla")
             self.current_config.pattern_interval = self.interval_spin.value()
         elif mode == SignatureMode.SELECTIVO:
-            print("Configurando modo selectivo")
             self.current_config.affected_pages = [i for i in range(self.pages_list.count())
                                            if self.pages_list.item(i).checkState() == Qt.Checked]
         
-        print(f"Configuración completada. Modo: {self.current_config.mode.value}")
+        logger.debug("Modo configurado: %s", self.current_config.mode.value)
         
         # Obtener la ventana principal y resetear el estado
         main_window = self.window()
@@ -0,0 +1,133 @@
+from PySide6.QtCore import QObject, Signal
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import List, Tuple
+from ..core.preview_generator import PreviewGenerator
+
+class _RenderSignals(QObject):
+    """Señales emitidas desde los hilos de render (se entregan en el hilo de la GUI)"""
+    finished = Signal(int, int, float, object)  # request_id, página, zoom, fitz.Pixmap
+    tile_finished = Signal(int, int, float, object, object)  # ... + (columna, fila)
+    failed = Signal(int, int, str)              # request_id, página, mensaje
+
+class PreviewRenderer(QObject):
+    """
+    Rasteriza páginas en segundo plano
+
+    Cada llamada a request() invalida las solicitudes anteriores: las tareas
+    que aún no empezaron se descartan y los resultados tardíos se ignoran.
+    Los resultados se entregan con page_rendered como fitz.Pixmap.
+    """
+    page_rendered = Signal(int, float, object)  # página, zoom, fitz.Pixmap
+    tile_rendered = Signal(int, float, object, object)  # página, zoom, (columna, fila), fitz.Pixmap
+    render_failed = Signal(int, str)            # página, mensaje
+
+    def __init__(self, parent=None, max_threads: int = 1):
+        super().__init__(parent)
+        # MuPDF se usa serializado (ver DocumentPool.lock): un hilo basta
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="preview-render"
+        )
+        self.signals = _RenderSignals(self)
+        self.signals.finished.connect(self._on_finished)
+        self.signals.tile_finished.connect(self._on_tile_finished)
+        self.signals.failed.connect(self._on_failed)
+        self._request_id = 0
+        self._pending: List[Future] = []
+
+    def request(self, pdf_path: str, page_number: int, zooms: List[float]) -> int:
+        """
+        Solicita el render de una página en uno o varios niveles de zoom
+
+        Los niveles se rasterizan en el orden dado (p. ej. baja resolución
+        primero y luego la definitiva).
+
+        Returns:
+            int: Identificador de la solicitud
+        """
+        self.cancel()
+        self._pending += [
+            self.executor.submit(self._render, self._request_id, pdf_path, page_number, zoom)
+            for zoom in zooms
+        ]
+        return self._request_id
+
+    def request_tiles(self, pdf_path: str, page_number: int, zoom: float,
+                      tiles: List[Tuple[int, int]], tile_size: int) -> int:
+        """
+        Solicita el render de mosaicos de una página, en el orden dado
+
+        Returns:
+            int: Identificador de la solicitud
+        """
+        self.cancel()
+        self._pending += [
+            self.executor.submit(
+                self._render_tile, self._request_id, pdf_path, page_number, zoom, tile, tile_size
+            )
+            for tile in tiles
+        ]
+        return self._request_id
+
+    def cancel(self) -> None:
+        """Cancela las solicitudes pendientes"""
+        self._request_id += 1
+        # Las tareas ya en ejecución no se pueden cancelar: se conservan para
+        # wait(); las terminadas se descartan para que la lista no crezca
+        self._pending = [
+            future for future in self._pending if not future.cancel() and not future.done()
+        ]
+
+    def shutdown(self) -> None:
+        """
+        Cancela las solicitudes pendientes y detiene el hilo de render
+
+        Espera a la tarea en curso (MuPDF no debe seguir leyendo un documento
+        que se va a cerrar). Después no se aceptan más solicitudes.
+        """
+        self.cancel()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self._pending = []
+
+    def _render(self, request_id: int, pdf_path: str, page_number: int, zoom: float) -> None:
+        """Tarea ejecutada en el hilo de render"""
+        # Solicitud cancelada mientras esperaba: no rasterizar
+        if self.is_stale(request_id):
+            return
+        try:
+            pix = PreviewGenerator.render_page(pdf_path, page_number, zoom)
+        except Exception as e:
+            self.signals.failed.emit(request_id, page_number, str(e))
+        else:
+            self.signals.finished.emit(request_id, page_number, zoom, pix)
+
+    def _render_tile(self, request_id: int, pdf_path: str, page_number: int, zoom: float,
+                     tile: Tuple[int, int], tile_size: int) -> None:
+        """Tarea de mosaico ejecutada en el hilo de render"""
+        if self.is_stale(request_id):
+            return
+        try:
+            pix = PreviewGenerator.render_tile(pdf_path, page_number, zoom, tile, tile_size)
+        except Exception as e:
+            self.signals.failed.emit(request_id, page_number, str(e))
+        else:
+            self.signals.tile_finished.emit(request_id, page_number, zoom, tile, pix)
+
+    def is_stale(self, request_id: int) -> bool:
+        return request_id != self._request_id
+
+    def wait(self) -> None:
+        """Espera a que terminen las tareas de render enviadas"""
+        wait(self._pending)
+        self._pending = [future for future in self._pending if not future.done()]
+
+    def _on_finished(self, request_id: int, page_number: int, zoom: float, pix) -> None:
+        if not self.is_stale(request_id):
+            self.page_rendered.emit(page_number, zoom, pix)
+
+    def _on_tile_finished(self, request_id: int, page_number: int, zoom: float, tile, pix) -> None:
+        if not self.is_stale(request_id):
+            self.tile_rendered.emit(page_number, zoom, tile, pix)
+
+    def _on_failed(self, request_id: int, page_number: int, message: str) -> None:
+        if not self.is_stale(request_id):
+            self.render_failed.emit(page_number, message)
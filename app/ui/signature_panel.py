@@ -3,18 +3,37 @@ from PySide6.QtWidgets import (
     QListWidget, QFileDialog, QMessageBox, QSlider,
     QHBoxLayout, QFrame
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from ..models.signature_model import SignatureModel, SignaturePosition, SignatureSize
 from ..models.document_model import DocumentModel
+from ..core.signature_assets import signature_assets
+import logging
 import os
-from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Espera tras el último movimiento del control de tamaño antes de aplicar
+# el cambio al modelo y redibujar la vista previa (ms)
+SIZE_COMMIT_DELAY_MS = 200
 
 class SignatureWidget(QFrame):
     """Widget que representa una firma individual con sus controles"""
-    def __init__(self, signature, index, parent=None):
+    def __init__(self, signature, index, parent=None, aspect_ratio=None):
         super().__init__(parent)
         self.signature = signature
         self.index = index
+        self._pending_size = None
+        # Relación alto/ancho de la imagen de firma, leída una sola vez: el
+        # slider la usa en cada movimiento
+        if aspect_ratio is None:
+            aspect_ratio = signature_assets.info(signature.image_path).aspect_ratio
+        self.aspect_ratio = aspect_ratio
+
+        # Los cambios de tamaño se aplican una sola vez al terminar el arrastre
+        self._commit_timer = QTimer(self)
+        self._commit_timer.setSingleShot(True)
+        self._commit_timer.setInterval(SIZE_COMMIT_DELAY_MS)
+        self._commit_timer.timeout.connect(self.commit_size)
         self.init_ui()
         
     def init_ui(self):
@@ -34,6 +53,7 @@ class SignatureWidget(QFrame):
         self.size_slider.setMaximum(50)
         self.size_slider.setValue(15)
         self.size_slider.valueChanged.connect(self.update_size)
+        self.size_slider.sliderReleased.connect(self.commit_size)
         size_layout.addWidget(self.size_slider)
         
         self.size_label = QLabel("15%")
@@ -45,32 +65,44 @@ class SignatureWidget(QFrame):
         self.setLineWidth(1)
         
     def update_size(self, value):
-        """Actualiza el tamaño de la firma cuando cambia el slider"""
-        print(f"\n=== Actualizando tamaño de firma ===")
-        print(f"Valor slider: {value}%")
-        
-        # Obtener dimensiones de la página actual
-        main_window = self.window()
-        canvas_view = main_window.canvas_view
+        """
+        Actualiza el tamaño de la firma cuando cambia el slider
+
+        Mientras el slider se mueve solo se escala el item de la vista previa;
+        el modelo se actualiza una vez, al soltarlo o tras SIZE_COMMIT_DELAY_MS
+        sin cambios.
+        """
+        self.size_label.setText(f"{value}%")
+
+        canvas_view = self.window().canvas_view
         page_dims = canvas_view.document.page_dimensions[self.signature.page_number]
         page_width = float(page_dims.width)
-        
-        # Calcular nuevo tamaño en puntos PDF
+
+        # Calcular nuevo tamaño en puntos PDF manteniendo la proporción
         new_width = page_width * (value / 100.0)
-        
-        # Mantener proporción
-        with Image.open(self.signature.image_path) as img:
-            aspect_ratio = img.height / img.width
-            new_height = new_width * aspect_ratio
-        
-        print(f"Nuevo tamaño en puntos PDF: {new_width:.2f}x{new_height:.2f}")
-        
+        new_height = new_width * self.aspect_ratio
+        self._pending_size = (new_width, new_height)
+
+        zoom = 2.0  # Escala de la vista previa
+        canvas_view.preview_signature_size(self.index, (new_width * zoom, new_height * zoom))
+        self._commit_timer.start()
+
+    def commit_size(self):
+        """Aplica al modelo el último tamaño elegido y actualiza la vista previa"""
+        self._commit_timer.stop()
+        if self._pending_size is None:
+            return
+        new_width, new_height = self._pending_size
+        self._pending_size = None
+
+        logger.debug("Nuevo tamaño en puntos PDF: %.2fx%.2f", new_width, new_height)
+
         # Actualizar modelo
         self.signature.size.width = new_width
         self.signature.size.height = new_height
-        
+
         # Actualizar UI
-        canvas_view.update_preview()
+        self.window().canvas_view.update_preview()
 
 class SignaturePanel(QWidget):
     def __init__(self, parent=None):
@@ -118,11 +150,10 @@ class SignaturePanel(QWidget):
         
         if file_path:
             try:
-                print(f"Añadiendo firma desde: {file_path}")
-                
                 # Verificar que la imagen existe y se puede abrir
-                with Image.open(file_path) as img:
-                    print(f"Imagen cargada: {img.size}, modo: {img.mode}")
+                info = signature_assets.info(file_path)
+                logger.debug("Imagen de firma %s: %dx%d, formato %s",
+                             file_path, info.width, info.height, info.format)
                 
                 # Obtener la ventana principal
                 main_window = self.window()
@@ -136,37 +167,35 @@ class SignaturePanel(QWidget):
                     image_path=file_path,
                     position=SignaturePosition(x=0, y=0),
                     size=SignatureSize(width=150, height=75),
-                    page_number=current_page
+                    page_number=current_page,
+                    aspect_ratio=info.aspect_ratio
                 )
                 
                 # Añadir al documento
                 self.document.add_signature(signature)
-                print(f"Firma añadida al documento. Total firmas: {len(self.document.signatures)}")
+                logger.info("Firma añadida desde %s (total: %d)", file_path, len(self.document.signatures))
                 
                 # Crear y añadir widget de firma
-                self.add_signature_widget(signature, len(self.document.signatures) - 1)
+                self.add_signature_widget(signature, len(self.document.signatures) - 1,
+                                          info.aspect_ratio)
                 
                 # Actualizar vista
                 if hasattr(main_window, 'canvas_view'):
                     canvas_view = main_window.canvas_view
-                    print("Actualizando vista previa desde add_signature")
-                    canvas_view.scene.clear()
                     canvas_view.update_preview()
                     canvas_view.fit_to_view()
                     
             except Exception as e:
-                print(f"Error al añadir firma: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error al añadir firma")
                 QMessageBox.critical(
                     self,
                     "Error",
                     f"Error al añadir firma: {str(e)}"
                 )
 
-    def add_signature_widget(self, signature, index):
+    def add_signature_widget(self, signature, index, aspect_ratio=None):
         """Añade un widget de control para una firma"""
-        widget = SignatureWidget(signature, index, self)
+        widget = SignatureWidget(signature, index, self, aspect_ratio)
         self.signature_widgets[index] = widget
         self.signatures_container.addWidget(widget)
 
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import sys
+import threading
+
+class LRUCache:
+    def __init__(
+        self,
+        max_bytes: int,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        """
+        Caché LRU acotada por tamaño en bytes
+
+        Args:
+            max_bytes (int): Tamaño máximo total de los valores almacenados
+            sizeof (Callable): Función que estima el tamaño en bytes de un valor
+            on_evict (Optional[Callable]): Llamada con (clave, valor) al desalojar
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Obtiene un valor y lo marca como usado recientemente"""
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None) -> bool:
+        """
+        Almacena un valor desalojando los menos usados si hace falta
+
+        Args:
+            key (Hashable): Clave del valor
+            value (Any): Valor a almacenar
+            nbytes (Optional[int]): Tamaño en bytes; si se omite se usa sizeof
+
+        Returns:
+            bool: False si el valor no cabe en la caché y no se almacenó
+        """
+        nbytes = self.sizeof(value) if nbytes is None else nbytes
+        with self._lock:
+            self.pop(key)
+            if nbytes > self.max_bytes:
+                return False
+            self._items[key] = value
+            self._sizes[key] = nbytes
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                old_key, old_value = self._items.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(old_key)
+                if self.on_evict:
+                    self.on_evict(old_key, old_value)
+            return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Elimina un valor de la caché y lo retorna"""
+        with self._lock:
+            if key not in self._items:
+                return default
+            self.total_bytes -= self._sizes.pop(key)
+            return self._items.pop(key)
+
+    def clear(self) -> None:
+        """Vacía la caché (los contadores se conservan)"""
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+
+    def keys(self) -> list:
+        """Claves almacenadas, de la menos a la más usada"""
+        with self._lock:
+            return list(self._items.keys())
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna estadísticas de uso de la caché"""
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
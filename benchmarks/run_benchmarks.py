@@ -0,0 +1,313 @@
+"""
+Benchmarks de firmado, sellado y vista previa sobre documentos sintéticos
+
+    python benchmarks/run_benchmarks.py                       # 1, 100, 1000 y 10000 páginas
+    python benchmarks/run_benchmarks.py --sizes 1,100 --repeat 5
+    python benchmarks/run_benchmarks.py --update-baselines    # guardar los tiempos como referencia
+
+Los PDFs sintéticos alternan páginas A4 vertical, A4 horizontal y planos
+(A1) y se generan una sola vez en la carpeta de trabajo. Cada caso se
+ejecuta --repeat veces y se toma el mejor tiempo. Si existe el archivo de
+referencias (benchmarks/baselines.json) los tiempos se comparan con él y
+el proceso termina con código 1 si algún caso es más lento que la
+referencia más la tolerancia. Las referencias dependen de la máquina: se
+generan con --update-baselines en el equipo donde se comparan.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from PIL import Image
+
+from app.core.document_loader import load_document_model
+from app.core.document_pool import document_pool
+from app.core.pdf_signer import PDFSigner
+from app.core.preview_generator import PreviewGenerator
+from app.models.signature_mode_config import SignatureMode, SignatureModeConfig
+from app.models.signature_model import SignatureModel, SignaturePosition, SignatureSize
+import sellador_carpetas_v3 as sellador
+
+DEFAULT_SIZES = (1, 100, 1000, 10000)
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Tamaños de página que se alternan en los documentos sintéticos (puntos PDF)
+PAGE_SIZES = ((595, 842), (842, 595), (1684, 2384))
+# Diferencias menores a esto (segundos) se consideran ruido
+MIN_REGRESSION_SECONDS = 0.005
+
+def make_synthetic_pdf(pdf_path: str, pages: int) -> str:
+    """
+    Crea un PDF de prueba alternando páginas A4, A4 horizontal y planos
+
+    Args:
+        pdf_path (str): Ruta del PDF a crear
+        pages (int): Número de páginas
+
+    Returns:
+        str: Ruta del PDF creado
+    """
+    doc = fitz.open()
+    for number in range(pages):
+        width, height = PAGE_SIZES[number % len(PAGE_SIZES)]
+        page = doc.new_page(width=width, height=height)
+        page.insert_text((72, 72), f"Documento sintético - página {number + 1}")
+        page.draw_rect(fitz.Rect(72, 100, width - 72, height - 72))
+    doc.save(pdf_path, garbage=1, deflate=True)
+    doc.close()
+    return pdf_path
+
+def make_signature(image_path: str) -> str:
+    """Crea una imagen de firma RGBA con transparencia"""
+    img = Image.new('RGBA', (400, 200), (0, 0, 0, 0))
+    for x in range(20, 380):
+        img.putpixel((x, 100 + (x % 40) - 20), (0, 0, 120, 255))
+    img.save(image_path)
+    return image_path
+
+class BenchmarkContext:
+    def __init__(self, workdir: str):
+        """
+        Archivos compartidos por los casos (PDFs sintéticos por tamaño y firma)
+
+        Args:
+            workdir (str): Carpeta donde se generan y reutilizan los archivos
+        """
+        self.workdir = workdir
+        os.makedirs(workdir, exist_ok=True)
+        self.signature = os.path.join(workdir, "firma.png")
+        if not os.path.exists(self.signature):
+            make_signature(self.signature)
+
+    def pdf(self, pages: int) -> str:
+        """Ruta del PDF sintético de un número de páginas (se crea la primera vez)"""
+        pdf_path = os.path.join(self.workdir, f"sintetico_{pages}.pdf")
+        if not os.path.exists(pdf_path):
+            make_synthetic_pdf(pdf_path, pages)
+        return pdf_path
+
+    def output(self, name: str) -> str:
+        return os.path.join(self.workdir, "salida", name)
+
+def _mode_config(mode: SignatureMode, total_pages: int) -> SignatureModeConfig:
+    config = SignatureModeConfig(mode)
+    if mode == SignatureMode.PLANTILLA:
+        config.pattern_interval = min(2, total_pages)
+    elif mode == SignatureMode.SELECTIVO:
+        config.affected_pages = list(range(0, total_pages, 3))
+    return config
+
+def _bench_load(context: BenchmarkContext, pages: int) -> Callable[[], None]:
+    pdf_path = context.pdf(pages)
+
+    def run():
+        document_pool.invalidate(pdf_path)
+        load_document_model(pdf_path)
+    return run
+
+def _bench_geometry(context: BenchmarkContext, pages: int) -> Callable[[], None]:
+    pdf_path = context.pdf(pages)
+
+    def run():
+        document_pool.invalidate(pdf_path)
+        geometry = load_document_model(pdf_path).page_dimensions
+        for page_number in range(pages):
+            geometry.size(page_number)
+    return run
+
+def _bench_sign(mode: SignatureMode) -> Callable[[BenchmarkContext, int], Optional[Callable[[], None]]]:
+    def setup(context: BenchmarkContext, pages: int) -> Optional[Callable[[], None]]:
+        config = _mode_config(mode, pages)
+        if not config.validate_for_document(pages):
+            return None  # P. ej. masivo necesita al menos 2 páginas
+        pdf_path = context.pdf(pages)
+        document = load_document_model(pdf_path)
+        document.set_signature_mode(config)
+        # Siempre dos firmas (primera y última página), en este orden; con una
+        # sola página ambas van en la página 0 para que el trabajo sea el mismo
+        for page_number in (0, pages - 1):
+            document.add_signature(SignatureModel(
+                image_path=context.signature,
+                position=SignaturePosition(x=100, y=100),
+                size=SignatureSize(width=120, height=60),
+                page_number=page_number
+            ))
+        placements = list(document.signature_placements())
+        output_path = context.output(f"firmado_{mode.value}_{pages}.pdf")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        signer = PDFSigner()
+
+        def run():
+            signer.insert_signature(pdf_path, output_path, placements)
+        return run
+    return setup
+
+def _bench_stamp(context: BenchmarkContext, pages: int) -> Callable[[], None]:
+    pdf_path = context.pdf(pages)
+    output_path = context.output(f"sellado_{pages}.pdf")
+    # Las variantes del sello se preparan una vez por proceso, fuera de la medición
+    sellador.obtener_variantes(context.signature)
+
+    def run():
+        random.seed(0)
+        sellador.sellar_pdf(pdf_path, context.signature, output_path, detalle=False)
+    return run
+
+def _bench_preview(context: BenchmarkContext, pages: int) -> Callable[[], None]:
+    pdf_path = context.pdf(pages)
+    # Una página de cada tamaño presente en el documento
+    page_numbers = range(min(pages, len(PAGE_SIZES)))
+
+    def run():
+        PreviewGenerator.cache.clear()
+        document_pool.invalidate(pdf_path)
+        for page_number in page_numbers:
+            PreviewGenerator.generate_page_preview(pdf_path, page_number)
+    return run
+
+# Cada caso prepara sus datos y retorna la función a medir (None si no aplica)
+CASES: Dict[str, Callable[[BenchmarkContext, int], Optional[Callable[[], None]]]] = {
+    "load": _bench_load,
+    "geometry": _bench_geometry,
+    **{f"sign_{mode.value}": _bench_sign(mode) for mode in SignatureMode},
+    "stamp": _bench_stamp,
+    "preview": _bench_preview,
+}
+
+def case_key(case: str, pages: int) -> str:
+    """Clave de un caso en el archivo de referencias"""
+    return f"{case}@{pages}"
+
+def run_benchmarks(context: BenchmarkContext, sizes: Sequence[int], cases: Sequence[str],
+                   repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """
+    Ejecuta los casos para cada tamaño de documento
+
+    Args:
+        context (BenchmarkContext): Archivos de trabajo
+        sizes (Sequence[int]): Números de páginas de los documentos sintéticos
+        cases (Sequence[str]): Nombres de los casos (ver CASES)
+        repeat (int): Repeticiones por caso; se guarda el mejor tiempo
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Por clave "caso@páginas", segundos y páginas por segundo
+    """
+    results = {}
+    for pages in sizes:
+        for case in cases:
+            run = CASES[case](context, pages)
+            if run is None:
+                continue
+            times = []
+            for _ in range(max(1, repeat)):
+                inicio = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - inicio)
+            best = min(times)
+            results[case_key(case, pages)] = {
+                "seconds": round(best, 6),
+                "pages_per_second": round(pages / best, 1) if best > 0 else None,
+            }
+            print(f"{case_key(case, pages):<24} {best:10.4f} s", file=sys.stderr)
+    return results
+
+def compare(results: Dict[str, Dict[str, Any]], baselines: Dict[str, float],
+            tolerance: float) -> List[Tuple[str, float, float]]:
+    """
+    Casos más lentos que su referencia más la tolerancia
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): Resultado de run_benchmarks
+        baselines (Dict[str, float]): Segundos de referencia por clave "caso@páginas"
+        tolerance (float): Margen relativo permitido (0.25 = 25 % más lento)
+
+    Returns:
+        List[Tuple[str, float, float]]: (clave, segundos actuales, segundos de referencia)
+    """
+    regressions = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        seconds = result["seconds"]
+        if seconds > baseline * (1 + tolerance) and seconds - baseline > MIN_REGRESSION_SECONDS:
+            regressions.append((key, seconds, baseline))
+    return regressions
+
+def load_baselines(path: str) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baselines(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """Guarda los tiempos como referencia, conservando los casos no ejecutados"""
+    baselines = load_baselines(path)
+    baselines.update({key: result["seconds"] for key, result in results.items()})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks del firmador de PDFs")
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+        help="Páginas de los documentos sintéticos, separadas por comas",
+    )
+    parser.add_argument(
+        "--cases", default=",".join(CASES),
+        help=f"Casos a ejecutar, separados por comas ({', '.join(CASES)})",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por caso (se toma la mejor)")
+    parser.add_argument("--workdir", help="Carpeta para los PDFs sintéticos (por defecto, una temporal)")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="Archivo JSON de referencias")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Margen relativo antes de considerar una regresión (por defecto 0.25)",
+    )
+    parser.add_argument("--update-baselines", action="store_true", help="Guardar los tiempos como referencia")
+    parser.add_argument("--output", help="Escribir los resultados JSON en este archivo (por defecto, stdout)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        print(f"Casos desconocidos: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        context = BenchmarkContext(args.workdir or tmp)
+        results = run_benchmarks(context, sizes, cases, args.repeat)
+        document_pool.close_all()
+
+    if args.update_baselines:
+        save_baselines(args.baselines, results)
+        regressions = []
+    else:
+        regressions = compare(results, load_baselines(args.baselines), args.tolerance)
+
+    text = json.dumps({"results": results, "regressions": [
+        {"case": key, "seconds": seconds, "baseline": baseline}
+        for key, seconds, baseline in regressions
+    ]}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for key, seconds, baseline in regressions:
+        print(f"REGRESIÓN {key}: {seconds:.4f} s (referencia {baseline:.4f} s)", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Perfil de memoria y presupuestos de RSS máximo sobre documentos sintéticos
+
+    python benchmarks/run_memory.py --sizes 100,1000 --cases sign_masivo,stamp,preview
+    python benchmarks/run_memory.py --top 10      # con tracemalloc por etapa y mayores asignadores
+
+Cada caso (los mismos de run_benchmarks.py) se ejecuta en un proceso nuevo,
+así lo medido corresponde solo a ese caso y no arrastra lo que dejaron los
+anteriores. Dentro del proceso primero se preparan los datos del caso
+(documento, firmas, variantes del sello) y recién entonces se toma la
+referencia: en Linux se reinicia el RSS máximo (/proc/self/clear_refs) y
+case_rss_mb es lo que el caso sube por encima del RSS tras la preparación.
+Donde no se puede reiniciar, el pico incluye la preparación y el resultado
+lo indica con peak_includes_setup.
+
+Con --top N el caso se repite con tracemalloc: se reporta el pico de memoria
+de Python de cada etapa del firmador (las de StageReport: plan, open,
+load_page, insert_image, save...) y las líneas que más memoria retienen al
+terminar. La memoria de MuPDF no pasa por tracemalloc; para esa el dato es
+el RSS.
+
+Los presupuestos (benchmarks/memory_budgets.json) dan en MB el case_rss_mb
+permitido por caso y tamaño, p. ej. {"stamp@1000": 40}; si algún caso lo
+supera el proceso termina con código 1.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import gc
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import CASES, DEFAULT_SIZES, BenchmarkContext, case_key
+from app.core.instrumentation import StageReport
+
+try:
+    import resource
+except ImportError:  # Windows: solo se reporta tracemalloc
+    resource = None
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_budgets.json")
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    """Campo de /proc/self/status en MB (None fuera de Linux)"""
+    try:
+        with open("/proc/self/status", 'r', encoding='ascii') as f:
+            match = re.search(rf"^{field}:\s+(\d+) kB", f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return int(match.group(1)) / 1024 if match else None
+
+def _peak_rss_mb() -> Optional[float]:
+    """RSS máximo del proceso actual en MB (None si la plataforma no lo ofrece)"""
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB y macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _current_rss_mb() -> Optional[float]:
+    """RSS actual en MB (en otras plataformas, el máximo hasta ahora)"""
+    current = _proc_status_mb("VmRSS")
+    return current if current is not None else _peak_rss_mb()
+
+def _reset_peak_rss() -> bool:
+    """Reinicia el RSS máximo del proceso (solo Linux); False si no se pudo"""
+    try:
+        with open("/proc/self/clear_refs", 'w', encoding='ascii') as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+class _StageMemory:
+    def __init__(self):
+        """
+        Pico y memoria retenida de Python por etapa de StageReport
+
+        tracemalloc tiene un solo pico global: al entrar a una etapa se
+        reinicia, y el pico visto hasta ese momento se traslada a las etapas
+        que la contienen (p. ej. decode dentro de insert_image).
+        """
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.peak = 0  # Pico global en bytes (reset_peak lo reinicia en cada etapa)
+        self._stack: List[list] = []  # [inicio, pico] de las etapas abiertas
+
+    def _propagate_peak(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        for frame in self._stack:
+            frame[1] = max(frame[1], peak)
+        return current
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        current = self._propagate_peak()
+        tracemalloc.reset_peak()
+        self._stack.append([current, current])
+        try:
+            yield
+        finally:
+            current = self._propagate_peak()
+            start, peak = self._stack.pop()
+            tracemalloc.reset_peak()
+            entry = self.stages.setdefault(name, {"calls": 0, "peak_mb": 0.0, "retained_mb": 0.0})
+            entry["calls"] += 1
+            entry["peak_mb"] = max(entry["peak_mb"], (peak - start) / (1024 * 1024))
+            entry["retained_mb"] += (current - start) / (1024 * 1024)
+
+    @contextmanager
+    def installed(self) -> Iterator[None]:
+        """Mide todas las etapas de los StageReport usados dentro del bloque"""
+        original = StageReport.stage
+        tracker = self
+
+        @contextmanager
+        def stage(report: StageReport, name: str) -> Iterator[None]:
+            with tracker.track(name), original(report, name):
+                yield
+
+        StageReport.stage = stage
+        try:
+            yield
+        finally:
+            StageReport.stage = original
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"calls": int(entry["calls"]), "peak_mb": round(entry["peak_mb"], 3),
+                   "retained_mb": round(entry["retained_mb"], 3) + 0.0}
+            for name, entry in self.stages.items()
+        }
+
+def measure_case(context: BenchmarkContext, case: str, pages: int, top: int = 0) -> Optional[Dict[str, Any]]:
+    """
+    Mide la memoria de un caso en el proceso actual
+
+    Debe llamarse en un proceso dedicado: el RSS máximo es el de todo el proceso.
+    La preparación del caso queda fuera de la medición.
+
+    Args:
+        context (BenchmarkContext): Archivos de trabajo
+        case (str): Nombre del caso (ver run_benchmarks.CASES)
+        pages (int): Páginas del documento sintético
+        top (int): Asignadores de tracemalloc a reportar (0 = no usar tracemalloc)
+
+    Returns:
+        Optional[Dict[str, Any]]: RSS tras la preparación, pico durante el caso
+            y su diferencia (case_rss_mb); con top, el pico de Python por etapa
+            y los mayores asignadores. None si el caso no aplica al documento
+    """
+    run = CASES[case](context, pages)
+    if run is None:
+        return None
+
+    gc.collect()
+    reset = _reset_peak_rss()
+    rss_before = _current_rss_mb()
+    run()
+    peak = _peak_rss_mb()
+    result: Dict[str, Any] = {
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": peak,
+        "case_rss_mb": round(max(peak - rss_before, 0.0), 3) if peak and rss_before else None,
+        "peak_includes_setup": not reset,
+    }
+
+    if top > 0:
+        # Segunda pasada con tracemalloc (no altera el RSS ya medido); se
+        # inicia después de la preparación, así solo ve lo que asigna el caso
+        stages = _StageMemory()
+        tracemalloc.start(25)
+        try:
+            with stages.installed():
+                run()
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, stages.peak)
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        result["tracemalloc_peak_mb"] = round(peak / (1024 * 1024), 3)
+        result["stages"] = stages.as_dict()
+        result["top"] = [
+            {
+                "where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_mb": round(stat.size / (1024 * 1024), 3),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:top]
+        ]
+    return result
+
+def _run_child(case: str, pages: int, workdir: str, top: int) -> Optional[Dict[str, Any]]:
+    """Ejecuta un caso en un proceso nuevo y retorna su medición"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", case, str(pages),
+         "--workdir", workdir, "--top", str(top)],
+        capture_output=True, text=True, check=False
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{case_key(case, pages)} falló:\n{completed.stderr}")
+    # La medición es la última línea (las bibliotecas pueden escribir avisos antes)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_memory(workdir: str, sizes: Sequence[int], cases: Sequence[str],
+               top: int = 0) -> Dict[str, Dict[str, Any]]:
+    """
+    Mide cada caso y tamaño en su propio proceso
+
+    Args:
+        workdir (str): Carpeta de los PDFs sintéticos (se generan aquí antes de medir)
+        sizes (Sequence[int]): Números de páginas de los documentos
+        cases (Sequence[str]): Nombres de los casos
+        top (int): Asignadores de tracemalloc a reportar por caso
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Medición por clave "caso@páginas"
+    """
+    context = BenchmarkContext(workdir)
+    results = {}
+    for pages in sizes:
+        context.pdf(pages)  # Generar el documento fuera de los procesos medidos
+        for case in cases:
+            result = _run_child(case, pages, workdir, top)
+            if result is None:
+                continue
+            results[case_key(case, pages)] = result
+            print(f"{case_key(case, pages):<24} {result['case_rss_mb'] or 0:10.1f} MB "
+                  f"(pico {result['peak_rss_mb'] or 0:.1f} MB)", file=sys.stderr)
+    return results
+
+def check_budgets(results: Dict[str, Dict[str, Any]],
+                  budgets: Dict[str, float]) -> List[Tuple[str, float, float]]:
+    """
+    Casos cuya memoria (case_rss_mb, sin la preparación) supera su presupuesto
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): Resultado de run_memory
+        budgets (Dict[str, float]): MB permitidos por clave "caso@páginas"
+
+    Returns:
+        List[Tuple[str, float, float]]: (clave, MB medidos, MB permitidos)
+    """
+    exceeded = []
+    for key, result in results.items():
+        budget = budgets.get(key)
+        used = result.get("case_rss_mb")
+        if budget is not None and used is not None and used > budget:
+            exceeded.append((key, used, budget))
+    return exceeded
+
+def load_budgets(path: str) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Perfil de memoria del firmador de PDFs")
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+        help="Páginas de los documentos sintéticos, separadas por comas",
+    )
+    parser.add_argument(
+        "--cases", default=",".join(CASES),
+        help=f"Casos a medir, separados por comas ({', '.join(CASES)})",
+    )
+    parser.add_argument("--top", type=int, default=0, help="Mayores asignadores de tracemalloc por caso")
+    parser.add_argument("--workdir", help="Carpeta para los PDFs sintéticos (por defecto, una temporal)")
+    parser.add_argument("--budgets", default=BUDGETS_PATH, help="Archivo JSON de presupuestos (MB)")
+    parser.add_argument("--output", help="Escribir los resultados JSON en este archivo (por defecto, stdout)")
+    parser.add_argument("--child", nargs=2, metavar=("CASO", "PAGINAS"), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+
+    if args.child:
+        case, pages = args.child
+        print(json.dumps(measure_case(BenchmarkContext(args.workdir), case, int(pages), args.top)))
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        print(f"Casos desconocidos: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_memory(args.workdir or tmp, sizes, cases, args.top)
+
+    exceeded = check_budgets(results, load_budgets(args.budgets))
+    text = json.dumps({"results": results, "exceeded": [
+        {"case": key, "case_rss_mb": used, "budget_mb": budget} for key, used, budget in exceeded
+    ]}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for key, used, budget in exceeded:
+        print(f"PRESUPUESTO EXCEDIDO {key}: {used:.1f} MB (máximo {budget:.1f} MB)", file=sys.stderr)
+    return 1 if exceeded else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
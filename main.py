@@ -1,18 +1,20 @@
 import sys
 from PySide6.QtWidgets import QApplication
 from app.ui.main_window import MainWindow
+from app.core.logging_config import configure_logging
 import logging
 
 def setup_logging():
-    """Configura el sistema de logging"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('firmador.log'),
-            logging.StreamHandler()
-        ]
-    )
+    """
+    Configura el sistema de logging
+
+    Nivel global con PDF_SIGNER_LOG_LEVEL (INFO por defecto) y niveles por
+    módulo con PDF_SIGNER_LOG, p. ej. "app.core.pdf_signer=DEBUG".
+    """
+    configure_logging([
+        logging.FileHandler('firmador.log'),
+        logging.StreamHandler()
+    ])
 
 def main():
     """Punto de entrada principal de la aplicación"""
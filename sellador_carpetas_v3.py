@@ -3,243 +3,340 @@ import fitz  # PyMuPDF
 import random
 from PIL import Image
 import io
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from app.core.scenarios import ESCENARIOS, detect_scenario, placement_rect
 
 # ==========================================================
 #            CONFIGURACIÓN DE ESCENARIOS
 # ==========================================================
-# Escenario 1: A4 Vertical (aprox. 595×842 pt)
-escenario_1 = {
-    "nombre": "A4 Vertical",
-    "orientacion": "vertical",  # Se usa la fórmula clásica
-    "ancho_deseado": 120,
-    "separacion_derecha": 100,
-    "separacion_inferior": 50,
-    "variabilidad_horizontal_pct": 80,
-    "variabilidad_vertical_pct": 20,
-    "variabilidad_giro": 5,
-    "rotacion_base": 0,
-}
-
-# Escenario 2: A4 Horizontal (aprox. 842×595 pt)
-escenario_2 = {
-    "nombre": "A4 Horizontal",
-    "orientacion": "horizontal",  # Usaremos fórmula con separaciones intercambiadas
-    "ancho_deseado": 70,
-    "separacion_derecha": 100,  # En este caso, actuará en el eje vertical
-    "separacion_inferior": 250,  # Actúa en el eje horizontal
-    "variabilidad_horizontal_pct": 80,
-    "variabilidad_vertical_pct": 20,
-    "variabilidad_giro": 5,
-    "rotacion_base": 90,  # Para orientar el sello en la página horizontal
-}
-
-# Escenario 3: Hojas grandes (ej. planos o tamaños mayores a A4)
-# Se ajustará la orientación según las dimensiones reales de la página.
-escenario_3 = {
-    "nombre": "Planos / Hojas Grandes",
-    "orientacion": "vertical",  # Valor por defecto, se modificará según corresponda.
-    "ancho_deseado": 180,
-    "separacion_derecha": 90,
-    "separacion_inferior": 100,
-    "variabilidad_horizontal_pct": 50,
-    "variabilidad_vertical_pct": 20,
-    "variabilidad_giro": 5,
-    "rotacion_base": 0,
-}
-
-# Umbrales para detección de cada escenario (en puntos, aproximación de A4)
-UMBRAL_A4_ANCHO = 595
-UMBRAL_A4_ALTO = 842
-MARGEN_ERROR = 50  # Tolerancia para considerar la página como A4
-
-
-def detectar_escenario(page_width, page_height):
-    """
-    Devuelve el escenario (diccionario) que corresponde
-    según las dimensiones de la página.
-    """
-    # A4 Vertical: ancho aproximado 595, alto 842 y orientación vertical.
-    if (
-        abs(page_width - UMBRAL_A4_ANCHO) <= MARGEN_ERROR
-        and abs(page_height - UMBRAL_A4_ALTO) <= MARGEN_ERROR
-        and page_width < page_height
-    ):
-        return escenario_1
+# Las tablas de escenarios, la detección y la colocación se comparten con el
+# firmador (app.core.scenarios); aquí solo se añade la variabilidad aleatoria.
+escenario_1 = ESCENARIOS["A4_VERTICAL"]  # A4 Vertical (aprox. 595×842 pt)
+escenario_2 = ESCENARIOS["A4_HORIZONTAL"]  # A4 Horizontal (aprox. 842×595 pt)
+escenario_3 = ESCENARIOS["PLANOS"]  # Planos u hojas mayores a A4
 
-    # A4 Horizontal: ancho aproximado 842, alto 595 y orientación horizontal.
-    if (
-        abs(page_width - UMBRAL_A4_ALTO) <= MARGEN_ERROR
-        and abs(page_height - UMBRAL_A4_ANCHO) <= MARGEN_ERROR
-        and page_width > page_height
-    ):
-        return escenario_2
-
-    # Caso de hojas grandes: usamos escenario_3 y ajustamos la orientación según dimensiones.
-    escenario = escenario_3.copy()  # Hacemos una copia para no modificar el original.
-    if page_width > page_height:
-        escenario["orientacion"] = "horizontal"
-    else:
-        escenario["orientacion"] = "vertical"
-    return escenario
+detectar_escenario = detect_scenario
 
 
 # ==========================================================
-#   FUNCIONES PARA CALCULAR LA POSICIÓN DEL SELLO
+#       VARIANTES PRE-RENDERIZADAS DEL SELLO
 # ==========================================================
-def colocar_sello_vertical(
-    rect_pagina,
-    nuevo_w,
-    nuevo_h,
-    separacion_derecha,
-    separacion_inferior,
-    offset_x,
-    offset_y,
-):
+# Paso de cuantización del giro aleatorio (en grados)
+PASO_GIRO = 0.5
+
+
+def renderizar_sello(img, angulo_total, ancho_deseado):
     """
-    Posicionamiento clásico para páginas verticales:
-    Se ubica el sello en la esquina inferior derecha (cerca de (rect.x1, rect.y1)).
+    Rota y escala el sello para un ángulo dado.
+    Devuelve (bytes PNG, nuevo_w, nuevo_h).
     """
-    x0 = rect_pagina.x1 - nuevo_w - separacion_derecha + offset_x
-    y0 = rect_pagina.y1 - nuevo_h - separacion_inferior + offset_y
-    x1 = rect_pagina.x1 - separacion_derecha + offset_x
-    y1 = rect_pagina.y1 - separacion_inferior + offset_y
-    return fitz.Rect(x0, y0, x1, y1)
+    # Rotar la imagen
+    sello_rotado = img.rotate(angulo_total, resample=Image.BICUBIC, expand=True)
+    w_img, h_img = sello_rotado.size
 
+    # Escalar la imagen para ajustar el ancho deseado
+    factor = ancho_deseado / w_img
+    nuevo_w = int(w_img * factor)
+    nuevo_h = int(h_img * factor)
+    sello_redimensionado = sello_rotado.resize(
+        (nuevo_w, nuevo_h), resample=Image.LANCZOS
+    )
 
-def colocar_sello_horizontal(
-    rect_pagina,
-    nuevo_w,
-    nuevo_h,
-    separacion_derecha,
-    separacion_inferior,
-    offset_x,
-    offset_y,
-):
+    # Convertir la imagen a bytes en PNG sin compresión adicional
+    buffer = io.BytesIO()
+    sello_redimensionado.save(buffer, format="PNG", compress_level=0, optimize=False)
+    return buffer.getvalue(), nuevo_w, nuevo_h
+
+
+class VariantesSello:
     """
-    Para páginas horizontales se considera que la orientación de lectura
-    tiene el 'abajo' en el borde inferior (y=rect.y0) y la 'derecha' en x=rect.x1.
-    Se intercambian los valores:
-      - Para desplazar horizontalmente se usa separacion_inferior.
-      - Para desplazar verticalmente se usa separacion_derecha.
+    Conjunto de variantes del sello pre-renderizadas una sola vez por ejecución.
+    Para cada escenario se generan los giros de -variabilidad_giro a
+    +variabilidad_giro en pasos de PASO_GIRO; en cada página solo se elige una.
     """
-    x0 = rect_pagina.x1 - nuevo_w - separacion_inferior + offset_x
-    y0 = rect_pagina.y0 + separacion_derecha + offset_y
-    x1 = x0 + nuevo_w
-    y1 = y0 + nuevo_h
-    return fitz.Rect(x0, y0, x1, y1)
 
+    def __init__(self, sello_path, escenarios, paso_giro=PASO_GIRO):
+        self.paso_giro = paso_giro
+        self.variantes = {}  # (nombre escenario, giro aleatorio) -> (png, w, h)
+        self._angulos = {}  # nombre escenario -> giros cuantizados
+
+        img = Image.open(sello_path).convert("RGBA")
+        for escenario in escenarios:
+            self._angulos[escenario["nombre"]] = self.angulos(escenario)
+            for angulo in self._angulos[escenario["nombre"]]:
+                clave = (escenario["nombre"], angulo)
+                self.variantes[clave] = renderizar_sello(
+                    img, escenario["rotacion_base"] + angulo, escenario["ancho_deseado"]
+                )
 
-# ==========================================================
-#            CÓDIGO PRINCIPAL
-# ==========================================================
-def sellar_pdfs():
-    # Parámetros de entrada
-    carpeta_pdfs = "docs/"  # Carpeta que contiene los PDFs a procesar
-    sello_path = "sello.png"  # Ruta de la imagen del sello
+    def angulos(self, escenario):
+        """Giros aleatorios cuantizados posibles para un escenario"""
+        pasos = int(escenario["variabilidad_giro"] / self.paso_giro)
+        return [round(k * self.paso_giro, 6) for k in range(-pasos, pasos + 1)]
+
+    def elegir(self, escenario):
+        """
+        Elige un giro aleatorio cuantizado para el escenario.
+        Devuelve (giro aleatorio, (bytes PNG, nuevo_w, nuevo_h)).
+        """
+        angulo = random.choice(self._angulos[escenario["nombre"]])
+        return angulo, self.variantes[(escenario["nombre"], angulo)]
 
-    # Parámetros de salida
-    carpeta_salida = "sellados/"  # Carpeta donde se guardarán los PDFs sellados
-    os.makedirs(carpeta_salida, exist_ok=True)
 
-    # Obtener la lista de archivos PDF en la carpeta
-    pdf_files = [f for f in os.listdir(carpeta_pdfs) if f.lower().endswith(".pdf")]
+# Variantes ya construidas en este proceso, por ruta de sello
+_variantes_por_sello = {}
 
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(carpeta_pdfs, pdf_file)
-        print(f"\nProcesando {pdf_path}...")
 
-        # Abrir el documento PDF
-        doc = fitz.open(pdf_path)
+def obtener_variantes(sello_path):
+    """Devuelve (construyendo si hace falta) las variantes del sello de este proceso"""
+    if sello_path not in _variantes_por_sello:
+        _variantes_por_sello[sello_path] = VariantesSello(
+            sello_path, [escenario_1, escenario_2, escenario_3]
+        )
+    return _variantes_por_sello[sello_path]
+
 
+# ==========================================================
+#            CÓDIGO PRINCIPAL
+# ==========================================================
+def sellar_pdf(pdf_path, sello_path, salida_pdf, detalle=True):
+    """
+    Sella todas las páginas de un PDF y guarda el resultado.
+    Devuelve un diccionario con el resumen del archivo procesado.
+    """
+    variantes = obtener_variantes(sello_path)
+    xrefs = {}  # (nombre escenario, giro) -> xref de la imagen ya incrustada
+
+    # Abrir el documento PDF
+    doc = fitz.open(pdf_path)
+
+    try:
         for num_pagina, pagina in enumerate(doc, start=1):
             rect_pagina = pagina.rect
             page_width, page_height = rect_pagina.width, rect_pagina.height
 
             # Detectar el escenario según dimensiones/orientación
             escenario = detectar_escenario(page_width, page_height)
-            print(
-                f"  Página {num_pagina}: {escenario['nombre']} "
-                f"(w={page_width:.0f}, h={page_height:.0f}, orientacion={escenario['orientacion']})"
-            )
-
-            # Extraer parámetros del escenario
-            orientacion = escenario["orientacion"]
-            ancho_deseado = escenario["ancho_deseado"]
-            separacion_derecha = escenario["separacion_derecha"]
-            separacion_inferior = escenario["separacion_inferior"]
-            variabilidad_horizontal_pct = escenario["variabilidad_horizontal_pct"]
-            variabilidad_vertical_pct = escenario["variabilidad_vertical_pct"]
-            variabilidad_giro = escenario["variabilidad_giro"]
-            rotacion_base = escenario["rotacion_base"]
-
-            # Abrir la imagen del sello
-            img = Image.open(sello_path).convert("RGBA")
-
-            # Calcular la rotación total: rotación_base + rotación aleatoria
-            angulo_aleatorio = random.uniform(-variabilidad_giro, variabilidad_giro)
-            angulo_total = rotacion_base + angulo_aleatorio
-            print(
-                f"    Rotación base: {rotacion_base}°, aleatoria: {angulo_aleatorio:.2f}°, total: {angulo_total:.2f}°"
-            )
-
-            # Rotar la imagen
-            sello_rotado = img.rotate(angulo_total, resample=Image.BICUBIC, expand=True)
-            w_img, h_img = sello_rotado.size
+            if detalle:
+                print(
+                    f"  Página {num_pagina}: {escenario['nombre']} "
+                    f"(w={page_width:.0f}, h={page_height:.0f}, orientacion={escenario['orientacion']})"
+                )
 
-            # Escalar la imagen para ajustar el ancho deseado
-            factor = ancho_deseado / w_img
-            nuevo_w = int(w_img * factor)
-            nuevo_h = int(h_img * factor)
-            sello_redimensionado = sello_rotado.resize(
-                (nuevo_w, nuevo_h), resample=Image.LANCZOS
-            )
+            # Elegir una variante pre-renderizada (rotación base + giro cuantizado)
+            angulo_aleatorio, (img_bytes, nuevo_w, nuevo_h) = variantes.elegir(escenario)
+            if detalle:
+                print(
+                    f"    Rotación base: {escenario['rotacion_base']}°, aleatoria: {angulo_aleatorio:.2f}°, "
+                    f"total: {escenario['rotacion_base'] + angulo_aleatorio:.2f}°"
+                )
 
             # Calcular offsets aleatorios
-            offset_x = random.uniform(-variabilidad_horizontal_pct / 100 * nuevo_w, 0)
-            offset_y = random.uniform(-variabilidad_vertical_pct / 100 * nuevo_h, 0)
-
-            # Seleccionar la fórmula de colocación según la orientación
-            if orientacion == "horizontal":
-                sello_rect = colocar_sello_horizontal(
-                    rect_pagina,
-                    nuevo_w,
-                    nuevo_h,
-                    separacion_derecha,
-                    separacion_inferior,
-                    offset_x,
-                    offset_y,
-                )
-            else:
-                sello_rect = colocar_sello_vertical(
-                    rect_pagina,
-                    nuevo_w,
-                    nuevo_h,
-                    separacion_derecha,
-                    separacion_inferior,
-                    offset_x,
-                    offset_y,
-                )
+            offset_x = random.uniform(-escenario["variabilidad_horizontal_pct"] / 100 * nuevo_w, 0)
+            offset_y = random.uniform(-escenario["variabilidad_vertical_pct"] / 100 * nuevo_h, 0)
 
-            # Convertir la imagen a bytes en PNG sin compresión adicional
-            buffer = io.BytesIO()
-            sello_redimensionado.save(
-                buffer, format="PNG", compress_level=0, optimize=False
-            )
-            buffer.seek(0)
-            img_bytes = buffer.getvalue()
+            # Colocación según el escenario (vertical u horizontal)
+            sello_rect = placement_rect(rect_pagina, escenario, nuevo_w, nuevo_h, offset_x, offset_y)
 
-            # Crear el objeto Pixmap e insertarlo en la página
-            pix = fitz.Pixmap(img_bytes)
-            pagina.insert_image(sello_rect, pixmap=pix)
+            # Insertar el sello; cada variante se incrusta una sola vez por documento
+            clave = (escenario["nombre"], angulo_aleatorio)
+            if clave in xrefs:
+                pagina.insert_image(sello_rect, xref=xrefs[clave])
+            else:
+                xrefs[clave] = pagina.insert_image(sello_rect, stream=img_bytes)
 
         # Guardar el PDF sellado
-        salida_pdf = os.path.join(
-            carpeta_salida, f"{os.path.splitext(pdf_file)[0]}.pdf"
-        )
+        total_paginas = len(doc)
+        os.makedirs(os.path.dirname(salida_pdf) or ".", exist_ok=True)
         doc.save(salida_pdf)
+    finally:
         doc.close()
-        print(f"Guardado: {salida_pdf}")
+        # Liberar la caché interna de MuPDF (fuentes, imágenes decodificadas)
+        # para que la memoria no crezca con cada documento del lote
+        fitz.TOOLS.store_shrink(100)
+
+    return {"archivo": pdf_path, "salida": salida_pdf, "paginas": total_paginas}
+
+
+def _inicializar_proceso(sello_path):
+    """
+    Inicializador de cada proceso del pool.
+    Se vuelve a sembrar el generador aleatorio para que los procesos
+    creados por fork no repitan la misma secuencia de giros y offsets,
+    y se pre-renderizan las variantes del sello una sola vez por proceso.
+    """
+    random.seed()
+    obtener_variantes(sello_path)
+
+
+def _procesar_archivo(pdf_path, sello_path, salida_pdf, detalle=False):
+    """
+    Envoltura de sellar_pdf que nunca lanza excepciones:
+    el error se reporta en el resultado para no detener el lote.
+    """
+    inicio = time.perf_counter()
+    try:
+        resultado = sellar_pdf(pdf_path, sello_path, salida_pdf, detalle=detalle)
+        resultado["ok"] = True
+    except Exception as e:
+        resultado = {"archivo": pdf_path, "salida": salida_pdf, "ok": False, "error": str(e)}
+    resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+    return resultado
+
+
+def _reportar(resultado):
+    """Imprime una línea de resumen por archivo procesado"""
+    if resultado["ok"]:
+        print(
+            f"Guardado: {resultado['salida']} "
+            f"({resultado['paginas']} págs., {resultado['segundos']:.2f} s)"
+        )
+    else:
+        print(f"ERROR en {resultado['archivo']}: {resultado['error']}")
+
+
+def iterar_pdfs(carpeta, excluir=None):
+    """
+    Genera las rutas de los PDFs de una carpeta y sus subcarpetas.
+
+    Usa os.scandir de forma perezosa: los archivos se descubren a medida
+    que se consumen, sin construir la lista completa en memoria.
+
+    - excluir: carpeta que no se recorre (p. ej. la de salida cuando está
+      dentro de la carpeta de entrada, para no volver a sellar lo sellado).
+    """
+    excluida = os.path.realpath(excluir) if excluir else None
+    pendientes = [carpeta]
+    while pendientes:
+        with os.scandir(pendientes.pop()) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    if excluida is None or os.path.realpath(entrada.path) != excluida:
+                        pendientes.append(entrada.path)
+                elif entrada.is_file() and entrada.name.lower().endswith(".pdf"):
+                    yield entrada.path
+
+
+def _tareas(carpeta_pdfs, carpeta_salida):
+    """Genera (pdf, salida) conservando las subcarpetas bajo la carpeta de salida"""
+    for pdf_path in iterar_pdfs(carpeta_pdfs, excluir=carpeta_salida):
+        relativa = os.path.relpath(pdf_path, carpeta_pdfs)
+        yield pdf_path, os.path.join(carpeta_salida, relativa)
+
+
+def sellar_pdfs_iter(
+    carpeta_pdfs="docs/",
+    sello_path="sello.png",
+    carpeta_salida="sellados/",
+    procesos=None,
+    max_pendientes=None,
+):
+    """
+    Sella los PDFs de una carpeta (recursivamente) y genera un resultado por archivo.
+
+    Es un pipeline en flujo: los archivos se descubren con os.scandir a medida
+    que hay hueco en el pool, como mucho max_pendientes archivos están en
+    vuelo y cada resultado se entrega en cuanto termina. Mientras el pool
+    está lleno no se lee ni se envía nada más (contrapresión), así la memoria
+    no depende del número de archivos de la carpeta.
+
+    - procesos: número de procesos del pool (None = núcleos disponibles,
+      1 = modo secuencial en el proceso actual).
+    - max_pendientes: máximo de archivos enviados al pool sin terminar
+      (por defecto, 2 por proceso).
+    """
+    os.makedirs(carpeta_salida, exist_ok=True)
+    tareas = _tareas(carpeta_pdfs, carpeta_salida)
+    procesos = procesos or os.cpu_count() or 1
+
+    if procesos == 1:
+        for pdf_path, salida_pdf in tareas:
+            print(f"\nProcesando {pdf_path}...")
+            yield _procesar_archivo(pdf_path, sello_path, salida_pdf, detalle=True)
+        return
+
+    max_pendientes = max_pendientes or procesos * 2
+    print(f"Procesando PDFs de {carpeta_pdfs} con {procesos} procesos...")
+
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        initializer=_inicializar_proceso,
+        initargs=(sello_path,),
+    ) as pool:
+        pendientes = set()
+        for pdf_path, salida_pdf in tareas:
+            # Limitar los archivos en vuelo antes de enviar uno nuevo
+            if len(pendientes) >= max_pendientes:
+                terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    yield futuro.result()
+            pendientes.add(
+                pool.submit(_procesar_archivo, pdf_path, sello_path, salida_pdf)
+            )
+
+        for futuro in as_completed(pendientes):
+            yield futuro.result()
+
+
+def sellar_pdfs(
+    carpeta_pdfs="docs/",
+    sello_path="sello.png",
+    carpeta_salida="sellados/",
+    procesos=None,
+    max_pendientes=None,
+    conservar_resultados=True,
+):
+    """
+    Sella todos los PDFs de una carpeta (y sus subcarpetas).
+
+    Ver sellar_pdfs_iter para procesos y max_pendientes.
+    - conservar_resultados: si es False no se acumulan los resultados
+      (para carpetas muy grandes) y se devuelve una lista vacía.
+
+    Devuelve la lista de resultados por archivo.
+    """
+    resultados = []
+    correctos = errores = 0
+    for resultado in sellar_pdfs_iter(
+        carpeta_pdfs, sello_path, carpeta_salida, procesos, max_pendientes
+    ):
+        _reportar(resultado)
+        if resultado["ok"]:
+            correctos += 1
+        else:
+            errores += 1
+        if conservar_resultados:
+            resultados.append(resultado)
+
+    print(f"\nResumen: {correctos} sellados, {errores} con errores")
+    return resultados
+
+
+def _parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Sella todos los PDFs de una carpeta")
+    parser.add_argument("--docs", default="docs/", help="Carpeta con los PDFs a procesar (incluye subcarpetas)")
+    parser.add_argument("--sello", default="sello.png", help="Imagen del sello")
+    parser.add_argument("--salida", default="sellados/", help="Carpeta de salida")
+    parser.add_argument(
+        "--procesos", type=int, default=None,
+        help="Número de procesos (por defecto, todos los núcleos; 1 = secuencial)",
+    )
+    parser.add_argument(
+        "--max-pendientes", type=int, default=None,
+        help="Máximo de archivos en vuelo (por defecto, 2 por proceso)",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    sellar_pdfs()
+    args = _parsear_argumentos()
+    sellar_pdfs(
+        carpeta_pdfs=args.docs,
+        sello_path=args.sello,
+        carpeta_salida=args.salida,
+        procesos=args.procesos,
+        max_pendientes=args.max_pendientes,
+        conservar_resultados=False,
+    )
@@ -0,0 +1,44 @@
+import fitz
+from benchmarks.run_benchmarks import (
+    BenchmarkContext, CASES, compare, main, make_synthetic_pdf, run_benchmarks
+)
+
+def test_synthetic_pdf_mixes_page_sizes(tmp_path):
+    pdf_path = make_synthetic_pdf(str(tmp_path / "sintetico.pdf"), 4)
+
+    with fitz.open(pdf_path) as doc:
+        sizes = [(page.rect.width, page.rect.height) for page in doc]
+    assert sizes == [(595, 842), (842, 595), (1684, 2384), (595, 842)]
+
+def test_run_benchmarks_all_cases(tmp_path):
+    results = run_benchmarks(BenchmarkContext(str(tmp_path)), [1, 4], list(CASES), repeat=1)
+
+    # Masivo no aplica a un documento de una página
+    assert "sign_masivo@1" not in results
+    assert {"load@4", "sign_masivo@4", "stamp@4", "preview@4"} <= set(results)
+    assert all(result["seconds"] > 0 for result in results.values())
+
+def test_sign_case_always_adds_two_signatures(tmp_path):
+    context = BenchmarkContext(str(tmp_path))
+    for pages in (1, 4):
+        CASES["sign_libre"](context, pages)()
+        with fitz.open(context.output(f"firmado_libre_{pages}.pdf")) as doc:
+            assert sum(len(page.get_image_info()) for page in doc) == 2
+
+def test_compare_flags_regressions():
+    results = {"stamp@100": {"seconds": 2.0}, "load@100": {"seconds": 0.003}, "nuevo@1": {"seconds": 1.0}}
+    baselines = {"stamp@100": 1.0, "load@100": 0.001}
+
+    # load@100 es 3 veces más lento pero por debajo del umbral de ruido
+    assert compare(results, baselines, tolerance=0.25) == [("stamp@100", 2.0, 1.0)]
+
+def test_main_updates_and_checks_baselines(tmp_path):
+    baselines = tmp_path / "baselines.json"
+    args = ["--sizes", "2", "--cases", "load", "--repeat", "1",
+            "--workdir", str(tmp_path / "trabajo"), "--baselines", str(baselines),
+            "--output", str(tmp_path / "resultados.json")]
+
+    assert main(args + ["--update-baselines"]) == 0
+    assert "load@2" in baselines.read_text()
+    assert main(args + ["--tolerance", "1000"]) == 0
+    assert main(["--cases", "desconocido"]) == 2
@@ -34,6 +34,16 @@ def sample_signature():
     yield temp_path
     os.remove(temp_path)
 
+@pytest.fixture
+def canvas_view(qapp):
+    """CanvasView que se destruye explícitamente al terminar la prueba"""
+    from PySide6.QtCore import QCoreApplication, QEvent
+    view = CanvasView()
+    yield view
+    view.shutdown()
+    view.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
 def test_canvas_view_initialization(qapp):
     view = CanvasView()
     assert view.current_page == 0
@@ -57,4 +67,285 @@ def test_signature_item_creation(qapp, sample_signature):
     item = SignatureItem(pixmap, 0)
     assert item.signature_index == 0
     assert item.flags() & item.GraphicsItemFlag.ItemIsMovable
-    assert item.flags() & item.GraphicsItemFlag.ItemIsSelectable 
\ No newline at end of file
+    assert item.flags() & item.GraphicsItemFlag.ItemIsSelectable
+
+def test_pixmap_to_qimage_shares_samples(qapp):
+    import fitz
+    from app.ui.canvas_view import pixmap_to_qimage
+
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 30, 20), False)
+    pix.set_rect(pix.irect, (255, 0, 0))
+    image = pixmap_to_qimage(pix)
+
+    assert (image.width(), image.height()) == (30, 20)
+    assert image.bytesPerLine() == pix.stride
+    assert image.pixelColor(5, 5).red() == 255
+    assert image.pixelColor(5, 5).green() == 0
+
+def test_page_rendered_in_background(qapp, canvas_view, tmp_path):
+    import fitz
+    from app.core.preview_generator import PreviewGenerator
+    from app.core.preview_cache import PreviewCache
+
+    pdf_path = str(tmp_path / "documento.pdf")
+    doc = fitz.open()
+    doc.new_page(width=200, height=300)
+    doc.new_page(width=300, height=200)
+    doc.save(pdf_path)
+    doc.close()
+
+    original_cache = PreviewGenerator.cache
+    PreviewGenerator.cache = PreviewCache(max_memory_mb=16)
+    try:
+        view = canvas_view
+        document = DocumentModel(
+            pdf_path=pdf_path,
+            total_pages=2,
+            page_dimensions={0: {"width": 200, "height": 300}, 1: {"width": 300, "height": 200}}
+        )
+        view.load_document(document)
+
+        # Mientras tanto se muestra un marcador del tamaño de la página
+        assert view.page_item.sceneBoundingRect().width() == pytest.approx(400)
+
+        view.renderer.wait()
+        qapp.processEvents()
+        # Se muestra al menos el detalle que requiere la escala de la vista
+        assert view._page_zoom >= view._detail_zoom()
+        assert view.page_item.pixmap().width() == int(200 * view._page_zoom)
+        # La página ocupa siempre el mismo espacio en la escena
+        assert view.page_item.sceneBoundingRect().width() == pytest.approx(400, abs=2)
+
+        # Cambiar de página cancela la solicitud anterior
+        view.current_page = 1
+        view.update_preview()
+        view.renderer.wait()
+        qapp.processEvents()
+        assert view.page_item.pixmap().width() == int(300 * view._page_zoom)
+    finally:
+        PreviewGenerator.cache = original_cache
+
+def test_renderer_prunes_finished_requests_and_shuts_down(qapp, tmp_path):
+    import fitz
+    from app.ui.preview_renderer import PreviewRenderer
+
+    pdf_path = str(tmp_path / "documento.pdf")
+    doc = fitz.open()
+    doc.new_page(width=200, height=300)
+    doc.save(pdf_path)
+    doc.close()
+
+    renderer = PreviewRenderer()
+    for _ in range(20):
+        renderer.request(pdf_path, 0, [0.1])
+        renderer.executor.submit(lambda: None).result()  # Esperar a la tarea enviada
+    renderer.cancel()
+    # Las solicitudes terminadas no se acumulan
+    assert renderer._pending == []
+
+    renderer.request(pdf_path, 0, [0.1, 0.2])
+    renderer.shutdown()
+    assert renderer._pending == []
+    with pytest.raises(RuntimeError):
+        renderer.request(pdf_path, 0, [0.1])
+    qapp.processEvents()
+
+def test_render_zoom_follows_view_scale_and_dpi_limit(qapp, canvas_view, tmp_path):
+    import fitz
+
+    pdf_path = str(tmp_path / "documento.pdf")
+    doc = fitz.open()
+    doc.new_page(width=200, height=300)
+    doc.save(pdf_path)
+    doc.close()
+
+    view = canvas_view
+    view.config.preview_quality = "low"  # 72 DPI -> zoom máximo 1.0
+    document = DocumentModel(
+        pdf_path=pdf_path,
+        total_pages=1,
+        page_dimensions={0: {"width": 200, "height": 300}}
+    )
+    view.load_document(document)
+
+    view.graphics_view.resetTransform()
+    view.graphics_view.scale(0.1, 0.1)
+    assert view._detail_zoom() == pytest.approx(0.25)
+
+    view.graphics_view.scale(100, 100)
+    assert view._detail_zoom() == pytest.approx(1.0)
+
+    view._refine_page()
+    view.renderer.wait()
+    qapp.processEvents()
+    assert view._page_zoom == pytest.approx(1.0)
+    assert view.page_item.pixmap().width() == 200
+
+def test_large_page_rendered_by_visible_tiles(qapp, canvas_view, tmp_path):
+    import fitz
+    from app.core.preview_generator import PreviewGenerator
+    from app.core.preview_cache import PreviewCache
+    from app.ui.canvas_view import TILE_SIZE
+
+    # Plano A0
+    pdf_path = str(tmp_path / "plano.pdf")
+    doc = fitz.open()
+    doc.new_page(width=2384, height=3370)
+    doc.save(pdf_path)
+    doc.close()
+
+    original_cache = PreviewGenerator.cache
+    PreviewGenerator.cache = PreviewCache(max_memory_mb=64)
+    try:
+        view = canvas_view
+        view.resize(600, 800)
+        document = DocumentModel(
+            pdf_path=pdf_path,
+            total_pages=1,
+            page_dimensions={0: {"width": 2384, "height": 3370}}
+        )
+        view.load_document(document)
+        view.graphics_view.resetTransform()
+        view.graphics_view.scale(1.0, 1.0)  # Zoom de render 2.0: ~32 Mpx para la página entera
+        view._refine_page()
+        view.renderer.wait()
+        view.tile_renderer.wait()
+        qapp.processEvents()
+
+        zoom = view._detail_zoom()
+        assert view._needs_tiles(0, zoom)
+        assert view._tile_zoom == zoom
+        # La página completa solo se rasteriza a baja resolución
+        assert view._page_zoom < zoom
+
+        # Solo los mosaicos visibles y sus vecinos, nunca la página entera
+        total_tiles = (
+            -(-int(2384 * zoom) // TILE_SIZE) * -(-int(3370 * zoom) // TILE_SIZE)
+        )
+        assert 0 < len(view._tile_items) < total_tiles
+        assert set(view._tile_items) == set(view._visible_tiles(0, zoom))
+        for (column, row), item in view._tile_items.items():
+            assert item.pos().x() == pytest.approx(column * TILE_SIZE * 2.0 / zoom, abs=1)
+            assert item.pos().y() == pytest.approx(row * TILE_SIZE * 2.0 / zoom, abs=1)
+
+        # Al desplazarse se solicitan los nuevos mosaicos visibles
+        view.graphics_view.verticalScrollBar().setValue(
+            view.graphics_view.verticalScrollBar().maximum()
+        )
+        view._refine_page()
+        view.tile_renderer.wait()
+        qapp.processEvents()
+        rows = {row for _, row in view._tile_items}
+        assert max(rows) == -(-int(3370 * zoom) // TILE_SIZE) - 1
+    finally:
+        PreviewGenerator.cache = original_cache
+
+def test_signature_edits_update_scene_incrementally(qapp, canvas_view, tmp_path, sample_signature):
+    import fitz
+
+    pdf_path = str(tmp_path / "documento.pdf")
+    doc = fitz.open()
+    doc.new_page(width=200, height=300)
+    doc.new_page(width=200, height=300)
+    doc.save(pdf_path)
+    doc.close()
+
+    view = canvas_view
+    document = DocumentModel(
+        pdf_path=pdf_path,
+        total_pages=2,
+        page_dimensions={0: {"width": 200, "height": 300}, 1: {"width": 200, "height": 300}}
+    )
+    view.load_document(document)
+    for page_number in (0, 0, 1):
+        document.signatures.append(SignatureModel(
+            image_path=sample_signature,
+            position=SignaturePosition(x=10, y=20),
+            size=SignatureSize(width=50, height=25),
+            page_number=page_number
+        ))
+    view.update_preview()
+
+    page_item = view.page_item
+    items = dict(view.scene.signature_items)
+    assert set(items) == {0, 1}
+    assert items[0].pos().x() == pytest.approx(20)
+
+    # Mover y redimensionar conserva la página y los items existentes
+    document.signatures[0].position.x = 40
+    document.signatures[1].size.width = 80
+    view.update_preview()
+    assert view.page_item is page_item
+    assert view.scene.signature_items[0] is items[0]
+    assert view.scene.signature_items[1] is items[1]
+    assert items[0].pos().x() == pytest.approx(80)
+    assert items[1].display_size == (160, 50)
+
+    # Eliminar una firma solo quita su item
+    document.signatures.pop(1)
+    view.update_preview()
+    assert view.page_item is page_item
+    assert set(view.scene.signature_items) == {0}
+    assert view.scene.signature_items[0] is items[0]
+    assert items[1].scene() is None
+
+    # Limpiar la escena no desvincula el documento
+    view.scene.clear()
+    assert view.scene.document is document
+    view.page_item = None
+
+def test_size_slider_scales_live_and_commits_once(qapp, canvas_view, tmp_path, sample_signature, monkeypatch):
+    import fitz
+    from PySide6.QtWidgets import QWidget
+    from app.ui.signature_panel import SignatureWidget
+
+    pdf_path = str(tmp_path / "documento.pdf")
+    doc = fitz.open()
+    doc.new_page(width=200, height=300)
+    doc.save(pdf_path)
+    doc.close()
+
+    view = canvas_view
+    document = DocumentModel(
+        pdf_path=pdf_path,
+        total_pages=1,
+        page_dimensions={0: {"width": 200, "height": 300}}
+    )
+    view.load_document(document)
+    signature = SignatureModel(
+        image_path=sample_signature,
+        position=SignaturePosition(x=0, y=0),
+        size=SignatureSize(width=30, height=15),
+        page_number=0
+    )
+    document.signatures.append(signature)
+    view.update_preview()
+    item = view.scene.signature_items[0]
+
+    host = QWidget()
+    host.canvas_view = view
+    widget = SignatureWidget(signature, 0, host)
+
+    from app.core.signature_assets import signature_assets
+    lookups = []
+    info = signature_assets.info
+    monkeypatch.setattr(signature_assets, "info", lambda path: lookups.append(path) or info(path))
+    renders = []
+    monkeypatch.setattr(view, "update_preview", lambda: renders.append(1))
+    for value in range(6, 51):  # Arrastre de 45 pasos
+        widget.size_slider.setValue(value)
+
+    # Solo escala en vivo: ni el modelo ni la vista previa cambian todavía,
+    # y la proporción de la imagen no se vuelve a consultar
+    assert renders == []
+    assert lookups == []
+    assert signature.size.width == 30
+    assert item.scale() == pytest.approx(200 / 60)  # 50 % de 200 pt, a zoom 2x
+
+    widget.size_slider.sliderReleased.emit()
+    assert renders == [1]
+    assert signature.size.width == pytest.approx(100)
+    assert signature.size.height == pytest.approx(50)
+    assert not widget._commit_timer.isActive()
+
+    host.deleteLater()
@@ -0,0 +1,123 @@
+import pytest
+from app.cli import main, expand_inputs
+from PIL import Image
+import fitz
+import json
+import os
+import subprocess
+import sys
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Carpeta con PDFs anidados, un PDF dañado, una firma y una disposición"""
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    for path, pages in ((docs / "a.pdf", 3), (docs / "sub" / "b.pdf", 1)):
+        doc = fitz.open()
+        for _ in range(pages):
+            doc.new_page(width=595, height=842)
+        doc.save(str(path))
+        doc.close()
+    (docs / "sub" / "roto.pdf").write_bytes(b"esto no es un pdf")
+
+    Image.new('RGBA', (200, 100), (0, 0, 0, 255)).save(tmp_path / "firma.png")
+    layout = {
+        "signatures": [
+            {"image_path": "firma.png", "position": {"x": 400, "y": 700},
+             "size": {"width": 120, "height": 60}, "pages": [-1]},
+            {"image_path": "firma.png", "position": {"x": 50, "y": 50},
+             "size": {"width": 60, "height": 30}, "mode": "masivo"}
+        ]
+    }
+    (tmp_path / "firmas.json").write_text(json.dumps(layout))
+    return tmp_path
+
+def _batch(workspace, *extra):
+    summary_path = workspace / "resumen.json"
+    code = main([
+        "batch", str(workspace / "docs" / "**" / "*.pdf"),
+        "--layout", str(workspace / "firmas.json"),
+        "--output", str(workspace / "firmados"),
+        "--summary", str(summary_path), *extra
+    ])
+    return code, json.loads(summary_path.read_text())
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_batch_signs_and_reports(workspace, jobs):
+    code, summary = _batch(workspace, "--jobs", jobs)
+
+    assert code == 1  # Hay un archivo dañado
+    assert (summary["total"], summary["ok"], summary["failed"]) == (3, 2, 1)
+
+    with fitz.open(str(workspace / "firmados" / "a.pdf")) as doc:
+        # Páginas 0 y 1 (masivo) y la última (página 2)
+        assert [len(page.get_image_info()) for page in doc] == [1, 1, 1]
+    with fitz.open(str(workspace / "firmados" / "sub" / "b.pdf")) as doc:
+        assert len(doc[0].get_image_info()) == 1  # Masivo no aplica a 1 página
+
+def test_batch_resume_skips_finished_files(workspace):
+    _batch(workspace)
+    code, summary = _batch(workspace, "--resume")
+
+    assert summary["skipped"] == 2
+    assert [os.path.basename(f["archivo"]) for f in summary["files"]] == ["roto.pdf"]
+
+    # Un archivo modificado se vuelve a firmar
+    doc = fitz.open()
+    doc.new_page()
+    doc.save(str(workspace / "docs" / "a.pdf"))
+    doc.close()
+    code, summary = _batch(workspace, "--resume")
+    assert sorted(os.path.basename(f["archivo"]) for f in summary["files"]) == ["a.pdf", "roto.pdf"]
+
+def test_batch_profile_reports_stages(workspace):
+    code, summary = _batch(workspace, "--profile")
+
+    perfiles = {os.path.basename(f["archivo"]): f.get("profile") for f in summary["files"]}
+    assert perfiles["roto.pdf"] is None
+    assert {"open", "encode", "insert_image", "save"} <= set(perfiles["a.pdf"]["stages"])
+    assert perfiles["a.pdf"]["counters"]["signatures"] == 3
+    # Las dos firmas usan la misma imagen: se incrusta una vez y se reutiliza
+    assert perfiles["a.pdf"]["counters"]["images_embedded"] == 1
+    assert perfiles["a.pdf"]["counters"]["bytes_written"] == os.path.getsize(
+        workspace / "firmados" / "a.pdf")
+    assert summary["profile"]["counters"]["signatures"] == 4
+    assert summary["profile"]["stages"]["save"]["calls"] == 2
+
+def test_batch_counts_inserted_signatures(workspace):
+    layout = {"signatures": [
+        {"image_path": "firma.png", "position": {"x": 50, "y": 50},
+         "size": {"width": 60, "height": 30}, "pages": [0, -1]},
+        {"image_path": "rota.png", "position": {"x": 50, "y": 50},
+         "size": {"width": 60, "height": 30}, "pages": [0]},
+    ]}
+    (workspace / "rota.png").write_bytes(b"no es una imagen")
+    (workspace / "firmas.json").write_text(json.dumps(layout))
+    _, summary = _batch(workspace)
+
+    resultados = {os.path.basename(r["archivo"]): r for r in summary["files"]}
+    # Solo cuentan las firmas escritas; la que falla deja el archivo con error
+    assert (resultados["a.pdf"]["firmas"], resultados["a.pdf"]["errores"]) == (2, 1)
+    assert (resultados["b.pdf"]["firmas"], resultados["b.pdf"]["errores"]) == (1, 1)
+    assert not resultados["a.pdf"]["ok"]
+
+def test_expand_inputs_accepts_directories(workspace):
+    files = expand_inputs([str(workspace / "docs")])
+    assert [os.path.basename(f) for f in files] == ["a.pdf", "b.pdf", "roto.pdf"]
+
+def test_batch_skips_output_inside_input(workspace):
+    output_dir = workspace / "docs" / "firmados"
+    args = ["batch", str(workspace / "docs"), "--layout", str(workspace / "firmas.json"),
+            "--output", str(output_dir)]
+    main(args)
+    main(args)
+
+    # La segunda pasada no toma los PDFs ya firmados como entradas
+    assert not (output_dir / "firmados").exists()
+    assert expand_inputs([str(workspace / "docs")], exclude=str(output_dir)) == \
+        expand_inputs([str(workspace / "docs" / "a.pdf"), str(workspace / "docs" / "sub")])
+
+def test_cli_does_not_import_qt():
+    code = "import app.cli, sys; print('PySide6' in sys.modules)"
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert output.strip().splitlines()[-1] == b"False"
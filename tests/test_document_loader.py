@@ -0,0 +1,67 @@
+import pytest
+from app.core.document_loader import load_document_model
+from app.models.document_model import DocumentModel, PageDimensions
+import fitz
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Crea un PDF con páginas de distintos tamaños, una de ellas rotada"""
+    pdf_path = tmp_path / "documento.pdf"
+    doc = fitz.open()
+    for i in range(50):
+        doc.new_page(width=595, height=842)
+    doc.new_page(width=2384, height=3370)
+    page = doc.new_page(width=842, height=595)
+    page.set_rotation(90)
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+def test_loader_reads_page_sizes_on_demand(sample_pdf):
+    document = load_document_model(sample_pdf)
+
+    assert document.total_pages == 52
+    assert len(document.page_dimensions) == 52
+    assert document.page_dimensions.loaded_count == 0
+
+    assert document.page_dimensions[50].width == pytest.approx(2384)
+    assert document.page_dimensions.loaded_count == 1
+    # Se usa el tamaño visible (con la rotación aplicada)
+    assert (document.page_dimensions[51].width, document.page_dimensions[51].height) == (595, 842)
+    assert document.page_dimensions.size(0) == (595, 842)
+    assert document.page_dimensions.loaded_count == 3
+
+    with pytest.raises(KeyError):
+        document.page_dimensions[52]
+
+def test_document_model_accepts_dicts(sample_pdf):
+    document = DocumentModel(
+        pdf_path=sample_pdf,
+        total_pages=2,
+        page_dimensions={0: {"width": 595, "height": 842}, 1: PageDimensions(width=100, height=50)}
+    )
+    assert document.page_dimensions[1].height == 50
+    assert list(document.page_dimensions) == [0, 1]
+    assert 2 not in document.page_dimensions
+
+def test_page_geometry_is_compact_for_large_documents():
+    import time
+    from app.models.page_geometry import PageGeometry
+
+    start = time.perf_counter()
+    geometry = PageGeometry(10_000, lambda page: (595.0, 842.0 + page))
+    assert time.perf_counter() - start < 0.05
+    assert geometry.loaded_count == 0
+    assert geometry._widths.itemsize * len(geometry._widths) == 80_000
+
+    assert geometry[9_999].height == 842 + 9_999
+    assert dict(geometry.items())[1].height == 843
+    assert geometry.loaded_count == 10_000
+
+def test_page_geometry_rejects_invalid_sizes():
+    from app.models.page_geometry import PageGeometry
+
+    with pytest.raises(ValueError):
+        PageGeometry(1, lambda page: (0.0, 842.0))[0]
+    with pytest.raises(ValueError):
+        DocumentModel.validate_page_dimensions({0: {"width": -1, "height": 842}})
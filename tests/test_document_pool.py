@@ -0,0 +1,65 @@
+import pytest
+from app.core.document_pool import DocumentPool
+import fitz
+import os
+
+@pytest.fixture
+def sample_pdfs(tmp_path):
+    """Crea tres PDFs de prueba"""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc_{i}.pdf"
+        doc = fitz.open()
+        doc.new_page()
+        doc.save(str(path))
+        doc.close()
+        paths.append(str(path))
+    return paths
+
+def test_get_reuses_open_document(sample_pdfs):
+    pool = DocumentPool()
+    doc = pool.get(sample_pdfs[0])
+    assert pool.get(sample_pdfs[0]) is doc
+    assert sample_pdfs[0] in pool
+    pool.close_all()
+    assert doc.is_closed
+
+def test_get_reopens_modified_file(sample_pdfs):
+    pool = DocumentPool()
+    doc = pool.get(sample_pdfs[0])
+
+    # Modificar el archivo en disco
+    modified = fitz.open()
+    modified.new_page()
+    modified.new_page()
+    modified.save(sample_pdfs[0])
+    modified.close()
+    stat = os.stat(sample_pdfs[0])
+    os.utime(sample_pdfs[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    reopened = pool.get(sample_pdfs[0])
+    assert reopened is not doc
+    assert doc.is_closed
+    assert len(reopened) == 2
+    pool.close_all()
+
+def test_pool_closes_least_recently_used(sample_pdfs):
+    pool = DocumentPool(max_open=2)
+    first = pool.get(sample_pdfs[0])
+    pool.get(sample_pdfs[1])
+    pool.get(sample_pdfs[2])
+
+    assert len(pool) == 2
+    assert first.is_closed
+    assert sample_pdfs[0] not in pool
+    pool.close_all()
+
+def test_take_transfers_ownership(sample_pdfs):
+    pool = DocumentPool()
+    doc = pool.get(sample_pdfs[0])
+    taken = pool.take(sample_pdfs[0])
+
+    assert taken is doc
+    assert sample_pdfs[0] not in pool
+    assert not taken.is_closed
+    taken.close()
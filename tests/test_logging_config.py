@@ -0,0 +1,39 @@
+import logging
+import pytest
+from app.core.logging_config import configure_logging, parse_module_levels
+
+@pytest.fixture
+def restore_logging():
+    """Restaura los niveles y handlers del logging tras la prueba"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    signer = logging.getLogger("app.core.pdf_signer")
+    signer_level = signer.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    signer.setLevel(signer_level)
+
+def test_parse_module_levels():
+    levels = parse_module_levels("app.core.pdf_signer=DEBUG, app.ui=warning,")
+
+    assert levels == {"app.core.pdf_signer": logging.DEBUG, "app.ui": logging.WARNING}
+    assert parse_module_levels(None) == {}
+    with pytest.raises(ValueError):
+        parse_module_levels("app.ui")
+    with pytest.raises(ValueError):
+        parse_module_levels("app.ui=RUIDOSO")
+
+def test_configure_logging_module_levels(restore_logging, monkeypatch):
+    monkeypatch.setenv("PDF_SIGNER_LOG", "app.core.pdf_signer=DEBUG")
+
+    first, second = logging.NullHandler(), logging.NullHandler()
+    configure_logging([first], level="WARNING")
+    configure_logging([second], level="WARNING")
+
+    root = logging.getLogger()
+    assert root.level == logging.WARNING
+    assert logging.getLogger("app.core.pdf_signer").isEnabledFor(logging.DEBUG)
+    assert not logging.getLogger("app.core.document_pool").isEnabledFor(logging.INFO)
+    # Una nueva configuración reemplaza los handlers anteriores
+    assert second in root.handlers and first not in root.handlers
@@ -0,0 +1,55 @@
+from benchmarks.run_benchmarks import BenchmarkContext
+from benchmarks.run_memory import check_budgets, main, measure_case, run_memory
+
+def test_measure_case_reports_rss_and_allocators(tmp_path):
+    result = measure_case(BenchmarkContext(str(tmp_path)), "sign_plantilla", 4, top=3)
+
+    assert result["peak_rss_mb"] > 0 and result["rss_before_mb"] > 0
+    assert result["case_rss_mb"] >= 0
+    assert result["tracemalloc_peak_mb"] > 0
+    assert 0 < len(result["top"]) <= 3
+    # Pico de Python por etapa del firmador, nunca mayor que el del caso
+    stages = result["stages"]
+    assert {"plan", "open", "load_page", "insert_image", "save"} <= set(stages)
+    assert stages["insert_image"]["calls"] == 4
+    assert all(stage["peak_mb"] <= result["tracemalloc_peak_mb"] for stage in stages.values())
+    # Masivo no aplica a un documento de una página
+    assert measure_case(BenchmarkContext(str(tmp_path)), "sign_masivo", 1) is None
+
+def test_run_memory_isolates_each_case(tmp_path):
+    results = run_memory(str(tmp_path), [2], ["load", "stamp"])
+
+    assert set(results) == {"load@2", "stamp@2"}
+    assert all(result["peak_rss_mb"] > 0 for result in results.values())
+    assert all(result["case_rss_mb"] is not None for result in results.values())
+
+def test_measure_case_excludes_setup(tmp_path, monkeypatch):
+    import benchmarks.run_memory as run_memory_module
+
+    def setup(context, pages):
+        lastre = bytearray(64 * 1024 * 1024)  # Preparación costosa, liberada antes de medir
+        lastre[::4096] = b"x" * len(lastre[::4096])
+        del lastre
+        return lambda: None
+
+    monkeypatch.setitem(run_memory_module.CASES, "preparacion", setup)
+    result = measure_case(BenchmarkContext(str(tmp_path)), "preparacion", 1)
+
+    if not result["peak_includes_setup"]:
+        assert result["case_rss_mb"] < 16
+
+def test_check_budgets():
+    results = {"stamp@100": {"case_rss_mb": 250.0}, "load@100": {"case_rss_mb": 90.0}}
+
+    assert check_budgets(results, {"stamp@100": 200, "load@100": 100}) == [("stamp@100", 250.0, 200)]
+    assert check_budgets(results, {}) == []
+
+def test_main_fails_when_budget_exceeded(tmp_path):
+    budgets = tmp_path / "budgets.json"
+    budgets.write_text('{"load@1": 1}')
+
+    code = main(["--sizes", "1", "--cases", "load", "--workdir", str(tmp_path),
+                 "--budgets", str(budgets), "--output", str(tmp_path / "memoria.json")])
+
+    assert code == 1
+    assert '"exceeded"' in (tmp_path / "memoria.json").read_text()
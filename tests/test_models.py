@@ -72,4 +72,106 @@ def test_config_model():
     
     # Probar actualización de valores
     config.preview_quality = "low"
-    assert config.preview_dpi == 72 
\ No newline at end of file
+    assert config.preview_dpi == 72
+
+@pytest.fixture
+def large_document(tmp_path):
+    """Documento de 2000 páginas (solo el modelo; el PDF no se abre)"""
+    pdf_path = tmp_path / "grande.pdf"
+    pdf_path.write_bytes(b"%PDF-1.7\n")
+    return DocumentModel(
+        pdf_path=str(pdf_path),
+        total_pages=2000,
+        page_dimensions={0: {"width": 595, "height": 842}}
+    )
+
+def test_masivo_stores_one_template(large_document, sample_signature_image):
+    import time
+    from app.models.signature_mode_config import SignatureMode, SignatureModeConfig
+
+    large_document.set_signature_mode(SignatureModeConfig(SignatureMode.MASIVO))
+    template = SignatureModel(
+        image_path=sample_signature_image,
+        position=SignaturePosition(x=10, y=20),
+        size=SignatureSize(width=100, height=50),
+        page_number=0
+    )
+    start = time.perf_counter()
+    large_document.add_signature(template)
+    assert time.perf_counter() - start < 0.05
+
+    last = SignatureModel(
+        image_path=sample_signature_image,
+        position=SignaturePosition(x=30, y=40),
+        size=SignatureSize(width=100, height=50),
+        page_number=1999
+    )
+    large_document.add_signature(last)
+
+    assert large_document.signatures == [template, last]
+    assert template.pages == range(1999)
+    assert large_document.signatures_on_page(500) == [0]
+    assert large_document.signatures_on_page(1999) == [1]
+
+    # Mover la plantilla mueve todas sus páginas
+    template.position.x = 15
+    expanded = list(large_document.expand_signatures())
+    assert len(expanded) == 2000
+    assert {sig['page_number'] for sig in expanded} == set(range(2000))
+    assert expanded[1998]['position'] == {'x': 15, 'y': 20}
+    assert expanded[-1]['position'] == {'x': 30, 'y': 40}
+
+def test_plantilla_follows_interval_changes(large_document, sample_signature_image):
+    from app.models.signature_mode_config import SignatureMode, SignatureModeConfig
+
+    config = SignatureModeConfig(SignatureMode.PLANTILLA)
+    config.pattern_interval = 10
+    large_document.set_signature_mode(config)
+    large_document.add_signature(SignatureModel(
+        image_path=sample_signature_image,
+        position=SignaturePosition(x=10, y=20),
+        size=SignatureSize(width=100, height=50),
+        page_number=0
+    ))
+    assert len(list(large_document.expand_signatures())) == 200
+
+    config.pattern_interval = 100
+    large_document.set_signature_mode(config)
+    assert [sig['page_number'] for sig in large_document.expand_signatures()][:3] == [0, 100, 200]
+
+def test_switch_to_libre_collapses_templates(large_document, sample_signature_image):
+    from app.models.signature_mode_config import SignatureMode, SignatureModeConfig
+
+    large_document.set_signature_mode(SignatureModeConfig(SignatureMode.MASIVO))
+    template = SignatureModel(
+        image_path=sample_signature_image,
+        position=SignaturePosition(x=10, y=20),
+        size=SignatureSize(width=100, height=50),
+        page_number=0
+    )
+    large_document.add_signature(template)
+    assert len(template.target_pages()) == 1999
+
+    large_document.set_signature_mode(SignatureModeConfig(SignatureMode.LIBRE))
+
+    assert not template.is_template
+    assert [sig['page_number'] for sig in large_document.expand_signatures()] == [0]
+    assert large_document.signatures_on_page(5) == []
+
+def test_signature_model_uses_given_aspect_ratio(sample_signature_image):
+    signature = SignatureModel(
+        image_path=sample_signature_image,
+        position=SignaturePosition(x=10, y=20),
+        size=SignatureSize(width=100, height=50),
+        page_number=0,
+        aspect_ratio=0.25
+    )
+    assert signature.size.height == 25
+
+def test_models_do_not_import_core():
+    import subprocess
+    import sys
+
+    code = "import app.models.document_model, sys; print(any(m.startswith('app.core') for m in sys.modules))"
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert output.strip().splitlines()[-1] == b"False"
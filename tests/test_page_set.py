@@ -0,0 +1,40 @@
+import pytest
+from app.models.page_set import PageSet
+from app.models.signature_mode_config import SignatureMode, SignatureModeConfig
+
+def test_range_and_mask_representations_agree():
+    for pages in (range(10), range(3, 17, 4), range(0, 1000, 7), range(5, 5)):
+        page_set = PageSet(pages)
+        assert list(page_set) == list(pages)
+        assert len(page_set) == len(pages)
+        assert PageSet._from_mask(page_set.mask) == page_set
+        assert list(PageSet._from_mask(page_set.mask)) == list(pages)
+
+def test_set_operations():
+    todas = PageSet(range(10))
+    pares = PageSet(range(0, 10, 2))
+    sueltas = PageSet([1, 3, 12])
+
+    assert list(todas - pares) == [1, 3, 5, 7, 9]
+    assert list(pares | sueltas) == [0, 1, 2, 3, 4, 6, 8, 12]
+    assert list(todas & sueltas) == [1, 3]
+    assert list(PageSet.union([pares, sueltas, PageSet()])) == list(pares | sueltas)
+    assert 12 in sueltas and 2 not in sueltas and -1 not in sueltas
+    assert not PageSet()
+
+def test_negative_pages_are_rejected():
+    with pytest.raises(ValueError):
+        PageSet([-1])
+
+def test_mode_config_pages():
+    config = SignatureModeConfig(SignatureMode.SELECTIVO)
+    config.affected_pages = list(range(0, 10_000, 3))
+    config.excluded_pages = list(range(0, 10_000, 6))
+    pages = config.pages(10_000)
+    assert len(pages) == 1667
+    assert 3 in pages and 6 not in pages
+
+    config = SignatureModeConfig(SignatureMode.PLANTILLA)
+    config.pattern_interval = 5
+    assert config.pages(12) == range(0, 12, 5)
+    assert SignatureModeConfig(SignatureMode.MASIVO).pages(1) == PageSet()
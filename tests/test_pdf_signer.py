@@ -0,0 +1,181 @@
+import pytest
+from app.core.pdf_signer import PDFSigner
+from PIL import Image
+import fitz
+import os
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Crea un PDF de prueba de varias páginas"""
+    pdf_path = tmp_path / "documento.pdf"
+    doc = fitz.open()
+    for _ in range(5):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((72, 72), "Documento de prueba")
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+@pytest.fixture
+def sample_signature(tmp_path):
+    """Crea una imagen de firma de prueba"""
+    sig_path = tmp_path / "firma.png"
+    Image.new('RGBA', (200, 100), (0, 0, 0, 255)).save(sig_path)
+    return str(sig_path)
+
+def _firma(image_path, page_number):
+    return {
+        'image_path': image_path,
+        'page_number': page_number,
+        'position': {'x': 100, 'y': 100},
+        'size': {'width': 120, 'height': 60}
+    }
+
+def test_insert_signature_only_signed_pages(sample_pdf, sample_signature, tmp_path):
+    output_path = str(tmp_path / "firmado.pdf")
+    signatures = [_firma(sample_signature, 0), _firma(sample_signature, 3)]
+
+    PDFSigner().insert_signature(sample_pdf, output_path, signatures)
+
+    with fitz.open(output_path) as doc:
+        assert len(doc) == 5
+        assert [len(page.get_images()) for page in doc] == [1, 0, 0, 1, 0]
+
+def test_insert_signature_ignores_out_of_range_pages(sample_pdf, sample_signature, tmp_path):
+    output_path = str(tmp_path / "firmado.pdf")
+    signatures = [_firma(sample_signature, 1), _firma(sample_signature, 99)]
+
+    PDFSigner().insert_signature(sample_pdf, output_path, signatures)
+
+    with fitz.open(output_path) as doc:
+        assert sum(len(page.get_images()) for page in doc) == 1
+
+def test_insert_signature_same_file_is_incremental(sample_pdf, sample_signature):
+    original_size = os.path.getsize(sample_pdf)
+    with open(sample_pdf, 'rb') as f:
+        original_bytes = f.read()
+
+    report = PDFSigner().insert_signature(sample_pdf, sample_pdf, [_firma(sample_signature, 2)])
+
+    # El guardado incremental conserva el contenido original como prefijo
+    with open(sample_pdf, 'rb') as f:
+        assert f.read(original_size) == original_bytes
+    # Los objetos anexados van comprimidos: unos KB por encima de la imagen,
+    # no los ~60 KB del mapa de bits sin /Filter
+    counters = report.as_dict()["counters"]
+    assert counters["bytes_written"] == os.path.getsize(sample_pdf) - original_size
+    assert counters["bytes_written"] < counters["image_bytes"] + 8 * 1024
+    with fitz.open(sample_pdf) as doc:
+        assert len(doc[2].get_images()) == 1
+
+def test_signature_image_embedded_once(sample_pdf, sample_signature, tmp_path):
+    output_path = str(tmp_path / "firmado.pdf")
+    signatures = [_firma(sample_signature, page) for page in range(5)]
+
+    PDFSigner().insert_signature(sample_pdf, output_path, signatures)
+
+    with fitz.open(output_path) as doc:
+        xrefs = {img[0] for page in doc for img in page.get_images()}
+        assert len(xrefs) == 1
+        assert all(len(page.get_images()) == 1 for page in doc)
+
+def test_image_registry_keys_by_content_and_size(sample_signature, tmp_path):
+    from app.core.image_registry import SignatureImageRegistry
+
+    copia = str(tmp_path / "copia.png")
+    with open(sample_signature, 'rb') as src, open(copia, 'wb') as dst:
+        dst.write(src.read())
+
+    doc = fitz.open()
+    page = doc.new_page()
+    registry = SignatureImageRegistry(doc)
+    rect = fitz.Rect(0, 0, 100, 50)
+
+    xref = registry.insert(page, rect, sample_signature)
+    assert registry.insert(page, rect, copia) == xref  # Mismo contenido
+    assert registry.insert(page, rect, sample_signature, (50, 25)) != xref
+    assert registry.embedded == 2
+    assert registry.reused == 1
+    doc.close()
+
+def test_template_signature_uses_page_set(sample_pdf, sample_signature, tmp_path):
+    from app.models.page_set import PageSet
+
+    output_path = str(tmp_path / "firmado.pdf")
+    plantilla = dict(_firma(sample_signature, 0), pages=PageSet(range(0, 10, 2)))
+    signatures = [plantilla, _firma(sample_signature, 1), _firma(sample_signature, 2)]
+
+    PDFSigner().insert_signature(sample_pdf, output_path, signatures)
+
+    with fitz.open(output_path) as doc:
+        # Páginas 0, 2 y 4 de la plantilla (6 y 8 no existen) y las sueltas 1 y 2
+        assert [len(page.get_image_info()) for page in doc] == [1, 1, 2, 0, 1]
+
+def test_template_index_avoids_membership_per_page(sample_signature, tmp_path, monkeypatch):
+    from app.models.page_set import PageSet
+
+    pdf_path = str(tmp_path / "largo.pdf")
+    doc = fitz.open()
+    for _ in range(60):
+        doc.new_page(width=595, height=842)
+    doc.save(pdf_path)
+    doc.close()
+
+    consultas = []
+    contains = PageSet.__contains__
+    monkeypatch.setattr(PageSet, "__contains__",
+                        lambda self, page: consultas.append(page) or contains(self, page))
+
+    # Conjuntos de una página (firmas sueltas) y dos plantillas
+    signatures = [dict(_firma(sample_signature, page), pages=PageSet((page,))) for page in range(60)]
+    signatures += [dict(_firma(sample_signature, 0), pages=PageSet(range(0, 60, 2))),
+                   dict(_firma(sample_signature, 1), pages=PageSet(range(1, 60, 2)))]
+    output_path = str(tmp_path / "firmado.pdf")
+    report = PDFSigner().insert_signature(pdf_path, output_path, signatures).as_dict()
+
+    # Cada plantilla se recorre una vez: sin consultas página × plantilla
+    assert consultas == []
+    assert report["counters"]["pages_signed"] == 60
+    with fitz.open(output_path) as doc:
+        assert all(len(page.get_image_info()) == 2 for page in doc)
+
+def test_insert_signature_logs_one_summary(sample_pdf, sample_signature, tmp_path, caplog):
+    import logging
+    from app.models.page_set import PageSet
+
+    output_path = str(tmp_path / "firmado.pdf")
+    plantilla = dict(_firma(sample_signature, 0), pages=PageSet(range(5)))
+
+    with caplog.at_level(logging.INFO, logger="app.core.pdf_signer"):
+        PDFSigner().insert_signature(sample_pdf, output_path, [plantilla])
+
+    # Sin DEBUG no hay detalle por página: un único registro de resumen
+    records = [r for r in caplog.records if r.name == "app.core.pdf_signer"]
+    assert [r.levelno for r in records] == [logging.INFO]
+    assert "5 firmas en 5 páginas" in records[0].getMessage()
+
+def test_insert_signature_debug_logs_each_page(sample_pdf, sample_signature, tmp_path, caplog):
+    import logging
+
+    output_path = str(tmp_path / "firmado.pdf")
+    signatures = [_firma(sample_signature, 0), _firma(sample_signature, 3)]
+
+    with caplog.at_level(logging.DEBUG, logger="app.core.pdf_signer"):
+        PDFSigner().insert_signature(sample_pdf, output_path, signatures)
+
+    pages = [r for r in caplog.records if r.getMessage().startswith("Página")]
+    assert len(pages) == 2
+
+def test_insert_signature_returns_stage_report(sample_pdf, sample_signature, tmp_path):
+    output_path = str(tmp_path / "firmado.pdf")
+    signatures = [_firma(sample_signature, 0), _firma(sample_signature, 3)]
+
+    signer = PDFSigner()
+    report = signer.insert_signature(sample_pdf, output_path, signatures).as_dict()
+
+    assert signer.last_report.as_dict() == report
+    assert report["stages"]["insert_image"]["calls"] == 2
+    assert report["stages"]["encode"]["calls"] == 1  # La segunda firma reutiliza el xref
+    assert report["counters"]["pages_signed"] == 2
+    assert report["counters"]["images_reused"] == 1
+    assert report["counters"]["bytes_written"] == os.path.getsize(output_path)
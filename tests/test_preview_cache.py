@@ -0,0 +1,141 @@
+import pytest
+from app.core.preview_cache import PreviewCache
+from app.core.preview_generator import PreviewGenerator
+from app.utils.lru_cache import LRUCache
+from PIL import Image
+import fitz
+import os
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """Crea un PDF de prueba de tres páginas"""
+    pdf_path = tmp_path / "documento.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page(width=200, height=300)
+        page.insert_text((20, 40), f"Página {i + 1}")
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+@pytest.fixture
+def fresh_cache():
+    """Reemplaza la caché compartida durante la prueba"""
+    original = PreviewGenerator.cache
+    PreviewGenerator.cache = PreviewCache(max_memory_mb=16)
+    yield PreviewGenerator.cache
+    PreviewGenerator.cache = original
+
+def test_lru_cache_evicts_by_size():
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"  # "a" pasa a ser el más reciente
+    cache.put("c", b"123")
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.total_bytes == 8
+    assert not cache.put("grande", b"x" * 11)
+    assert cache.stats()["hits"] == 1
+
+def test_preview_is_cached(sample_pdf, fresh_cache):
+    first = PreviewGenerator.generate_page_preview(sample_pdf, 1)
+    second = PreviewGenerator.generate_page_preview(sample_pdf, 1)
+
+    assert isinstance(first, Image.Image)
+    assert first.size == (400, 600)  # Zoom 2x por defecto
+    assert first.tobytes() == second.tobytes()
+    assert fresh_cache.memory.hits == 1
+    assert fresh_cache.memory.misses == 1
+
+def test_preview_cache_key_includes_mtime_and_zoom(sample_pdf, fresh_cache):
+    key = PreviewCache.make_key(sample_pdf, 0, 2.0)
+    assert PreviewCache.make_key(sample_pdf, 0, 1.0) != key
+
+    stat = os.stat(sample_pdf)
+    os.utime(sample_pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert PreviewCache.make_key(sample_pdf, 0, 2.0) != key
+
+def test_preview_cache_disk_tier(sample_pdf, tmp_path):
+    cache = PreviewCache(max_memory_mb=16, disk_dir=str(tmp_path / "cache"))
+    key = PreviewCache.make_key(sample_pdf, 0, 1.0)
+    with fitz.open(sample_pdf) as doc:
+        cache.put(key, doc[0].get_pixmap())
+
+    cache.clear()
+    pix = cache.get(key)
+    assert pix is not None
+    assert (pix.width, pix.height) == (200, 300)
+    assert cache.disk_hits == 1
+
+def test_preview_cache_writes_disk_only_on_eviction(sample_pdf, tmp_path):
+    disk_dir = tmp_path / "cache"
+    # Memoria para una sola página de 200x300 RGB (180 KB)
+    cache = PreviewCache(max_memory_mb=0.3, disk_dir=str(disk_dir), max_disk_mb=16)
+    keys = [PreviewCache.make_key(sample_pdf, page, 1.0) for page in range(3)]
+    with fitz.open(sample_pdf) as doc:
+        cache.put(keys[0], doc[0].get_pixmap())
+        assert list(disk_dir.iterdir()) == []
+
+        cache.put(keys[1], doc[1].get_pixmap())
+        assert list(disk_dir.iterdir()) == []  # Pendiente hasta flush()
+        cache.flush()
+        files = list(disk_dir.iterdir())
+        assert len(files) == 1  # Solo la página desalojada
+        assert cache.disk_bytes == files[0].stat().st_size
+
+    cache.memory.pop(keys[1])
+    assert cache.get(keys[0]) is not None
+    assert cache.disk_hits == 1
+
+def test_preview_cache_trims_disk_by_running_total(sample_pdf, tmp_path):
+    disk_dir = tmp_path / "cache"
+    cache = PreviewCache(max_memory_mb=0.3, disk_dir=str(disk_dir), max_disk_mb=0.001)
+    with fitz.open(sample_pdf) as doc:
+        for page in range(3):
+            cache.put(PreviewCache.make_key(sample_pdf, page, 1.0), doc[page].get_pixmap())
+    cache.flush()
+
+    assert cache.disk_bytes == sum(f.stat().st_size for f in disk_dir.iterdir())
+    assert cache.disk_bytes <= cache.max_disk_bytes
+
+def test_render_flushes_disk_tier_outside_pool_lock(sample_pdf, tmp_path, monkeypatch):
+    import threading
+    from app.core.document_pool import document_pool
+
+    cache = PreviewCache(max_memory_mb=0.3, disk_dir=str(tmp_path / "cache"))
+    monkeypatch.setattr(PreviewGenerator, "cache", cache)
+    flush = cache.flush
+    pool_free = []
+
+    def checked_flush():
+        # Otro hilo debe poder tomar el candado del pool mientras se escribe en disco
+        probe = threading.Thread(target=lambda: pool_free.append(
+            document_pool.lock.acquire(blocking=False) and document_pool.lock.release() is None))
+        probe.start()
+        probe.join()
+        flush()
+
+    monkeypatch.setattr(cache, "flush", checked_flush)
+    for page in range(2):
+        PreviewGenerator.render_page(sample_pdf, page, 1.0)
+
+    assert pool_free == [True, True]
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+def test_render_tile_clips_page(tmp_path, fresh_cache):
+    pdf_path = str(tmp_path / "plano.pdf")
+    doc = fitz.open()
+    doc.new_page(width=1000, height=700)
+    doc.save(pdf_path)
+    doc.close()
+
+    tile = PreviewGenerator.render_tile(pdf_path, 0, 1.0, (1, 0), tile_size=512)
+    assert (tile.x, tile.y) == (512, 0)
+    assert (tile.width, tile.height) == (1000 - 512, 512)  # Mosaico de borde
+
+    assert PreviewGenerator.get_cached_tile(pdf_path, 0, 1.0, (1, 0), 512) is tile
+    assert PreviewGenerator.get_cached_tile(pdf_path, 0, 1.0, (0, 0), 512) is None
+    with pytest.raises(ValueError):
+        PreviewGenerator.render_tile(pdf_path, 0, 1.0, (5, 5), tile_size=512)
@@ -0,0 +1,79 @@
+import pytest
+from app.core import scenarios
+from app.core.pdf_signer import PDFSigner
+from app.core.signature_layout import SignatureLayout
+from PIL import Image
+import fitz
+
+SIZES = [(595, 842), (842, 595), (2384, 1684), (595, 842), (1684, 2384)]
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """PDF con páginas A4, A4 horizontal y planos"""
+    pdf_path = tmp_path / "mixto.pdf"
+    doc = fitz.open()
+    for width, height in SIZES:
+        doc.new_page(width=width, height=height)
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+@pytest.fixture
+def signature(tmp_path):
+    sig_path = tmp_path / "firma.png"
+    Image.new('RGBA', (200, 100), (0, 0, 0, 255)).save(sig_path)
+    return str(sig_path)
+
+def test_assign_scenarios():
+    asignados = scenarios.assign_scenarios(SIZES)
+
+    assert [e["nombre"] for e in asignados] == [
+        "A4 Vertical", "A4 Horizontal", "Planos / Hojas Grandes", "A4 Vertical", "Planos / Hojas Grandes"
+    ]
+    assert [e["orientacion"] for e in asignados] == ["vertical", "horizontal", "horizontal", "vertical", "vertical"]
+    # Las páginas del mismo tamaño comparten el escenario memorizado
+    assert asignados[0] is asignados[3]
+
+def test_placement_rect_by_orientation():
+    vertical = scenarios.ESCENARIOS["A4_VERTICAL"]
+    rect = scenarios.placement_rect(fitz.Rect(0, 0, 595, 842), vertical, 120, 60, offset_x=-10)
+    assert rect == fitz.Rect(365, 732, 485, 792)
+
+    horizontal = scenarios.ESCENARIOS["A4_HORIZONTAL"]
+    rect = scenarios.placement_rect(fitz.Rect(0, 0, 842, 595), horizontal, 70, 140)
+    assert rect == fitz.Rect(522, 100, 592, 240)
+
+def test_scenario_placements_group_by_page_size(signature):
+    placements = scenarios.scenario_placements(signature, SIZES.__getitem__, range(len(SIZES)))
+
+    assert [list(p['pages']) for p in placements] == [[0, 3], [1], [2], [4]]
+    a4, horizontal = placements[0], placements[1]
+    assert a4['size'] == {'width': 120, 'height': 60} and a4['rotation'] == 0
+    # Rotada 90°: el ancho deseado es el del sello ya girado
+    assert horizontal['size'] == {'width': 70, 'height': 140} and horizontal['rotation'] == 90
+
+def test_sign_by_scenario(mixed_pdf, signature, tmp_path):
+    output_path = str(tmp_path / "firmado.pdf")
+
+    report = PDFSigner().sign_by_scenario(mixed_pdf, output_path, signature)
+
+    assert report.counters["signatures"] == len(SIZES)
+    assert report.counters["images_embedded"] == 1
+    with fitz.open(output_path) as doc:
+        for page in doc:
+            info, = page.get_image_info()
+            bbox = fitz.Rect(info["bbox"])
+            # La firma queda dentro de la página, cerca del borde derecho
+            assert page.rect.contains(bbox)
+            assert bbox.x1 > page.rect.width / 2
+
+def test_layout_scenario_entries(mixed_pdf, signature, tmp_path):
+    layout = SignatureLayout([{"image_path": signature, "scenario": True, "mode": "libre"}])
+
+    placements = layout.placements(len(SIZES), SIZES.__getitem__)
+
+    assert sum(len(p['pages']) for p in placements) == len(SIZES)
+    with pytest.raises(ValueError):
+        layout.placements(len(SIZES))
+    with pytest.raises(ValueError):
+        SignatureLayout([{"image_path": signature}])
@@ -0,0 +1,103 @@
+import pytest
+import sellador_carpetas_v3 as sellador
+from PIL import Image
+import fitz
+import os
+
+@pytest.fixture
+def carpeta_docs(tmp_path):
+    """Crea una carpeta con PDFs de distintos tamaños y un sello"""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    tamaños = [(595, 842), (842, 595), (2384, 1684)]
+    for i, (w, h) in enumerate(tamaños):
+        doc = fitz.open()
+        for _ in range(3):
+            doc.new_page(width=w, height=h)
+        doc.save(str(docs / f"doc_{i}.pdf"))
+        doc.close()
+    # Un archivo dañado no debe detener el lote
+    (docs / "danado.pdf").write_bytes(b"no es un pdf")
+
+    sello = tmp_path / "sello.png"
+    Image.new('RGBA', (300, 150), (200, 0, 0, 255)).save(sello)
+    return str(docs), str(sello), str(tmp_path / "sellados")
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_sellar_pdfs(carpeta_docs, procesos):
+    docs, sello, salida = carpeta_docs
+    resultados = sellador.sellar_pdfs(docs, sello, salida, procesos=procesos, max_pendientes=1)
+
+    assert len(resultados) == 4
+    correctos = [r for r in resultados if r["ok"]]
+    errores = [r for r in resultados if not r["ok"]]
+    assert len(correctos) == 3
+    assert os.path.basename(errores[0]["archivo"]) == "danado.pdf"
+
+    for resultado in correctos:
+        assert resultado["paginas"] == 3
+        with fitz.open(resultado["salida"]) as doc:
+            assert all(len(page.get_images()) == 1 for page in doc)
+
+def test_variantes_sello_cuantizadas(carpeta_docs):
+    _, sello, _ = carpeta_docs
+    variantes = sellador.VariantesSello(sello, [sellador.escenario_1], paso_giro=0.5)
+
+    # ±5° en pasos de 0.5° -> 21 variantes pre-renderizadas
+    assert len(variantes.variantes) == 21
+    angulo, (png, nuevo_w, nuevo_h) = variantes.elegir(sellador.escenario_1)
+    assert angulo in variantes.angulos(sellador.escenario_1)
+    assert abs(nuevo_w - sellador.escenario_1["ancho_deseado"]) <= 1  # Truncado a entero
+    assert png.startswith(b"\x89PNG")
+
+def test_variantes_reutilizan_xref(carpeta_docs, tmp_path):
+    _, sello, _ = carpeta_docs
+    entrada = str(tmp_path / "largo.pdf")
+    doc = fitz.open()
+    for _ in range(60):
+        doc.new_page(width=595, height=842)
+    doc.save(entrada)
+    doc.close()
+
+    salida = str(tmp_path / "salida.pdf")
+    sellador.sellar_pdf(entrada, sello, salida, detalle=False)
+
+    with fitz.open(salida) as doc:
+        xrefs = [img[0] for page in doc for img in page.get_images()]
+        assert len(xrefs) == 60
+        # Nunca más imágenes incrustadas que variantes de giro posibles
+        assert len(set(xrefs)) <= 21
+
+def test_sellar_pdfs_recorre_subcarpetas_en_flujo(carpeta_docs):
+    docs, sello, salida = carpeta_docs
+    sub = os.path.join(docs, "sub", "interna")
+    os.makedirs(sub)
+    doc = fitz.open()
+    doc.new_page(width=595, height=842)
+    doc.save(os.path.join(sub, "anidado.pdf"))
+    doc.close()
+
+    encontrados = sellador.iterar_pdfs(docs)
+    assert iter(encontrados) is encontrados  # Generador perezoso
+    assert len(list(encontrados)) == 5
+
+    resultados = sellador.sellar_pdfs_iter(docs, sello, salida, procesos=1)
+    primero = next(resultados)  # Se entrega antes de procesar el resto
+    assert "ok" in primero
+    restantes = list(resultados)
+    assert len(restantes) == 4
+
+    anidado = os.path.join(salida, "sub", "interna", "anidado.pdf")
+    with fitz.open(anidado) as doc:
+        assert len(doc[0].get_images()) == 1
+
+def test_sellar_pdfs_omite_salida_dentro_de_entrada(carpeta_docs):
+    docs, sello, _ = carpeta_docs
+    salida = os.path.join(docs, "sellados")
+
+    primera = sellador.sellar_pdfs(docs, sello, salida, procesos=1)
+    segunda = sellador.sellar_pdfs(docs, sello, salida, procesos=1)
+
+    # Los sellados de la primera pasada no se vuelven a sellar
+    assert len(primera) == len(segunda) == 4
+    assert not os.path.exists(os.path.join(salida, "sellados"))
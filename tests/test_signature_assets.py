@@ -0,0 +1,57 @@
+import pytest
+from app.core.signature_assets import SignatureAssetCache
+from PIL import Image
+import os
+
+@pytest.fixture
+def sample_signature(tmp_path):
+    """Crea una imagen de firma de prueba"""
+    path = tmp_path / "firma.png"
+    Image.new('RGB', (200, 100), (0, 0, 255)).save(path)
+    return str(path)
+
+def test_info_reads_header_once(sample_signature):
+    cache = SignatureAssetCache()
+    info = cache.info(sample_signature)
+
+    assert (info.width, info.height, info.format) == (200, 100, 'PNG')
+    assert info.aspect_ratio == pytest.approx(0.5)
+    assert cache.info(sample_signature) is info
+    assert cache.infos.hits == 1
+    assert len(cache.images) == 0  # Los metadatos no decodifican la imagen
+
+def test_image_is_decoded_once_as_rgba(sample_signature):
+    cache = SignatureAssetCache()
+    image = cache.image(sample_signature)
+
+    assert image.mode == 'RGBA'
+    assert cache.image(sample_signature) is image
+    assert cache.images.stats()["bytes"] == 200 * 100 * 4
+
+def test_modified_file_is_reloaded(sample_signature):
+    cache = SignatureAssetCache()
+    first = cache.image(sample_signature)
+
+    Image.new('RGB', (50, 100)).save(sample_signature)
+    stat = os.stat(sample_signature)
+    os.utime(sample_signature, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.image(sample_signature) is not first
+    assert cache.info(sample_signature).aspect_ratio == pytest.approx(2.0)
+
+def test_bitmaps_are_bounded(tmp_path):
+    cache = SignatureAssetCache(max_memory_mb=0.1)  # ~104 KB: cabe una firma de 80 KB
+    paths = []
+    for i in range(2):
+        path = str(tmp_path / f"firma{i}.png")
+        Image.new('RGBA', (200, 100)).save(path)
+        paths.append(path)
+
+    cache.image(paths[0])
+    cache.image(paths[1])
+    assert len(cache.images) == 1
+    assert cache.images.total_bytes <= cache.images.max_bytes
+
+def test_missing_file_raises():
+    with pytest.raises(FileNotFoundError):
+        SignatureAssetCache().info("firma_no_existente.png")
@@ -50,4 +50,27 @@ def test_signature_cache(sample_signature):
     # Segunda carga (debería usar caché)
     image2 = manager.load_signature(sample_signature)
     
-    assert image1 is image2  # Debería ser el mismo objeto en memoria 
\ No newline at end of file
+    assert image1 is image2  # Debería ser el mismo objeto en memoria 
+
+def test_signature_uses_shared_asset_image(sample_signature):
+    from app.core.signature_assets import signature_assets
+
+    manager = SignatureManager()
+    image = manager.load_signature(sample_signature)
+
+    # Una sola copia decodificada, contada en un solo presupuesto de memoria
+    assert image is signature_assets.image(sample_signature)
+    assert not hasattr(manager, "signature_cache")
+
+def test_prepared_variants_are_cached(sample_signature):
+    manager = SignatureManager()
+
+    first = manager.prepare_signature(sample_signature, (50, 40), rotation=90)
+    second = manager.prepare_signature(sample_signature, (50, 40), rotation=90)
+    other = manager.prepare_signature(sample_signature, (50, 40))
+
+    assert first is second
+    assert first.size == (40, 50)
+    assert other.size == (50, 40)
+    assert manager.cache_stats()["variants"]["hits"] == 1
+    assert manager.cache_stats()["variants"]["entries"] == 2